@@ -0,0 +1,16 @@
+import { useEffect, useState } from "react";
+
+/**
+ * Returns `value` after it has stopped changing for `delayMs`.
+ * Used to avoid one server-side search per keystroke.
+ */
+export function useDebouncedValue<T>(value: T, delayMs = 300) {
+  const [debounced, setDebounced] = useState(value);
+
+  useEffect(() => {
+    const timer = setTimeout(() => setDebounced(value), delayMs);
+    return () => clearTimeout(timer);
+  }, [value, delayMs]);
+
+  return debounced;
+}
@@ -4,3 +4,12 @@ import { twMerge } from "tailwind-merge";
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs));
 }
+
+/** DECIMAL(10,2) string from the API as integer cents, so sums and differences stay exact. */
+export function toCents(value: string) {
+  return Math.round(parseFloat(value) * 100);
+}
+
+export function formatCents(cents: number) {
+  return (cents / 100).toFixed(2);
+}
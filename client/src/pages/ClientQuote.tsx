@@ -3,16 +3,18 @@ import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card";
 import { Download, ArrowLeft } from "lucide-react";
 import { trpc } from "@/lib/trpc";
+import { formatCents, toCents } from "@/lib/utils";
 import { Link } from "wouter";
 
 export default function ClientQuote() {
   const { id } = useParams<{ id: string }>();
   const orderId = parseInt(id || "0");
   
-  const { data: order } = trpc.serviceOrders.get.useQuery({ id: orderId });
-  const { data: items = [] } = trpc.serviceOrderItems.list.useQuery({ serviceOrderId: orderId });
-  const { data: client } = trpc.clients.get.useQuery({ id: order?.clientId || 0 }, { enabled: !!order?.clientId });
-  const { data: vehicle } = trpc.vehicles.get.useQuery({ id: order?.vehicleId || 0 }, { enabled: !!order?.vehicleId });
+  const { data: quote } = trpc.serviceOrders.getQuote.useQuery({ id: orderId });
+  const order = quote?.order;
+  const items = quote?.items ?? [];
+  const client = quote?.client;
+  const vehicle = quote?.vehicle;
 
   if (!order) {
     return (
@@ -24,7 +26,7 @@ export default function ClientQuote() {
     );
   }
 
-  const totalPrice = items.reduce((sum, item) => sum + (parseFloat(item.unitPrice) * item.quantity), 0);
+  const totalPrice = toCents(order.totalPrice);
 
   const handlePrint = () => {
     window.print();
@@ -123,7 +125,7 @@ export default function ClientQuote() {
                         <td className="text-right py-3 px-4">{item.quantity}</td>
                         <td className="text-right py-3 px-4">R$ {parseFloat(item.unitPrice).toFixed(2)}</td>
                         <td className="text-right py-3 px-4 font-semibold">
-                          R$ {(parseFloat(item.unitPrice) * item.quantity).toFixed(2)}
+                          R$ {formatCents(toCents(item.unitPrice) * item.quantity)}
                         </td>
                       </tr>
                     ))}
@@ -137,7 +139,7 @@ export default function ClientQuote() {
               <div className="w-80 border-t-2 border-slate-900 pt-4">
                 <div className="flex justify-between items-center mb-2">
                   <span className="text-slate-600">Subtotal:</span>
-                  <span>R$ {totalPrice.toFixed(2)}</span>
+                  <span>R$ {formatCents(totalPrice)}</span>
                 </div>
                 <div className="flex justify-between items-center mb-4">
                   <span className="text-slate-600">Impostos (0%):</span>
@@ -145,7 +147,7 @@ export default function ClientQuote() {
                 </div>
                 <div className="flex justify-between items-center text-xl font-bold bg-slate-900 text-white p-4 rounded">
                   <span>TOTAL:</span>
-                  <span>R$ {totalPrice.toFixed(2)}</span>
+                  <span>R$ {formatCents(totalPrice)}</span>
                 </div>
               </div>
             </div>
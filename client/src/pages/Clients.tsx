@@ -5,8 +5,9 @@ import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/com
 import { Dialog, DialogContent, DialogDescription, DialogHeader, DialogTitle, DialogTrigger } from "@/components/ui/dialog";
 import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
-import { Plus, Edit2, Trash2, Eye } from "lucide-react";
+import { Plus, Edit2, Trash2, Eye, Search } from "lucide-react";
 import { trpc } from "@/lib/trpc";
+import { useDebouncedValue } from "@/hooks/useDebouncedValue";
 import { Link } from "wouter";
 
 export default function Clients() {
@@ -23,7 +24,15 @@ export default function Clients() {
     zipCode: "",
   });
 
-  const { data: clients = [], refetch } = trpc.clients.list.useQuery();
+  const [search, setSearch] = useState("");
+  const debouncedSearch = useDebouncedValue(search.trim());
+
+  const clientsQuery = trpc.clients.list.useInfiniteQuery(
+    { search: debouncedSearch || undefined },
+    { getNextPageParam: lastPage => lastPage.nextCursor }
+  );
+  const clients = clientsQuery.data?.pages.flatMap(page => page.items) ?? [];
+  const refetch = clientsQuery.refetch;
   const createMutation = trpc.clients.create.useMutation();
   const updateMutation = trpc.clients.update.useMutation();
   const deleteMutation = trpc.clients.delete.useMutation();
@@ -194,10 +203,24 @@ export default function Clients() {
           </Dialog>
         </div>
 
+        <div className="relative">
+          <Search className="absolute left-3 top-1/2 -translate-y-1/2 h-4 w-4 text-slate-400" />
+          <Input
+            className="pl-9"
+            placeholder="Buscar por nome, CPF ou placa"
+            value={search}
+            onChange={(e) => setSearch(e.target.value)}
+          />
+        </div>
+
         {clients.length === 0 ? (
           <Card>
             <CardContent className="pt-6">
-              <p className="text-center text-slate-500">Nenhum cliente cadastrado. Crie um novo cliente para começar.</p>
+              <p className="text-center text-slate-500">
+                {debouncedSearch
+                  ? "Nenhum cliente encontrado."
+                  : "Nenhum cliente cadastrado. Crie um novo cliente para começar."}
+              </p>
             </CardContent>
           </Card>
         ) : (
@@ -238,6 +261,15 @@ export default function Clients() {
                 </CardContent>
               </Card>
             ))}
+            {clientsQuery.hasNextPage && (
+              <Button
+                variant="outline"
+                onClick={() => clientsQuery.fetchNextPage()}
+                disabled={clientsQuery.isFetchingNextPage}
+              >
+                {clientsQuery.isFetchingNextPage ? "Carregando..." : "Carregar mais"}
+              </Button>
+            )}
           </div>
         )}
       </div>
@@ -18,7 +18,19 @@ export default function Financial() {
     amount: "",
   });
 
-  const { data: transactions = [], refetch } = trpc.transactions.list.useQuery();
+  const revenueQuery = trpc.transactions.list.useInfiniteQuery(
+    { type: "revenue" },
+    { getNextPageParam: lastPage => lastPage.nextCursor }
+  );
+  const expenseQuery = trpc.transactions.list.useInfiniteQuery(
+    { type: "expense" },
+    { getNextPageParam: lastPage => lastPage.nextCursor }
+  );
+  const refetch = () => {
+    revenueQuery.refetch();
+    expenseQuery.refetch();
+  };
+  const { data: summary, refetch: refetchSummary } = trpc.dashboard.summary.useQuery();
   const createMutation = trpc.transactions.create.useMutation();
 
   const handleSubmit = async (e: React.FormEvent) => {
@@ -40,28 +52,21 @@ export default function Financial() {
       });
       setIsOpen(false);
       refetch();
+      refetchSummary();
     } catch (error) {
       console.error("Erro ao criar transação:", error);
     }
   };
 
-  const revenues = transactions
-    .filter(t => t.type === "revenue")
-    .reduce((sum, t) => sum + parseFloat(t.amount), 0);
-  
-  const expenses = transactions
-    .filter(t => t.type === "expense")
-    .reduce((sum, t) => sum + parseFloat(t.amount), 0);
-
-  const profit = revenues - expenses;
+  const revenues = parseFloat(summary?.revenue ?? "0");
+  const expenses = parseFloat(summary?.expense ?? "0");
+  const profit = parseFloat(summary?.profit ?? "0");
+  const revenueCount = summary?.revenueCount ?? 0;
+  const expenseCount = summary?.expenseCount ?? 0;
 
-  const revenueTransactions = transactions.filter(t => t.type === "revenue").sort((a, b) => 
-    new Date(b.createdAt).getTime() - new Date(a.createdAt).getTime()
-  );
-
-  const expenseTransactions = transactions.filter(t => t.type === "expense").sort((a, b) => 
-    new Date(b.createdAt).getTime() - new Date(a.createdAt).getTime()
-  );
+  // Pages already arrive newest first from the server
+  const revenueTransactions = revenueQuery.data?.pages.flatMap(page => page.items) ?? [];
+  const expenseTransactions = expenseQuery.data?.pages.flatMap(page => page.items) ?? [];
 
   const expenseCategories = ["Peças", "Combustível", "Aluguel", "Salários", "Utilidades", "Manutenção", "Outros"];
   const revenueCategories = ["Serviços", "Peças", "Outros"];
@@ -165,7 +170,7 @@ export default function Financial() {
             </CardHeader>
             <CardContent>
               <div className="text-2xl font-bold text-green-600">R$ {revenues.toFixed(2)}</div>
-              <p className="text-xs text-slate-500 mt-1">{revenueTransactions.length} transação{revenueTransactions.length !== 1 ? 's' : ''}</p>
+              <p className="text-xs text-slate-500 mt-1">{revenueCount} transação{revenueCount !== 1 ? 's' : ''}</p>
             </CardContent>
           </Card>
 
@@ -178,7 +183,7 @@ export default function Financial() {
             </CardHeader>
             <CardContent>
               <div className="text-2xl font-bold text-red-600">R$ {expenses.toFixed(2)}</div>
-              <p className="text-xs text-slate-500 mt-1">{expenseTransactions.length} transação{expenseTransactions.length !== 1 ? 's' : ''}</p>
+              <p className="text-xs text-slate-500 mt-1">{expenseCount} transação{expenseCount !== 1 ? 's' : ''}</p>
             </CardContent>
           </Card>
 
@@ -230,6 +235,16 @@ export default function Financial() {
                     </CardContent>
                   </Card>
                 ))}
+                {revenueQuery.hasNextPage && (
+                  <Button
+                    variant="outline"
+                    className="w-full"
+                    onClick={() => revenueQuery.fetchNextPage()}
+                    disabled={revenueQuery.isFetchingNextPage}
+                  >
+                    {revenueQuery.isFetchingNextPage ? "Carregando..." : "Carregar mais"}
+                  </Button>
+                )}
               </div>
             )}
           </div>
@@ -265,6 +280,16 @@ export default function Financial() {
                     </CardContent>
                   </Card>
                 ))}
+                {expenseQuery.hasNextPage && (
+                  <Button
+                    variant="outline"
+                    className="w-full"
+                    onClick={() => expenseQuery.fetchNextPage()}
+                    disabled={expenseQuery.isFetchingNextPage}
+                  >
+                    {expenseQuery.isFetchingNextPage ? "Carregando..." : "Carregar mais"}
+                  </Button>
+                )}
               </div>
             )}
           </div>
@@ -8,9 +8,7 @@ import { trpc } from "@/lib/trpc";
 
 export default function Home() {
   const { user, loading, isAuthenticated } = useAuth();
-  const { data: clients = [] } = trpc.clients.list.useQuery(undefined, { enabled: isAuthenticated });
-  const { data: orders = [] } = trpc.serviceOrders.list.useQuery(undefined, { enabled: isAuthenticated });
-  const { data: transactions = [] } = trpc.transactions.list.useQuery(undefined, { enabled: isAuthenticated });
+  const { data: summary } = trpc.dashboard.summary.useQuery(undefined, { enabled: isAuthenticated });
 
   if (loading) {
     return <div className="flex items-center justify-center min-h-screen">Carregando...</div>;
@@ -30,17 +28,13 @@ export default function Home() {
     );
   }
 
-  // Calculate financial summary
-  const revenues = transactions
-    .filter(t => t.type === "revenue")
-    .reduce((sum, t) => sum + parseFloat(t.amount), 0);
-  
-  const expenses = transactions
-    .filter(t => t.type === "expense")
-    .reduce((sum, t) => sum + parseFloat(t.amount), 0);
+  // Financial summary is aggregated on the server from rollup tables
+  const revenues = parseFloat(summary?.revenue ?? "0");
+  const expenses = parseFloat(summary?.expense ?? "0");
+  const profit = parseFloat(summary?.profit ?? "0");
 
-  const pendingOrders = orders.filter(o => o.status === "pending").length;
-  const inProgressOrders = orders.filter(o => o.status === "in_progress").length;
+  const pendingOrders = summary?.serviceOrders.byStatus.pending ?? 0;
+  const inProgressOrders = summary?.serviceOrders.byStatus.in_progress ?? 0;
 
   return (
     <DashboardLayout>
@@ -61,7 +55,7 @@ export default function Home() {
               </CardTitle>
             </CardHeader>
             <CardContent>
-              <div className="text-2xl font-bold">{clients.length}</div>
+              <div className="text-2xl font-bold">{summary?.clients ?? 0}</div>
               <p className="text-xs text-slate-500 mt-1">Total de clientes cadastrados</p>
             </CardContent>
           </Card>
@@ -74,7 +68,7 @@ export default function Home() {
               </CardTitle>
             </CardHeader>
             <CardContent>
-              <div className="text-2xl font-bold">{orders.length}</div>
+              <div className="text-2xl font-bold">{summary?.serviceOrders.total ?? 0}</div>
               <p className="text-xs text-slate-500 mt-1">
                 {pendingOrders} pendente{pendingOrders !== 1 ? 's' : ''}, {inProgressOrders} em andamento
               </p>
@@ -157,8 +151,8 @@ export default function Home() {
               <CardDescription>Receitas - Despesas</CardDescription>
             </CardHeader>
             <CardContent>
-              <div className={`text-2xl font-bold ${revenues - expenses >= 0 ? "text-green-600" : "text-red-600"}`}>
-                R$ {(revenues - expenses).toFixed(2)}
+              <div className={`text-2xl font-bold ${profit >= 0 ? "text-green-600" : "text-red-600"}`}>
+                R$ {profit.toFixed(2)}
               </div>
             </CardContent>
           </Card>
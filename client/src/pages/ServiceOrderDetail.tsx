@@ -8,6 +8,7 @@ import { Label } from "@/components/ui/label";
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
 import { Plus, Edit2, Trash2, ArrowLeft, Download } from "lucide-react";
 import { trpc } from "@/lib/trpc";
+import { formatCents, toCents } from "@/lib/utils";
 import { Link, useParams } from "wouter";
 
 export default function ServiceOrderDetail() {
@@ -24,10 +25,11 @@ export default function ServiceOrderDetail() {
     unitPrice: "",
   });
 
-  const { data: order } = trpc.serviceOrders.get.useQuery({ id: orderId });
-  const { data: items = [], refetch } = trpc.serviceOrderItems.list.useQuery({ serviceOrderId: orderId });
-  const { data: client } = trpc.clients.get.useQuery({ id: order?.clientId || 0 }, { enabled: !!order?.clientId });
-  const { data: vehicle } = trpc.vehicles.get.useQuery({ id: order?.vehicleId || 0 }, { enabled: !!order?.vehicleId });
+  const { data: full, refetch } = trpc.serviceOrders.getFull.useQuery({ id: orderId });
+  const order = full?.order;
+  const items = full?.items ?? [];
+  const client = full?.client;
+  const vehicle = full?.vehicle;
   
   const createMutation = trpc.serviceOrderItems.create.useMutation();
   const updateMutation = trpc.serviceOrderItems.update.useMutation();
@@ -103,6 +105,7 @@ export default function ServiceOrderDetail() {
         id: orderId,
         status: newStatus as any,
       });
+      refetch();
     } catch (error) {
       console.error("Erro ao atualizar status:", error);
     }
@@ -146,8 +149,9 @@ export default function ServiceOrderDetail() {
     );
   }
 
-  const totalCost = items.reduce((sum, item) => sum + (parseFloat(item.unitCost) * item.quantity), 0);
-  const totalPrice = items.reduce((sum, item) => sum + (parseFloat(item.unitPrice) * item.quantity), 0);
+  // Totals are kept by the server in DECIMAL arithmetic whenever items change
+  const totalCost = toCents(order.totalCost);
+  const totalPrice = toCents(order.totalPrice);
   const profit = totalPrice - totalCost;
   const profitMargin = totalPrice > 0 ? ((profit / totalPrice) * 100).toFixed(1) : "0";
 
@@ -343,7 +347,7 @@ export default function ServiceOrderDetail() {
                         <td className="text-right py-2 px-4">R$ {parseFloat(item.unitCost).toFixed(2)}</td>
                         <td className="text-right py-2 px-4">R$ {parseFloat(item.unitPrice).toFixed(2)}</td>
                         <td className="text-right py-2 px-4 font-medium">
-                          R$ {(parseFloat(item.unitPrice) * item.quantity).toFixed(2)}
+                          R$ {formatCents(toCents(item.unitPrice) * item.quantity)}
                         </td>
                         <td className="text-center py-2 px-4">
                           <div className="flex gap-2 justify-center">
@@ -375,16 +379,16 @@ export default function ServiceOrderDetail() {
                   <div className="space-y-2 text-right">
                     <div className="flex justify-end gap-4">
                       <span className="text-slate-600">Custo Total:</span>
-                      <span className="font-medium w-32">R$ {totalCost.toFixed(2)}</span>
+                      <span className="font-medium w-32">R$ {formatCents(totalCost)}</span>
                     </div>
                     <div className="flex justify-end gap-4 border-t pt-2">
                       <span className="text-slate-600">Preço Total (Cliente):</span>
-                      <span className="font-bold w-32 text-lg">R$ {totalPrice.toFixed(2)}</span>
+                      <span className="font-bold w-32 text-lg">R$ {formatCents(totalPrice)}</span>
                     </div>
                     <div className="flex justify-end gap-4 border-t pt-2">
                       <span className="text-slate-600">Lucro:</span>
                       <span className={`font-bold w-32 ${profit >= 0 ? "text-green-600" : "text-red-600"}`}>
-                        R$ {profit.toFixed(2)} ({profitMargin}%)
+                        R$ {formatCents(profit)} ({profitMargin}%)
                       </span>
                     </div>
                   </div>
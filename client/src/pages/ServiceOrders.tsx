@@ -6,8 +6,9 @@ import { Dialog, DialogContent, DialogDescription, DialogHeader, DialogTitle, Di
 import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
-import { Plus, Eye, Trash2 } from "lucide-react";
+import { Plus, Eye, Trash2, Search } from "lucide-react";
 import { trpc } from "@/lib/trpc";
+import { useDebouncedValue } from "@/hooks/useDebouncedValue";
 import { Link } from "wouter";
 
 export default function ServiceOrders() {
@@ -19,11 +20,28 @@ export default function ServiceOrders() {
     description: "",
   });
 
-  const { data: orders = [], refetch } = trpc.serviceOrders.list.useQuery();
-  const { data: clients = [] } = trpc.clients.list.useQuery();
-  const createMutation = trpc.serviceOrders.create.useMutation();
+  const [search, setSearch] = useState("");
+  const [statusFilter, setStatusFilter] = useState<string>("all");
+  const [clientSearch, setClientSearch] = useState("");
+  const debouncedSearch = useDebouncedValue(search.trim());
+  const debouncedClientSearch = useDebouncedValue(clientSearch.trim());
+
+  const ordersQuery = trpc.serviceOrders.list.useInfiniteQuery(
+    {
+      search: debouncedSearch || undefined,
+      status: statusFilter === "all" ? undefined : [statusFilter as any],
+    },
+    { getNextPageParam: lastPage => lastPage.nextCursor }
+  );
+  const orders = ordersQuery.data?.pages.flatMap(page => page.items) ?? [];
+  const refetch = ordersQuery.refetch;
 
-  const selectedClient = clients.find((c: any) => c.id === parseInt(formData.clientId));
+  const { data: clientsPage } = trpc.clients.list.useQuery(
+    { search: debouncedClientSearch || undefined, limit: 50 },
+    { enabled: isOpen }
+  );
+  const clients = clientsPage?.items ?? [];
+  const createMutation = trpc.serviceOrders.create.useMutation();
   const { data: vehicles = [] } = trpc.vehicles.listByClient.useQuery(
     { clientId: parseInt(formData.clientId) },
     { enabled: !!formData.clientId }
@@ -118,6 +136,12 @@ export default function ServiceOrders() {
               <form onSubmit={handleSubmit} className="space-y-4">
                 <div>
                   <Label htmlFor="client">Cliente *</Label>
+                  <Input
+                    className="mb-2"
+                    placeholder="Buscar cliente por nome, CPF ou placa"
+                    value={clientSearch}
+                    onChange={(e) => setClientSearch(e.target.value)}
+                  />
                   <Select value={formData.clientId} onValueChange={(value) => setFormData({ ...formData, clientId: value, vehicleId: "" })}>
                     <SelectTrigger>
                       <SelectValue placeholder="Selecione um cliente" />
@@ -177,10 +201,39 @@ export default function ServiceOrders() {
           </Dialog>
         </div>
 
+        <div className="flex flex-col md:flex-row gap-2">
+          <div className="relative flex-1">
+            <Search className="absolute left-3 top-1/2 -translate-y-1/2 h-4 w-4 text-slate-400" />
+            <Input
+              className="pl-9"
+              placeholder="Buscar por número da OS ou placa"
+              value={search}
+              onChange={(e) => setSearch(e.target.value)}
+            />
+          </div>
+          <Select value={statusFilter} onValueChange={setStatusFilter}>
+            <SelectTrigger className="md:w-48">
+              <SelectValue />
+            </SelectTrigger>
+            <SelectContent>
+              <SelectItem value="all">Todos os status</SelectItem>
+              {["pending", "in_progress", "completed", "paid", "cancelled"].map((status) => (
+                <SelectItem key={status} value={status}>
+                  {getStatusLabel(status)}
+                </SelectItem>
+              ))}
+            </SelectContent>
+          </Select>
+        </div>
+
         {orders.length === 0 ? (
           <Card>
             <CardContent className="pt-6">
-              <p className="text-center text-slate-500">Nenhuma ordem de serviço cadastrada.</p>
+              <p className="text-center text-slate-500">
+                {debouncedSearch || statusFilter !== "all"
+                  ? "Nenhuma ordem de serviço encontrada."
+                  : "Nenhuma ordem de serviço cadastrada."}
+              </p>
             </CardContent>
           </Card>
         ) : (
@@ -213,6 +266,15 @@ export default function ServiceOrders() {
                 </CardContent>
               </Card>
             ))}
+            {ordersQuery.hasNextPage && (
+              <Button
+                variant="outline"
+                onClick={() => ordersQuery.fetchNextPage()}
+                disabled={ordersQuery.isFetchingNextPage}
+              >
+                {ordersQuery.isFetchingNextPage ? "Carregando..." : "Carregar mais"}
+              </Button>
+            )}
           </div>
         )}
       </div>
@@ -0,0 +1,14 @@
+CREATE TABLE `serviceOrderStatusCounts` (
+	`status` enum('pending','in_progress','completed','paid','cancelled') NOT NULL,
+	`count` int NOT NULL DEFAULT 0,
+	CONSTRAINT `serviceOrderStatusCounts_status` PRIMARY KEY(`status`)
+);
+--> statement-breakpoint
+CREATE TABLE `transactionDailyRollups` (
+	`day` date NOT NULL,
+	`type` enum('revenue','expense') NOT NULL,
+	`category` varchar(100) NOT NULL,
+	`total` decimal(14,2) NOT NULL DEFAULT '0',
+	`count` int NOT NULL DEFAULT 0,
+	CONSTRAINT `transactionDailyRollups_day_type_category_pk` PRIMARY KEY(`day`,`type`,`category`)
+);
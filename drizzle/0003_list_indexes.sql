@@ -0,0 +1,23 @@
+CREATE INDEX `clients_createdAt_id_idx` ON `clients` (`createdAt`,`id`);
+--> statement-breakpoint
+CREATE INDEX `clients_name_idx` ON `clients` (`name`);
+--> statement-breakpoint
+CREATE INDEX `serviceOrderItems_serviceOrderId_idx` ON `serviceOrderItems` (`serviceOrderId`);
+--> statement-breakpoint
+CREATE INDEX `serviceOrders_clientId_createdAt_id_idx` ON `serviceOrders` (`clientId`,`createdAt`,`id`);
+--> statement-breakpoint
+CREATE INDEX `serviceOrders_createdAt_id_idx` ON `serviceOrders` (`createdAt`,`id`);
+--> statement-breakpoint
+CREATE INDEX `serviceOrders_status_createdAt_id_idx` ON `serviceOrders` (`status`,`createdAt`,`id`);
+--> statement-breakpoint
+CREATE INDEX `serviceOrders_vehicleId_idx` ON `serviceOrders` (`vehicleId`);
+--> statement-breakpoint
+CREATE INDEX `transactions_category_createdAt_id_idx` ON `transactions` (`category`,`createdAt`,`id`);
+--> statement-breakpoint
+CREATE INDEX `transactions_createdAt_id_idx` ON `transactions` (`createdAt`,`id`);
+--> statement-breakpoint
+CREATE INDEX `transactions_serviceOrderId_idx` ON `transactions` (`serviceOrderId`);
+--> statement-breakpoint
+CREATE INDEX `transactions_type_createdAt_id_idx` ON `transactions` (`type`,`createdAt`,`id`);
+--> statement-breakpoint
+CREATE INDEX `vehicles_clientId_idx` ON `vehicles` (`clientId`);
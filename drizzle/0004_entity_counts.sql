@@ -0,0 +1,7 @@
+CREATE TABLE `entityCounts` (
+	`entity` varchar(64) NOT NULL,
+	`count` int NOT NULL DEFAULT 0,
+	CONSTRAINT `entityCounts_entity` PRIMARY KEY(`entity`)
+);
+--> statement-breakpoint
+INSERT INTO `entityCounts` (`entity`, `count`) SELECT 'clients', COUNT(*) FROM `clients`;
\ No newline at end of file
@@ -1,4 +1,4 @@
-import { int, mysqlEnum, mysqlTable, text, timestamp, varchar, decimal } from "drizzle-orm/mysql-core";
+import { date, decimal, index, int, mysqlEnum, mysqlTable, primaryKey, text, timestamp, varchar } from "drizzle-orm/mysql-core";
 
 /**
  * Core user table backing auth flow.
@@ -28,19 +28,26 @@ export type InsertUser = typeof users.$inferInsert;
 /**
  * Clientes da oficina
  */
-export const clients = mysqlTable("clients", {
-  id: int("id").autoincrement().primaryKey(),
-  name: varchar("name", { length: 255 }).notNull(),
-  email: varchar("email", { length: 320 }),
-  phone: varchar("phone", { length: 20 }),
-  cpf: varchar("cpf", { length: 14 }).unique(),
-  address: text("address"),
-  city: varchar("city", { length: 100 }),
-  state: varchar("state", { length: 2 }),
-  zipCode: varchar("zipCode", { length: 10 }),
-  createdAt: timestamp("createdAt").defaultNow().notNull(),
-  updatedAt: timestamp("updatedAt").defaultNow().onUpdateNow().notNull(),
-});
+export const clients = mysqlTable(
+  "clients",
+  {
+    id: int("id").autoincrement().primaryKey(),
+    name: varchar("name", { length: 255 }).notNull(),
+    email: varchar("email", { length: 320 }),
+    phone: varchar("phone", { length: 20 }),
+    cpf: varchar("cpf", { length: 14 }).unique(),
+    address: text("address"),
+    city: varchar("city", { length: 100 }),
+    state: varchar("state", { length: 2 }),
+    zipCode: varchar("zipCode", { length: 10 }),
+    createdAt: timestamp("createdAt").defaultNow().notNull(),
+    updatedAt: timestamp("updatedAt").defaultNow().onUpdateNow().notNull(),
+  },
+  table => [
+    index("clients_createdAt_id_idx").on(table.createdAt, table.id),
+    index("clients_name_idx").on(table.name),
+  ]
+);
 
 export type Client = typeof clients.$inferSelect;
 export type InsertClient = typeof clients.$inferInsert;
@@ -48,18 +55,24 @@ export type InsertClient = typeof clients.$inferInsert;
 /**
  * Veículos dos clientes
  */
-export const vehicles = mysqlTable("vehicles", {
-  id: int("id").autoincrement().primaryKey(),
-  clientId: int("clientId").notNull(),
-  brand: varchar("brand", { length: 100 }).notNull(),
-  model: varchar("model", { length: 100 }).notNull(),
-  year: int("year"),
-  licensePlate: varchar("licensePlate", { length: 10 }).notNull().unique(),
-  vin: varchar("vin", { length: 17 }),
-  color: varchar("color", { length: 50 }),
-  createdAt: timestamp("createdAt").defaultNow().notNull(),
-  updatedAt: timestamp("updatedAt").defaultNow().onUpdateNow().notNull(),
-});
+export const vehicles = mysqlTable(
+  "vehicles",
+  {
+    id: int("id").autoincrement().primaryKey(),
+    clientId: int("clientId").notNull(),
+    brand: varchar("brand", { length: 100 }).notNull(),
+    model: varchar("model", { length: 100 }).notNull(),
+    year: int("year"),
+    licensePlate: varchar("licensePlate", { length: 10 }).notNull().unique(),
+    vin: varchar("vin", { length: 17 }),
+    color: varchar("color", { length: 50 }),
+    createdAt: timestamp("createdAt").defaultNow().notNull(),
+    updatedAt: timestamp("updatedAt").defaultNow().onUpdateNow().notNull(),
+  },
+  table => [
+    index("vehicles_clientId_idx").on(table.clientId),
+  ]
+);
 
 export type Vehicle = typeof vehicles.$inferSelect;
 export type InsertVehicle = typeof vehicles.$inferInsert;
@@ -67,20 +80,29 @@ export type InsertVehicle = typeof vehicles.$inferInsert;
 /**
  * Ordens de Serviço
  */
-export const serviceOrders = mysqlTable("serviceOrders", {
-  id: int("id").autoincrement().primaryKey(),
-  clientId: int("clientId").notNull(),
-  vehicleId: int("vehicleId").notNull(),
-  orderNumber: varchar("orderNumber", { length: 50 }).notNull().unique(),
-  status: mysqlEnum("status", ["pending", "in_progress", "completed", "paid", "cancelled"]).default("pending").notNull(),
-  description: text("description"),
-  totalCost: decimal("totalCost", { precision: 10, scale: 2 }).default("0").notNull(),
-  totalPrice: decimal("totalPrice", { precision: 10, scale: 2 }).default("0").notNull(),
-  createdAt: timestamp("createdAt").defaultNow().notNull(),
-  updatedAt: timestamp("updatedAt").defaultNow().onUpdateNow().notNull(),
-  completedAt: timestamp("completedAt"),
-  paidAt: timestamp("paidAt"),
-});
+export const serviceOrders = mysqlTable(
+  "serviceOrders",
+  {
+    id: int("id").autoincrement().primaryKey(),
+    clientId: int("clientId").notNull(),
+    vehicleId: int("vehicleId").notNull(),
+    orderNumber: varchar("orderNumber", { length: 50 }).notNull().unique(),
+    status: mysqlEnum("status", ["pending", "in_progress", "completed", "paid", "cancelled"]).default("pending").notNull(),
+    description: text("description"),
+    totalCost: decimal("totalCost", { precision: 10, scale: 2 }).default("0").notNull(),
+    totalPrice: decimal("totalPrice", { precision: 10, scale: 2 }).default("0").notNull(),
+    createdAt: timestamp("createdAt").defaultNow().notNull(),
+    updatedAt: timestamp("updatedAt").defaultNow().onUpdateNow().notNull(),
+    completedAt: timestamp("completedAt"),
+    paidAt: timestamp("paidAt"),
+  },
+  table => [
+    index("serviceOrders_createdAt_id_idx").on(table.createdAt, table.id),
+    index("serviceOrders_status_createdAt_id_idx").on(table.status, table.createdAt, table.id),
+    index("serviceOrders_clientId_createdAt_id_idx").on(table.clientId, table.createdAt, table.id),
+    index("serviceOrders_vehicleId_idx").on(table.vehicleId),
+  ]
+);
 
 export type ServiceOrder = typeof serviceOrders.$inferSelect;
 export type InsertServiceOrder = typeof serviceOrders.$inferInsert;
@@ -88,17 +110,23 @@ export type InsertServiceOrder = typeof serviceOrders.$inferInsert;
 /**
  * Itens de Ordens de Serviço (peças e serviços)
  */
-export const serviceOrderItems = mysqlTable("serviceOrderItems", {
-  id: int("id").autoincrement().primaryKey(),
-  serviceOrderId: int("serviceOrderId").notNull(),
-  description: varchar("description", { length: 255 }).notNull(),
-  type: mysqlEnum("type", ["part", "service"]).notNull(),
-  quantity: int("quantity").default(1).notNull(),
-  unitCost: decimal("unitCost", { precision: 10, scale: 2 }).notNull(),
-  unitPrice: decimal("unitPrice", { precision: 10, scale: 2 }).notNull(),
-  createdAt: timestamp("createdAt").defaultNow().notNull(),
-  updatedAt: timestamp("updatedAt").defaultNow().onUpdateNow().notNull(),
-});
+export const serviceOrderItems = mysqlTable(
+  "serviceOrderItems",
+  {
+    id: int("id").autoincrement().primaryKey(),
+    serviceOrderId: int("serviceOrderId").notNull(),
+    description: varchar("description", { length: 255 }).notNull(),
+    type: mysqlEnum("type", ["part", "service"]).notNull(),
+    quantity: int("quantity").default(1).notNull(),
+    unitCost: decimal("unitCost", { precision: 10, scale: 2 }).notNull(),
+    unitPrice: decimal("unitPrice", { precision: 10, scale: 2 }).notNull(),
+    createdAt: timestamp("createdAt").defaultNow().notNull(),
+    updatedAt: timestamp("updatedAt").defaultNow().onUpdateNow().notNull(),
+  },
+  table => [
+    index("serviceOrderItems_serviceOrderId_idx").on(table.serviceOrderId),
+  ]
+);
 
 export type ServiceOrderItem = typeof serviceOrderItems.$inferSelect;
 export type InsertServiceOrderItem = typeof serviceOrderItems.$inferInsert;
@@ -106,16 +134,65 @@ export type InsertServiceOrderItem = typeof serviceOrderItems.$inferInsert;
 /**
  * Transações Financeiras (receitas e despesas)
  */
-export const transactions = mysqlTable("transactions", {
-  id: int("id").autoincrement().primaryKey(),
-  type: mysqlEnum("type", ["revenue", "expense"]).notNull(),
-  category: varchar("category", { length: 100 }).notNull(),
-  description: text("description"),
-  amount: decimal("amount", { precision: 10, scale: 2 }).notNull(),
-  serviceOrderId: int("serviceOrderId"),
-  createdAt: timestamp("createdAt").defaultNow().notNull(),
-  updatedAt: timestamp("updatedAt").defaultNow().onUpdateNow().notNull(),
-});
+export const transactions = mysqlTable(
+  "transactions",
+  {
+    id: int("id").autoincrement().primaryKey(),
+    type: mysqlEnum("type", ["revenue", "expense"]).notNull(),
+    category: varchar("category", { length: 100 }).notNull(),
+    description: text("description"),
+    amount: decimal("amount", { precision: 10, scale: 2 }).notNull(),
+    serviceOrderId: int("serviceOrderId"),
+    createdAt: timestamp("createdAt").defaultNow().notNull(),
+    updatedAt: timestamp("updatedAt").defaultNow().onUpdateNow().notNull(),
+  },
+  table => [
+    index("transactions_createdAt_id_idx").on(table.createdAt, table.id),
+    index("transactions_type_createdAt_id_idx").on(table.type, table.createdAt, table.id),
+    index("transactions_category_createdAt_id_idx").on(table.category, table.createdAt, table.id),
+    index("transactions_serviceOrderId_idx").on(table.serviceOrderId),
+  ]
+);
 
 export type Transaction = typeof transactions.$inferSelect;
 export type InsertTransaction = typeof transactions.$inferInsert;
+
+/**
+ * Totais diários de transações por tipo e categoria.
+ * Mantido incrementalmente por createTransaction; reconstruído por rebuildDashboardRollups.
+ */
+export const transactionDailyRollups = mysqlTable(
+  "transactionDailyRollups",
+  {
+    day: date("day", { mode: "string" }).notNull(),
+    type: mysqlEnum("type", ["revenue", "expense"]).notNull(),
+    category: varchar("category", { length: 100 }).notNull(),
+    total: decimal("total", { precision: 14, scale: 2 }).default("0").notNull(),
+    count: int("count").default(0).notNull(),
+  },
+  table => [primaryKey({ columns: [table.day, table.type, table.category] })]
+);
+
+export type TransactionDailyRollup = typeof transactionDailyRollups.$inferSelect;
+
+/**
+ * Contadores de ordens de serviço por status.
+ * Mantido incrementalmente por createServiceOrder/updateServiceOrderStatus.
+ */
+export const serviceOrderStatusCounts = mysqlTable("serviceOrderStatusCounts", {
+  status: mysqlEnum("status", ["pending", "in_progress", "completed", "paid", "cancelled"]).primaryKey(),
+  count: int("count").default(0).notNull(),
+});
+
+export type ServiceOrderStatusCount = typeof serviceOrderStatusCounts.$inferSelect;
+
+/**
+ * Quantidade de linhas por tabela exibida no dashboard (hoje só `clients`).
+ * Mantido incrementalmente por createClient/deleteClient/insertClientsBatch.
+ */
+export const entityCounts = mysqlTable("entityCounts", {
+  entity: varchar("entity", { length: 64 }).primaryKey(),
+  count: int("count").default(0).notNull(),
+});
+
+export type EntityCount = typeof entityCounts.$inferSelect;
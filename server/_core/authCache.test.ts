@@ -0,0 +1,197 @@
+import { afterEach, beforeEach, describe, expect, it, vi } from "vitest";
+import type { User } from "../../drizzle/schema";
+import { LastSignedInBatcher, SessionUserCache } from "./authCache";
+
+function user(openId: string, id = 1): User {
+  return {
+    id,
+    openId,
+    name: openId,
+    email: null,
+    loginMethod: null,
+    role: "user",
+    createdAt: new Date(0),
+    updatedAt: new Date(0),
+    lastSignedIn: new Date(0),
+  };
+}
+
+describe("SessionUserCache", () => {
+  let now: number;
+
+  beforeEach(() => {
+    now = 1_000_000;
+    vi.spyOn(Date, "now").mockImplementation(() => now);
+  });
+
+  afterEach(() => {
+    vi.restoreAllMocks();
+  });
+
+  it("returns cached users until the TTL passes", () => {
+    const cache = new SessionUserCache(10, 1000);
+    cache.set("token", user("a"));
+
+    now += 999;
+    expect(cache.get("token")?.openId).toBe("a");
+    now += 1;
+    expect(cache.get("token")).toBeUndefined();
+    expect(cache.size).toBe(0);
+    expect(cache.hits).toBe(1);
+    expect(cache.misses).toBe(1);
+  });
+
+  it("never keeps an entry past the JWT expiry", () => {
+    const cache = new SessionUserCache(10, 60_000);
+    cache.set("token", user("a"), now + 500);
+
+    now += 499;
+    expect(cache.get("token")).toBeDefined();
+    now += 1;
+    expect(cache.get("token")).toBeUndefined();
+  });
+
+  it("evicts the least recently used entry when full", () => {
+    const cache = new SessionUserCache(2, 60_000);
+    cache.set("t1", user("a"));
+    cache.set("t2", user("b"));
+    // Reading t1 makes t2 the oldest
+    cache.get("t1");
+    cache.set("t3", user("c"));
+
+    expect(cache.get("t2")).toBeUndefined();
+    expect(cache.get("t1")?.openId).toBe("a");
+    expect(cache.get("t3")?.openId).toBe("c");
+    expect(cache.evictions).toBe(1);
+  });
+
+  it("drops every session of a user on invalidateUser", () => {
+    const cache = new SessionUserCache(10, 60_000);
+    cache.set("laptop", user("a"));
+    cache.set("phone", user("a"));
+    cache.set("other", user("b", 2));
+
+    cache.invalidateUser("a");
+
+    expect(cache.get("laptop")).toBeUndefined();
+    expect(cache.get("phone")).toBeUndefined();
+    expect(cache.get("other")?.openId).toBe("b");
+    expect(cache.invalidations).toBe(2);
+  });
+
+  it("forgets evicted tokens in the per-user index", () => {
+    const cache = new SessionUserCache(1, 60_000);
+    cache.set("t1", user("a"));
+    cache.set("t2", user("b", 2));
+
+    cache.invalidateUser("a");
+
+    expect(cache.get("t2")?.openId).toBe("b");
+    expect(cache.invalidations).toBe(0);
+  });
+
+  it("caches nothing when disabled", () => {
+    const cache = new SessionUserCache(10, 0);
+    cache.set("token", user("a"));
+    expect(cache.get("token")).toBeUndefined();
+    expect(cache.size).toBe(0);
+  });
+});
+
+describe("LastSignedInBatcher", () => {
+  function deferred() {
+    let resolve!: () => void;
+    let reject!: (error: Error) => void;
+    const promise = new Promise<void>((res, rej) => {
+      resolve = res;
+      reject = rej;
+    });
+    return { promise, resolve, reject };
+  }
+
+  afterEach(() => {
+    vi.restoreAllMocks();
+  });
+
+  it("writes the newest timestamp per user in one batch", async () => {
+    const write = vi.fn(async (_entries: Map<string, Date>) => undefined);
+    const batcher = new LastSignedInBatcher(write, 60_000);
+    batcher.record("a", new Date(2000));
+    batcher.record("a", new Date(1000));
+    batcher.record("b", new Date(3000));
+
+    await batcher.flush();
+    batcher.stop();
+
+    expect(write).toHaveBeenCalledTimes(1);
+    expect(write.mock.calls[0][0]).toEqual(new Map([["a", new Date(2000)], ["b", new Date(3000)]]));
+    expect(batcher.size).toBe(0);
+    expect(batcher.writes).toBe(2);
+  });
+
+  it("makes an overlapping flush wait until every write in progress has finished", async () => {
+    const writes = [deferred(), deferred()];
+    const batches: Map<string, Date>[] = [];
+    const write = vi.fn((entries: Map<string, Date>) => {
+      batches.push(entries);
+      return writes[batches.length - 1].promise;
+    });
+    const batcher = new LastSignedInBatcher(write, 60_000);
+
+    batcher.record("a", new Date(1000));
+    const flushA = batcher.flush();
+    batcher.record("b", new Date(2000));
+    const flushB = batcher.flush();
+    let doneC = false;
+    const flushC = batcher.flush().then(() => {
+      doneC = true;
+    });
+
+    writes[0].resolve();
+    await flushA;
+    // B is now writing "b"; C has nothing of its own to write but must not return before B's write lands
+    await new Promise(resolve => setImmediate(resolve));
+    expect(batches).toHaveLength(2);
+    expect(doneC).toBe(false);
+
+    writes[1].resolve();
+    await Promise.all([flushB, flushC]);
+    batcher.stop();
+
+    expect(batches.map(batch => Array.from(batch.keys()))).toEqual([["a"], ["b"]]);
+    expect(batcher.size).toBe(0);
+  });
+
+  it("re-queues a failed batch without overwriting newer timestamps", async () => {
+    vi.spyOn(console, "error").mockImplementation(() => undefined);
+    const failure = deferred();
+    const write = vi.fn((_entries: Map<string, Date>) => failure.promise);
+    const batcher = new LastSignedInBatcher(write, 60_000);
+
+    batcher.record("a", new Date(1000));
+    batcher.record("b", new Date(1000));
+    const flushing = batcher.flush();
+    // Recorded while the failing write is in flight
+    batcher.record("a", new Date(5000));
+    failure.reject(new Error("db down"));
+    await flushing;
+
+    expect(batcher.size).toBe(2);
+    write.mockImplementation(async () => undefined);
+    await batcher.flush();
+    batcher.stop();
+
+    expect(write.mock.calls[1][0]).toEqual(new Map([["a", new Date(5000)], ["b", new Date(1000)]]));
+    expect(batcher.flushes).toBe(1);
+  });
+
+  it("writes through when batching is disabled", async () => {
+    const write = vi.fn(async (_entries: Map<string, Date>) => undefined);
+    const batcher = new LastSignedInBatcher(write, 0);
+
+    batcher.record("a", new Date(1000));
+    await batcher.flush();
+
+    expect(write).toHaveBeenCalledTimes(1);
+  });
+});
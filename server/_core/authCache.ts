@@ -0,0 +1,174 @@
+import type { User } from "../../drizzle/schema";
+import { ENV } from "./env";
+import { LruTtlMap } from "./lruCache";
+
+export type AuthCacheStats = {
+  hits: number;
+  misses: number;
+  evictions: number;
+  invalidations: number;
+  size: number;
+  pendingLastSignedIn: number;
+  lastSignedInFlushes: number;
+  lastSignedInWrites: number;
+};
+
+/**
+ * In-process LRU cache of verified session token -> User.
+ *
+ * Entries live for at most `ttlMs` (and never past the JWT expiry), so a role
+ * change made by another process is picked up within one TTL even without an
+ * explicit invalidation.
+ */
+export class SessionUserCache {
+  private readonly entries: LruTtlMap<User>;
+  private readonly tokensByOpenId = new Map<string, Set<string>>();
+  hits = 0;
+  misses = 0;
+  evictions = 0;
+  invalidations = 0;
+
+  constructor(
+    private readonly maxEntries: number,
+    private readonly ttlMs: number
+  ) {
+    this.entries = new LruTtlMap(maxEntries, (token, user) => this.unindex(token, user));
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+
+  get(token: string): User | undefined {
+    const user = this.entries.get(token);
+    if (user) {
+      this.hits++;
+    } else {
+      this.misses++;
+    }
+    return user;
+  }
+
+  set(token: string, user: User, tokenExpiresAt?: number) {
+    if (this.maxEntries <= 0 || this.ttlMs <= 0) return;
+
+    const expiresAt = Math.min(Date.now() + this.ttlMs, tokenExpiresAt ?? Infinity);
+    this.entries.delete(token);
+    let tokens = this.tokensByOpenId.get(user.openId);
+    if (!tokens) {
+      tokens = new Set();
+      this.tokensByOpenId.set(user.openId, tokens);
+    }
+    tokens.add(token);
+    this.evictions += this.entries.set(token, user, expiresAt);
+  }
+
+  invalidateToken(token: string) {
+    if (this.entries.delete(token)) this.invalidations++;
+  }
+
+  /** Drops every cached session of a user, e.g. after their role or profile changed. */
+  invalidateUser(openId: string) {
+    const tokens = this.tokensByOpenId.get(openId);
+    if (!tokens) return;
+    for (const token of Array.from(tokens)) {
+      if (this.entries.delete(token)) this.invalidations++;
+    }
+  }
+
+  clear() {
+    this.entries.clear();
+    this.tokensByOpenId.clear();
+  }
+
+  private unindex(token: string, user: User) {
+    const tokens = this.tokensByOpenId.get(user.openId);
+    tokens?.delete(token);
+    if (tokens && tokens.size === 0) this.tokensByOpenId.delete(user.openId);
+  }
+}
+
+type LastSignedInWriter = (entries: Map<string, Date>) => Promise<void>;
+
+/**
+ * Collects `lastSignedIn` bumps in memory and writes them in one batched
+ * UPDATE per interval instead of one upsert per request.
+ */
+export class LastSignedInBatcher {
+  private pending = new Map<string, Date>();
+  private timer: NodeJS.Timeout | null = null;
+  private flushing: Promise<void> | null = null;
+  flushes = 0;
+  writes = 0;
+
+  constructor(
+    private readonly write: LastSignedInWriter,
+    private readonly intervalMs: number
+  ) {}
+
+  get size() {
+    return this.pending.size;
+  }
+
+  record(openId: string, at: Date) {
+    const previous = this.pending.get(openId);
+    if (!previous || previous < at) {
+      this.pending.set(openId, at);
+    }
+    this.ensureTimer();
+  }
+
+  async flush(): Promise<void> {
+    // Another caller may start a write while we wait, so wait until none is running
+    while (this.flushing) {
+      await this.flushing;
+    }
+    if (this.pending.size === 0) return;
+
+    const batch = this.pending;
+    this.pending = new Map();
+    this.flushing = this.write(batch)
+      .then(() => {
+        this.flushes++;
+        this.writes += batch.size;
+      })
+      .catch(error => {
+        console.error("[Auth] Failed to flush lastSignedIn updates:", error);
+        // Keep the newest timestamp per user for the next attempt
+        batch.forEach((at, openId) => {
+          const current = this.pending.get(openId);
+          if (!current || current < at) this.pending.set(openId, at);
+        });
+      })
+      .finally(() => {
+        this.flushing = null;
+      });
+    await this.flushing;
+  }
+
+  stop() {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+  }
+
+  private ensureTimer() {
+    if (this.intervalMs <= 0) {
+      // Batching disabled: write through
+      void this.flush();
+      return;
+    }
+    if (this.timer) return;
+    this.timer = setInterval(() => {
+      void this.flush();
+    }, this.intervalMs);
+    // Never keep the process alive just to flush timestamps
+    this.timer.unref();
+  }
+}
+
+export const sessionUserCache = new SessionUserCache(
+  ENV.authCacheMaxEntries,
+  ENV.authCacheTtlMs
+);
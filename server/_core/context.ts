@@ -1,4 +1,5 @@
 import type { CreateExpressContextOptions } from "@trpc/server/adapters/express";
+import type { Request, Response } from "express";
 import type { User } from "../../drizzle/schema";
 import { sdk } from "./sdk";
 
@@ -26,3 +27,16 @@ export async function createContext(
     user,
   };
 }
+
+/**
+ * Authenticates a plain Express route (outside tRPC); answers 401 and returns
+ * null when there is no valid session.
+ */
+export async function requireUser(req: Request, res: Response): Promise<User | null> {
+  try {
+    return await sdk.authenticateRequest(req);
+  } catch {
+    res.status(401).json({ error: "Unauthorized" });
+    return null;
+  }
+}
@@ -5,12 +5,15 @@
  *   })
  */
 import { ENV } from "./env";
+import { httpClients } from "./httpClient";
 
 export type DataApiCallOptions = {
   query?: Record<string, unknown>;
   body?: Record<string, unknown>;
   pathParams?: Record<string, unknown>;
   formData?: Record<string, unknown>;
+  /** Resend on rate limits, 5xx and timeouts. Only set this for APIs that are safe to call twice. */
+  retry?: boolean;
 };
 
 export async function callDataApi(
@@ -28,7 +31,8 @@ export async function callDataApi(
   const baseUrl = ENV.forgeApiUrl.endsWith("/") ? ENV.forgeApiUrl : `${ENV.forgeApiUrl}/`;
   const fullUrl = new URL("webdevtoken.v1.WebDevService/CallApi", baseUrl).toString();
 
-  const response = await fetch(fullUrl, {
+  // CallApi proxies arbitrary APIs, so it is only retried when the caller says the call is safe to repeat
+  const response = await httpClients.dataApi.fetch(fullUrl, {
     method: "POST",
     headers: {
       accept: "application/json",
@@ -43,6 +47,7 @@ export async function callDataApi(
       path_params: options.pathParams,
       multipart_form_data: options.formData,
     }),
+    idempotent: options.retry ?? false,
   });
 
   if (!response.ok) {
@@ -7,4 +7,18 @@ export const ENV = {
   isProduction: process.env.NODE_ENV === "production",
   forgeApiUrl: process.env.BUILT_IN_FORGE_API_URL ?? "",
   forgeApiKey: process.env.BUILT_IN_FORGE_API_KEY ?? "",
+  authCacheTtlMs: parseInt(process.env.AUTH_CACHE_TTL_MS ?? "60000"),
+  authCacheMaxEntries: parseInt(process.env.AUTH_CACHE_MAX_ENTRIES ?? "10000"),
+  lastSignedInFlushMs: parseInt(process.env.LAST_SIGNED_IN_FLUSH_MS ?? "30000"),
+  dbPoolSize: parseInt(process.env.DB_POOL_SIZE ?? "10"),
+  dbPoolMaxIdle: parseInt(process.env.DB_POOL_MAX_IDLE ?? process.env.DB_POOL_SIZE ?? "10"),
+  dbIdleTimeoutMs: parseInt(process.env.DB_IDLE_TIMEOUT_MS ?? "60000"),
+  dbQueueLimit: parseInt(process.env.DB_QUEUE_LIMIT ?? "0"),
+  slowQueryMs: parseInt(process.env.SLOW_QUERY_MS ?? "200"),
+  webConcurrency: parseInt(process.env.WEB_CONCURRENCY ?? "1"),
+  shutdownTimeoutMs: parseInt(process.env.SHUTDOWN_TIMEOUT_MS ?? "10000"),
+  uploadMaxBytes: parseInt(process.env.UPLOAD_MAX_BYTES ?? "26214400"),
+  httpRetries: parseInt(process.env.HTTP_RETRIES ?? "2"),
+  httpBreakerThreshold: parseInt(process.env.HTTP_BREAKER_THRESHOLD ?? "5"),
+  httpBreakerCooldownMs: parseInt(process.env.HTTP_BREAKER_COOLDOWN_MS ?? "30000"),
 };
@@ -0,0 +1,304 @@
+import { createServer, type IncomingMessage, type Server, type ServerResponse } from "node:http";
+import type { AddressInfo } from "node:net";
+import { setTimeout as sleep } from "node:timers/promises";
+import { afterEach, beforeEach, describe, expect, it, vi } from "vitest";
+import { CircuitOpenError, HttpClient, type HttpClientPolicy, TtlCache } from "./httpClient";
+
+type Handler = (req: IncomingMessage, res: ServerResponse) => void;
+
+let server: Server;
+let baseUrl: string;
+let handler: Handler;
+let hits: number;
+
+beforeEach(async () => {
+  hits = 0;
+  handler = (_req, res) => res.end("ok");
+  server = createServer((req, res) => {
+    hits++;
+    handler(req, res);
+  });
+  await new Promise<void>(resolve => server.listen(0, "127.0.0.1", resolve));
+  baseUrl = `http://127.0.0.1:${(server.address() as AddressInfo).port}`;
+});
+
+afterEach(async () => {
+  vi.restoreAllMocks();
+  server.closeAllConnections();
+  await new Promise(resolve => server.close(resolve));
+});
+
+function client(policy: Partial<HttpClientPolicy> = {}) {
+  return new HttpClient("test", {
+    concurrency: 4,
+    timeoutMs: 2000,
+    retries: 2,
+    breakerThreshold: 3,
+    breakerCooldownMs: 50,
+    cacheEntries: 10,
+    ...policy,
+  });
+}
+
+/** Answers each request with the next status in turn, repeating the last one. */
+function respondWith(...statuses: number[]) {
+  handler = (_req, res) => {
+    res.statusCode = statuses.length > 1 ? statuses.shift()! : statuses[0];
+    res.end(String(res.statusCode));
+  };
+}
+
+describe("HttpClient retries", () => {
+  it("retries GETs on retryable statuses until one succeeds", async () => {
+    respondWith(503, 502, 200);
+    const http = client();
+
+    const response = await http.fetch(baseUrl);
+
+    expect(response.status).toBe(200);
+    expect(await response.text()).toBe("200");
+    expect(hits).toBe(3);
+    expect(http.stats().retries).toBe(2);
+  });
+
+  it("returns the last response once the retries run out", async () => {
+    respondWith(503);
+    const http = client({ retries: 1 });
+
+    const response = await http.fetch(baseUrl);
+
+    expect(response.status).toBe(503);
+    expect(await response.text()).toBe("503");
+    expect(hits).toBe(2);
+  });
+
+  it("does not retry statuses outside the retryable set", async () => {
+    respondWith(500);
+    const response = await client().fetch(baseUrl);
+
+    expect(response.status).toBe(500);
+    await response.body?.cancel();
+    expect(hits).toBe(1);
+  });
+
+  it("sends POSTs once unless they are marked idempotent", async () => {
+    respondWith(503);
+    const http = client({ retries: 1 });
+
+    const once = await http.fetch(baseUrl, { method: "POST", body: "x" });
+    await once.body?.cancel();
+    expect(hits).toBe(1);
+
+    const twice = await http.fetch(baseUrl, { method: "POST", body: "x", idempotent: true });
+    await twice.body?.cancel();
+    expect(hits).toBe(3);
+  });
+
+  it("waits for Retry-After before the next attempt", async () => {
+    let first = true;
+    handler = (_req, res) => {
+      if (first) {
+        first = false;
+        res.writeHead(429, { "retry-after": "1" }).end();
+      } else {
+        res.end("ok");
+      }
+    };
+
+    const startedAt = Date.now();
+    const response = await client().fetch(baseUrl);
+
+    expect(await response.text()).toBe("ok");
+    expect(Date.now() - startedAt).toBeGreaterThanOrEqual(950);
+    expect(hits).toBe(2);
+  });
+
+  it("retries dropped connections", async () => {
+    let first = true;
+    handler = (req, res) => {
+      if (first) {
+        first = false;
+        req.socket.destroy();
+      } else {
+        res.end("ok");
+      }
+    };
+
+    const response = await client().fetch(baseUrl);
+
+    expect(await response.text()).toBe("ok");
+    expect(hits).toBe(2);
+  });
+
+  it("gives up on an attempt after timeoutMs", async () => {
+    handler = () => undefined;
+    const http = client({ timeoutMs: 50, retries: 0 });
+
+    await expect(http.fetch(baseUrl)).rejects.toThrow();
+    expect(http.stats().consecutiveFailures).toBe(1);
+  });
+
+  it("sets no timeout when timeoutMs is 0", async () => {
+    const timeout = vi.spyOn(AbortSignal, "timeout");
+    handler = (_req, res) => {
+      setTimeout(() => res.end("ok"), 50);
+    };
+
+    const response = await client({ timeoutMs: 0 }).fetch(baseUrl);
+
+    expect(await response.text()).toBe("ok");
+    expect(timeout).not.toHaveBeenCalled();
+  });
+
+  it("does not count an aborted call against the upstream", async () => {
+    handler = () => undefined;
+    const http = client();
+    const controller = new AbortController();
+    setTimeout(() => controller.abort(), 20);
+
+    await expect(http.fetch(baseUrl, { signal: controller.signal })).rejects.toThrow();
+    expect(hits).toBe(1);
+    expect(http.stats().consecutiveFailures).toBe(0);
+  });
+});
+
+describe("HttpClient circuit breaker", () => {
+  it("opens after consecutive failures and fails fast while open", async () => {
+    respondWith(503);
+    const http = client({ retries: 0, breakerThreshold: 2, breakerCooldownMs: 60_000 });
+
+    for (let i = 0; i < 2; i++) {
+      const response = await http.fetch(baseUrl);
+      await response.body?.cancel();
+    }
+
+    await expect(http.fetch(baseUrl)).rejects.toThrow(CircuitOpenError);
+    expect(hits).toBe(2);
+    expect(http.stats()).toMatchObject({ circuit: "open", circuitOpens: 1, rejected: 1 });
+  });
+
+  it("lets a single probe through after the cooldown and closes when it succeeds", async () => {
+    respondWith(503);
+    const http = client({ retries: 0, breakerThreshold: 1, breakerCooldownMs: 50 });
+    await (await http.fetch(baseUrl)).body?.cancel();
+    expect(http.stats().circuit).toBe("open");
+
+    await sleep(60);
+    handler = (_req, res) => {
+      setTimeout(() => res.end("ok"), 50);
+    };
+    const probe = http.fetch(baseUrl);
+    // Only the probe may reach the upstream while the circuit is half-open
+    await expect(http.fetch(baseUrl)).rejects.toThrow(CircuitOpenError);
+    expect(http.stats().circuit).toBe("half-open");
+
+    expect(await (await probe).text()).toBe("ok");
+    expect(http.stats()).toMatchObject({ circuit: "closed", consecutiveFailures: 0 });
+    expect(await (await http.fetch(baseUrl)).text()).toBe("ok");
+  });
+
+  it("reopens when the probe fails", async () => {
+    respondWith(503);
+    const http = client({ retries: 0, breakerThreshold: 1, breakerCooldownMs: 50 });
+    await (await http.fetch(baseUrl)).body?.cancel();
+
+    await sleep(60);
+    await (await http.fetch(baseUrl)).body?.cancel();
+
+    expect(http.stats()).toMatchObject({ circuit: "open", circuitOpens: 2 });
+    await expect(http.fetch(baseUrl)).rejects.toThrow(CircuitOpenError);
+  });
+});
+
+describe("HttpClient concurrency", () => {
+  it("holds the slot until the body has been read", async () => {
+    const http = client({ concurrency: 1 });
+
+    const first = await http.fetch(baseUrl);
+    const second = http.fetch(baseUrl);
+    await sleep(20);
+    expect(hits).toBe(1);
+    expect(http.stats()).toMatchObject({ inFlight: 1, queued: 1 });
+
+    await first.text();
+    expect(await (await second).text()).toBe("ok");
+    expect(http.stats()).toMatchObject({ inFlight: 0, queued: 0 });
+  });
+
+  it("frees the slot when the body is cancelled", async () => {
+    const http = client({ concurrency: 1 });
+
+    const response = await http.fetch(baseUrl);
+    expect(http.stats().inFlight).toBe(1);
+    await response.body?.cancel();
+
+    expect(http.stats().inFlight).toBe(0);
+  });
+});
+
+describe("TtlCache", () => {
+  let now: number;
+
+  beforeEach(() => {
+    now = 1_000_000;
+    vi.spyOn(Date, "now").mockImplementation(() => now);
+  });
+
+  it("shares one load between concurrent callers", async () => {
+    const cache = new TtlCache<string>(10);
+    let resolve!: (value: string) => void;
+    const load = vi.fn(() => new Promise<string>(res => (resolve = res)));
+
+    const first = cache.getOrLoad("k", load, () => 1000);
+    const second = cache.getOrLoad("k", load, () => 1000);
+    resolve("v");
+
+    expect(await first).toBe("v");
+    expect(await second).toBe("v");
+    expect(load).toHaveBeenCalledTimes(1);
+    expect(cache.misses).toBe(1);
+    expect(cache.hits).toBe(1);
+  });
+
+  it("reloads once the TTL chosen for the value has passed", async () => {
+    const cache = new TtlCache<string>(10);
+    const load = vi.fn(async () => "v");
+
+    await cache.getOrLoad("k", load, () => 1000);
+    now += 999;
+    await cache.getOrLoad("k", load, () => 1000);
+    expect(load).toHaveBeenCalledTimes(1);
+
+    now += 1;
+    await cache.getOrLoad("k", load, () => 1000);
+    expect(load).toHaveBeenCalledTimes(2);
+  });
+
+  it("does not keep values whose TTL is zero or less, nor failed loads", async () => {
+    const cache = new TtlCache<string>(10);
+    const load = vi.fn(async () => "v");
+
+    await cache.getOrLoad("k", load, () => 0);
+    await cache.getOrLoad("k", load, () => 0);
+    expect(load).toHaveBeenCalledTimes(2);
+
+    await expect(cache.getOrLoad("bad", async () => Promise.reject(new Error("down")), () => 1000)).rejects.toThrow("down");
+    expect(await cache.getOrLoad("bad", load, () => 1000)).toBe("v");
+  });
+
+  it("evicts the least recently used entry when full", async () => {
+    const cache = new TtlCache<string>(2);
+    const load = (value: string) => async () => value;
+
+    await cache.getOrLoad("a", load("a"), () => 1000);
+    await cache.getOrLoad("b", load("b"), () => 1000);
+    // Reading a makes b the oldest
+    await cache.getOrLoad("a", load("a"), () => 1000);
+    await cache.getOrLoad("c", load("c"), () => 1000);
+
+    expect(cache.size).toBe(2);
+    const reload = vi.fn(async () => "b2");
+    expect(await cache.getOrLoad("b", reload, () => 1000)).toBe("b2");
+    expect(reload).toHaveBeenCalledTimes(1);
+  });
+});
@@ -0,0 +1,434 @@
+import { performance } from "node:perf_hooks";
+import { setTimeout as sleep } from "node:timers/promises";
+import { ENV } from "./env";
+import { LruTtlMap } from "./lruCache";
+import { recordLatency } from "./metrics";
+
+// Statuses worth another attempt on an idempotent request
+const RETRYABLE_STATUS = new Set([408, 429, 502, 503, 504]);
+const BACKOFF_BASE_MS = 200;
+const BACKOFF_MAX_MS = 5000;
+const RETRY_AFTER_MAX_MS = 10000;
+
+export type HttpIntegration =
+  | "llm"
+  | "maps"
+  | "dataApi"
+  | "notification"
+  | "imageGeneration"
+  | "voiceTranscription"
+  | "storage"
+  | "storageUpload";
+
+export type HttpClientPolicy = {
+  /** Requests in flight at once; the rest wait in FIFO order. */
+  concurrency: number;
+  /** Budget per attempt, covering the response body as well as the headers; 0 disables it. */
+  timeoutMs: number;
+  /** Extra attempts for idempotent requests that fail transiently. */
+  retries: number;
+  /** Consecutive failures (network, timeout, 429 or 5xx) that open the circuit. */
+  breakerThreshold: number;
+  /** How long an open circuit fails fast before letting one probe through. */
+  breakerCooldownMs: number;
+  /** Maximum entries kept by `cached`. */
+  cacheEntries: number;
+};
+
+export type HttpRequestInit = RequestInit & {
+  /**
+   * Whether the request may be sent again after a transient failure. Defaults
+   * to true for GET/HEAD. Stream bodies cannot be replayed and must not set it.
+   */
+  idempotent?: boolean;
+  timeoutMs?: number;
+  /** Required by fetch when the body is a stream. */
+  duplex?: "half";
+};
+
+export type CircuitState = "closed" | "open" | "half-open";
+
+export type HttpClientStats = {
+  name: string;
+  inFlight: number;
+  queued: number;
+  circuit: CircuitState;
+  consecutiveFailures: number;
+  circuitOpens: number;
+  rejected: number;
+  retries: number;
+  cacheSize: number;
+  cacheHits: number;
+  cacheMisses: number;
+};
+
+export class CircuitOpenError extends Error {
+  constructor(
+    readonly integration: string,
+    readonly retryAt: Date
+  ) {
+    super(`${integration} is unavailable (circuit open until ${retryAt.toISOString()})`);
+    this.name = "CircuitOpenError";
+  }
+}
+
+class Semaphore {
+  private active = 0;
+  private readonly waiters: Array<() => void> = [];
+
+  constructor(private readonly limit: number) {}
+
+  get inFlight() {
+    return this.active;
+  }
+
+  get queued() {
+    return this.waiters.length;
+  }
+
+  async acquire() {
+    if (this.active < this.limit) {
+      this.active++;
+      return;
+    }
+    await new Promise<void>(resolve => this.waiters.push(resolve));
+  }
+
+  release() {
+    const next = this.waiters.shift();
+    if (next) {
+      // Hand the slot straight to the next waiter
+      next();
+    } else {
+      this.active--;
+    }
+  }
+}
+
+class CircuitBreaker {
+  state: CircuitState = "closed";
+  consecutiveFailures = 0;
+  opens = 0;
+  private openedAt = 0;
+  private probing = false;
+
+  constructor(
+    private readonly threshold: number,
+    private readonly cooldownMs: number
+  ) {}
+
+  get retryAt() {
+    return new Date(this.openedAt + this.cooldownMs);
+  }
+
+  /** False while open; once the cooldown passes, lets a single probe through. */
+  allow(now = Date.now()) {
+    if (this.state === "open") {
+      if (now - this.openedAt < this.cooldownMs) return false;
+      this.state = "half-open";
+    }
+    if (this.state === "half-open") {
+      if (this.probing) return false;
+      this.probing = true;
+    }
+    return true;
+  }
+
+  /** Ends a call without judging upstream health (e.g. the caller aborted). */
+  release() {
+    this.probing = false;
+  }
+
+  success() {
+    this.state = "closed";
+    this.consecutiveFailures = 0;
+    this.probing = false;
+  }
+
+  failure(now = Date.now()) {
+    this.probing = false;
+    this.consecutiveFailures++;
+    if (this.state === "half-open" || (this.state === "closed" && this.consecutiveFailures >= this.threshold)) {
+      this.state = "open";
+      this.openedAt = now;
+      this.opens++;
+    }
+  }
+}
+
+/**
+ * LRU cache with a per-entry TTL chosen from the loaded value. Concurrent
+ * loads of the same key share one request.
+ */
+export class TtlCache<T> {
+  private readonly entries: LruTtlMap<T>;
+  private readonly pending = new Map<string, Promise<T>>();
+  hits = 0;
+  misses = 0;
+
+  constructor(maxEntries: number) {
+    this.entries = new LruTtlMap(maxEntries);
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+
+  async getOrLoad(key: string, load: () => Promise<T>, ttlMs: (value: T) => number): Promise<T> {
+    const cached = this.entries.get(key);
+    if (cached !== undefined) {
+      this.hits++;
+      return cached;
+    }
+
+    const inFlight = this.pending.get(key);
+    if (inFlight) {
+      this.hits++;
+      return inFlight;
+    }
+
+    this.misses++;
+    const promise = load()
+      .then(value => {
+        const ttl = ttlMs(value);
+        if (ttl > 0) this.entries.set(key, value, Date.now() + ttl);
+        return value;
+      })
+      .finally(() => this.pending.delete(key));
+    this.pending.set(key, promise);
+    return promise;
+  }
+
+  delete(key: string) {
+    this.entries.delete(key);
+  }
+
+  clear() {
+    this.entries.clear();
+    this.hits = 0;
+    this.misses = 0;
+  }
+}
+
+// Responses to these statuses never have a body
+const NULL_BODY_STATUS = new Set([101, 204, 205, 304]);
+
+/**
+ * Calls `release` once the body has been read to the end, cancelled or has
+ * failed, so a concurrency slot covers the download as well as the headers.
+ * `signal` (the attempt's timeout/caller signal) bounds a body nobody reads.
+ */
+function releaseAfterBody(response: Response, release: () => void, signal?: AbortSignal): Response {
+  if (!response.body || NULL_BODY_STATUS.has(response.status)) {
+    release();
+    return response;
+  }
+
+  let released = false;
+  const done = () => {
+    if (released) return;
+    released = true;
+    signal?.removeEventListener("abort", done);
+    release();
+  };
+  signal?.addEventListener("abort", done, { once: true });
+
+  const reader = response.body.getReader();
+  const body = new ReadableStream<Uint8Array>({
+    async pull(controller) {
+      try {
+        const { done: finished, value } = await reader.read();
+        if (finished) {
+          done();
+          controller.close();
+        } else {
+          controller.enqueue(value);
+        }
+      } catch (error) {
+        done();
+        controller.error(error);
+      }
+    },
+    cancel(reason) {
+      done();
+      return reader.cancel(reason);
+    },
+  });
+  return new Response(body, {
+    status: response.status,
+    statusText: response.statusText,
+    headers: response.headers,
+  });
+}
+
+function backoffMs(attempt: number) {
+  // Full jitter: spreads retries from many callers over the whole window
+  return Math.random() * Math.min(BACKOFF_MAX_MS, BACKOFF_BASE_MS * 2 ** (attempt - 1));
+}
+
+function retryAfterMs(response: Response): number | undefined {
+  const header = response.headers.get("retry-after");
+  if (!header) return undefined;
+  const seconds = Number(header);
+  const ms = Number.isFinite(seconds) ? seconds * 1000 : Date.parse(header) - Date.now();
+  return Number.isFinite(ms) ? Math.min(Math.max(ms, 0), RETRY_AFTER_MAX_MS) : undefined;
+}
+
+/**
+ * `fetch` for one outbound integration: caps concurrency, applies a timeout
+ * per attempt, retries idempotent requests with jittered backoff and fails
+ * fast while the upstream keeps erroring. Connections are reused through the
+ * keep-alive pool of Node's built-in fetch.
+ *
+ * Non-2xx responses are returned as-is (after retries), so callers keep their
+ * own error handling; only network errors, timeouts and an open circuit throw.
+ * The concurrency slot is held until the response body is consumed, so callers
+ * must read or cancel it (an unread body holds the slot until the timeout).
+ */
+export class HttpClient {
+  private readonly limiter: Semaphore;
+  private readonly breaker: CircuitBreaker;
+  private readonly cache: TtlCache<unknown>;
+  private rejected = 0;
+  private retries = 0;
+
+  constructor(
+    readonly name: string,
+    private readonly policy: HttpClientPolicy
+  ) {
+    this.limiter = new Semaphore(policy.concurrency);
+    this.breaker = new CircuitBreaker(policy.breakerThreshold, policy.breakerCooldownMs);
+    this.cache = new TtlCache(policy.cacheEntries);
+  }
+
+  async fetch(input: string | URL, init: HttpRequestInit = {}): Promise<Response> {
+    const { idempotent, timeoutMs = this.policy.timeoutMs, ...requestInit } = init;
+    const method = (requestInit.method ?? "GET").toUpperCase();
+    const retryable = idempotent ?? (method === "GET" || method === "HEAD");
+    const maxAttempts = retryable ? this.policy.retries + 1 : 1;
+    const callerSignal = requestInit.signal ?? undefined;
+
+    await this.limiter.acquire();
+    const startedAt = performance.now();
+    let failed = true;
+    // Set once the returned body takes over releasing the slot
+    let slotHandedOff = false;
+    try {
+      for (let attempt = 1; ; attempt++) {
+        if (!this.breaker.allow()) {
+          this.rejected++;
+          throw new CircuitOpenError(this.name, this.breaker.retryAt);
+        }
+
+        const timeout = timeoutMs > 0 ? AbortSignal.timeout(timeoutMs) : undefined;
+        const signal = callerSignal && timeout ? AbortSignal.any([callerSignal, timeout]) : callerSignal ?? timeout;
+
+        let response: Response;
+        try {
+          response = await fetch(input, { ...requestInit, signal });
+        } catch (error) {
+          if (callerSignal?.aborted) {
+            // The caller gave up; say nothing about upstream health
+            this.breaker.release();
+            throw error;
+          }
+          this.breaker.failure();
+          if (attempt >= maxAttempts) throw error;
+          this.retries++;
+          await sleep(backoffMs(attempt));
+          continue;
+        }
+
+        if (response.status >= 500 || response.status === 429) {
+          this.breaker.failure();
+        } else {
+          this.breaker.success();
+        }
+
+        if (attempt >= maxAttempts || !RETRYABLE_STATUS.has(response.status)) {
+          failed = !response.ok;
+          slotHandedOff = true;
+          return releaseAfterBody(response, () => this.limiter.release(), signal);
+        }
+
+        const delay = retryAfterMs(response) ?? backoffMs(attempt);
+        await response.body?.cancel().catch(() => undefined);
+        this.retries++;
+        await sleep(delay);
+      }
+    } finally {
+      if (!slotHandedOff) this.limiter.release();
+      recordLatency("http", this.name, performance.now() - startedAt, failed);
+    }
+  }
+
+  /**
+   * Returns the cached value for `key`, loading it on a miss. `ttlMs` decides
+   * how long each loaded value stays fresh; 0 or less skips caching it.
+   */
+  cached<T>(key: string, load: () => Promise<T>, ttlMs: (value: T) => number): Promise<T> {
+    return (this.cache as TtlCache<T>).getOrLoad(key, load, ttlMs);
+  }
+
+  invalidate(key: string) {
+    this.cache.delete(key);
+  }
+
+  /** Closes the circuit and clears the cache and counters. */
+  reset() {
+    this.breaker.success();
+    this.breaker.opens = 0;
+    this.cache.clear();
+    this.rejected = 0;
+    this.retries = 0;
+  }
+
+  stats(): HttpClientStats {
+    return {
+      name: this.name,
+      inFlight: this.limiter.inFlight,
+      queued: this.limiter.queued,
+      circuit: this.breaker.state,
+      consecutiveFailures: this.breaker.consecutiveFailures,
+      circuitOpens: this.breaker.opens,
+      rejected: this.rejected,
+      retries: this.retries,
+      cacheSize: this.cache.size,
+      cacheHits: this.cache.hits,
+      cacheMisses: this.cache.misses,
+    };
+  }
+}
+
+export function createHttpClient(name: string, policy: Partial<HttpClientPolicy> = {}) {
+  return new HttpClient(name, {
+    concurrency: 16,
+    timeoutMs: 15000,
+    retries: ENV.httpRetries,
+    breakerThreshold: ENV.httpBreakerThreshold,
+    breakerCooldownMs: ENV.httpBreakerCooldownMs,
+    cacheEntries: 0,
+    ...policy,
+  });
+}
+
+export const httpClients: Record<HttpIntegration, HttpClient> = {
+  llm: createHttpClient("llm", { concurrency: 8, timeoutMs: 120000 }),
+  maps: createHttpClient("maps", { concurrency: 16, cacheEntries: 5000 }),
+  dataApi: createHttpClient("dataApi", { concurrency: 8, timeoutMs: 30000 }),
+  notification: createHttpClient("notification", { concurrency: 4 }),
+  imageGeneration: createHttpClient("imageGeneration", { concurrency: 4, timeoutMs: 120000 }),
+  voiceTranscription: createHttpClient("voiceTranscription", { concurrency: 4, timeoutMs: 120000 }),
+  storage: createHttpClient("storage", { concurrency: 16, timeoutMs: 60000, cacheEntries: 10000 }),
+  // Streamed uploads last as long as the uploader takes, so they get no slot
+  // limit or timeout and their own breaker; the caller's signal bounds them
+  storageUpload: createHttpClient("storageUpload", { concurrency: Infinity, timeoutMs: 0 }),
+};
+
+export function getHttpClientStats(): HttpClientStats[] {
+  return Object.values(httpClients).map(client => client.stats());
+}
+
+export function resetHttpClients() {
+  Object.values(httpClients).forEach(client => client.reset());
+}
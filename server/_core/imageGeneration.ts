@@ -17,6 +17,7 @@
  */
 import { storagePut } from "server/storage";
 import { ENV } from "./env";
+import { httpClients } from "./httpClient";
 
 export type GenerateImageOptions = {
   prompt: string;
@@ -50,7 +51,7 @@ export async function generateImage(
     baseUrl
   ).toString();
 
-  const response = await fetch(fullUrl, {
+  const response = await httpClients.imageGeneration.fetch(fullUrl, {
     method: "POST",
     headers: {
       accept: "application/json",
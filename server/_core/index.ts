@@ -1,38 +1,114 @@
 import "dotenv/config";
 import express from "express";
-import { createServer } from "http";
-import net from "net";
+import cluster from "node:cluster";
+import os from "node:os";
+import { createServer, type Server } from "http";
 import { createExpressMiddleware } from "@trpc/server/adapters/express";
 import { registerOAuthRoutes } from "./oauth";
+import { registerBulkRoutes } from "../bulk";
+import { registerUploadRoutes } from "../uploads";
+import { closeDb } from "../db";
 import { appRouter } from "../routers";
 import { createContext } from "./context";
+import { ENV } from "./env";
+import { sdk } from "./sdk";
 import { serveStatic, setupVite } from "./vite";
 
-function isPortAvailable(port: number): Promise<boolean> {
-  return new Promise(resolve => {
-    const server = net.createServer();
-    server.listen(port, () => {
-      server.close(() => resolve(true));
-    });
-    server.on("error", () => resolve(false));
+const isDevelopment = process.env.NODE_ENV === "development";
+
+const RESTART_DELAY_MS = 1000;
+const RESTART_DELAY_MAX_MS = 30_000;
+// A worker that lived this long booted fine, so its replacement starts quickly
+const HEALTHY_UPTIME_MS = 10_000;
+
+let shuttingDown = false;
+
+function listen(server: Server, port: number): Promise<void> {
+  return new Promise((resolve, reject) => {
+    const onError = (error: Error) => {
+      server.off("listening", onListening);
+      reject(error);
+    };
+    const onListening = () => {
+      server.off("error", onError);
+      resolve();
+    };
+    server.once("error", onError);
+    server.once("listening", onListening);
+    server.listen(port);
   });
 }
 
-async function findAvailablePort(startPort: number = 3000): Promise<number> {
-  for (let port = startPort; port < startPort + 20; port++) {
-    if (await isPortAvailable(port)) {
+/**
+ * Binds directly and moves to the next port only on EADDRINUSE, so there is no
+ * window between probing a port and using it. Production binds PORT or fails.
+ */
+async function listenOnAvailablePort(server: Server, preferredPort: number): Promise<number> {
+  const attempts = isDevelopment ? 20 : 1;
+  for (let port = preferredPort; ; port++) {
+    try {
+      await listen(server, port);
       return port;
+    } catch (error) {
+      const inUse = (error as NodeJS.ErrnoException).code === "EADDRINUSE";
+      if (!inUse || port >= preferredPort + attempts - 1) {
+        throw error;
+      }
     }
   }
-  throw new Error(`No available port found starting from ${startPort}`);
+}
+
+/**
+ * On SIGTERM/SIGINT: stop accepting connections, let in-flight requests finish
+ * (forcing the rest closed after SHUTDOWN_TIMEOUT_MS), then write pending
+ * lastSignedIn timestamps and close the DB pool.
+ */
+function registerGracefulShutdown(server: Server) {
+  const shutdown = async (signal: NodeJS.Signals) => {
+    if (shuttingDown) return;
+    shuttingDown = true;
+    console.log(`[Server] ${signal} received, draining connections`);
+
+    const forceClose = setTimeout(() => {
+      console.warn("[Server] Shutdown timeout reached, closing remaining connections");
+      server.closeAllConnections();
+    }, ENV.shutdownTimeoutMs);
+    forceClose.unref();
+
+    const closed = new Promise<void>(resolve => server.close(() => resolve()));
+    server.closeIdleConnections();
+    await closed;
+    clearTimeout(forceClose);
+
+    try {
+      sdk.lastSignedIn.stop();
+      await sdk.lastSignedIn.flush();
+      await closeDb();
+    } catch (error) {
+      console.error("[Server] Error while shutting down:", error);
+      process.exit(1);
+    }
+    process.exit(0);
+  };
+
+  process.once("SIGTERM", shutdown);
+  process.once("SIGINT", shutdown);
 }
 
 async function startServer() {
   const app = express();
   const server = createServer(app);
-  // Configure body parser with larger size limit for file uploads
-  app.use(express.json({ limit: "50mb" }));
-  app.use(express.urlencoded({ limit: "50mb", extended: true }));
+  // Keep-alive clients are told to reconnect (to another worker) while draining
+  app.use((_req, res, next) => {
+    if (shuttingDown) res.setHeader("Connection", "close");
+    next();
+  });
+  // Bulk import/export and uploads stream their own bodies, so they are mounted before the parsers
+  registerBulkRoutes(app);
+  registerUploadRoutes(app);
+  // Files go through /api/upload; JSON bodies are only ever small tRPC payloads
+  app.use(express.json({ limit: "1mb" }));
+  app.use(express.urlencoded({ limit: "1mb", extended: true }));
   // OAuth callback under /api/oauth/callback
   registerOAuthRoutes(app);
   // tRPC API
@@ -44,22 +120,85 @@ async function startServer() {
     })
   );
   // development mode uses Vite, production mode uses static files
-  if (process.env.NODE_ENV === "development") {
+  if (isDevelopment) {
     await setupVite(app, server);
   } else {
     serveStatic(app);
   }
 
+  registerGracefulShutdown(server);
+
   const preferredPort = parseInt(process.env.PORT || "3000");
-  const port = await findAvailablePort(preferredPort);
+  const port = await listenOnAvailablePort(server, preferredPort);
 
   if (port !== preferredPort) {
     console.log(`Port ${preferredPort} is busy, using port ${port} instead`);
   }
+  const worker = cluster.isWorker ? ` (worker ${process.pid})` : "";
+  console.log(`Server running on http://localhost:${port}/${worker}`);
+}
+
+/**
+ * Forks WEB_CONCURRENCY workers that share the listen socket, replaces any that
+ * die, and forwards SIGTERM/SIGINT so each one drains before exiting. Workers
+ * that keep dying during boot are restarted with a doubling delay.
+ */
+function startPrimary(workers: number) {
+  console.log(`[Cluster] Primary ${process.pid} starting ${workers} workers`);
+  let stopping = false;
+  let restartDelay = RESTART_DELAY_MS;
+  const forkedAt = new Map<number, number>();
+  const restarts = new Set<NodeJS.Timeout>();
+
+  const fork = () => {
+    forkedAt.set(cluster.fork().id, Date.now());
+  };
 
-  server.listen(port, () => {
-    console.log(`Server running on http://localhost:${port}/`);
+  for (let i = 0; i < workers; i++) {
+    fork();
+  }
+
+  cluster.on("exit", (worker, code, signal) => {
+    const uptime = Date.now() - (forkedAt.get(worker.id) ?? 0);
+    forkedAt.delete(worker.id);
+    if (stopping) {
+      if (Object.keys(cluster.workers ?? {}).length === 0) process.exit(0);
+      return;
+    }
+
+    if (uptime >= HEALTHY_UPTIME_MS) restartDelay = RESTART_DELAY_MS;
+    console.warn(`[Cluster] Worker ${worker.process.pid} exited (${signal ?? code}), restarting in ${restartDelay}ms`);
+    const timer = setTimeout(() => {
+      restarts.delete(timer);
+      // A worker forked after stop() would never be signalled
+      if (!stopping) fork();
+    }, restartDelay);
+    restarts.add(timer);
+    restartDelay = Math.min(restartDelay * 2, RESTART_DELAY_MAX_MS);
   });
+
+  const stop = (signal: NodeJS.Signals) => {
+    if (stopping) return;
+    stopping = true;
+    console.log(`[Cluster] ${signal} received, stopping workers`);
+    restarts.forEach(clearTimeout);
+    restarts.clear();
+    const running = Object.values(cluster.workers ?? {});
+    // Every worker may be dead and waiting for a restart; nothing left to drain
+    if (running.length === 0) process.exit(0);
+    running.forEach(worker => worker?.process.kill(signal));
+  };
+  process.once("SIGTERM", stop);
+  process.once("SIGINT", stop);
 }
 
-startServer().catch(console.error);
+const workers = ENV.webConcurrency > 0 ? ENV.webConcurrency : os.availableParallelism();
+
+if (!isDevelopment && workers > 1 && cluster.isPrimary) {
+  startPrimary(workers);
+} else {
+  startServer().catch(error => {
+    console.error(error);
+    process.exit(1);
+  });
+}
@@ -1,4 +1,5 @@
 import { ENV } from "./env";
+import { httpClients } from "./httpClient";
 
 export type Role = "system" | "user" | "assistant" | "tool" | "function";
 
@@ -66,6 +67,8 @@ export type InvokeParams = {
   output_schema?: OutputSchema;
   responseFormat?: ResponseFormat;
   response_format?: ResponseFormat;
+  /** Resend on rate limits, 5xx and timeouts. Every attempt can be billed as a separate completion. */
+  retry?: boolean;
 };
 
 export type ToolCall = {
@@ -277,6 +280,7 @@ export async function invokeLLM(params: InvokeParams): Promise<InvokeResult> {
     output_schema,
     responseFormat,
     response_format,
+    retry = false,
   } = params;
 
   const payload: Record<string, unknown> = {
@@ -312,13 +316,15 @@ export async function invokeLLM(params: InvokeParams): Promise<InvokeResult> {
     payload.response_format = normalizedResponseFormat;
   }
 
-  const response = await fetch(resolveApiUrl(), {
+  // Not retried unless the caller opts in: a timed-out completion may still run and be billed
+  const response = await httpClients.llm.fetch(resolveApiUrl(), {
     method: "POST",
     headers: {
       "content-type": "application/json",
       authorization: `Bearer ${ENV.forgeApiKey}`,
     },
     body: JSON.stringify(payload),
+    idempotent: retry,
   });
 
   if (!response.ok) {
@@ -0,0 +1,59 @@
+import { describe, expect, it, vi } from "vitest";
+import { LruTtlMap } from "./lruCache";
+
+describe("LruTtlMap", () => {
+  it("returns values until their expiry and drops them after", () => {
+    const map = new LruTtlMap<string>(10);
+    map.set("k", "v", 1000);
+
+    expect(map.get("k", 999)).toBe("v");
+    expect(map.get("k", 1000)).toBeUndefined();
+    expect(map.size).toBe(0);
+  });
+
+  it("evicts the least recently used entry and reports how many went", () => {
+    const map = new LruTtlMap<string>(2);
+    map.set("a", "a", Infinity);
+    map.set("b", "b", Infinity);
+    // Reading a makes b the oldest
+    map.get("a");
+
+    expect(map.set("c", "c", Infinity)).toBe(1);
+    expect(map.get("b")).toBeUndefined();
+    expect(map.get("a")).toBe("a");
+    expect(map.get("c")).toBe("c");
+  });
+
+  it("does not count replacing a key as an eviction", () => {
+    const map = new LruTtlMap<string>(1);
+    map.set("a", "1", Infinity);
+
+    expect(map.set("a", "2", Infinity)).toBe(0);
+    expect(map.get("a")).toBe("2");
+  });
+
+  it("calls onRemove for every entry that leaves the map", () => {
+    const onRemove = vi.fn();
+    const map = new LruTtlMap<string>(2, onRemove);
+    map.set("expired", "1", 10);
+    map.get("expired", 10);
+    map.set("a", "2", Infinity);
+    map.set("b", "3", Infinity);
+    map.set("c", "4", Infinity);
+    map.delete("b");
+    map.clear();
+
+    expect(onRemove.mock.calls).toEqual([
+      ["expired", "1"],
+      ["a", "2"],
+      ["b", "3"],
+      ["c", "4"],
+    ]);
+  });
+
+  it("stores nothing when maxEntries is 0", () => {
+    const map = new LruTtlMap<string>(0);
+    expect(map.set("k", "v", Infinity)).toBe(0);
+    expect(map.get("k")).toBeUndefined();
+  });
+});
@@ -0,0 +1,64 @@
+type Entry<V> = { value: V; expiresAt: number };
+
+/**
+ * Map with a per-entry expiry that evicts the least recently used entry once
+ * it holds more than `maxEntries`; 0 or less stores nothing. `onRemove` runs
+ * for every entry that leaves the map (expired, evicted, deleted or cleared),
+ * so callers can keep secondary indexes in step.
+ */
+export class LruTtlMap<V> {
+  private readonly entries = new Map<string, Entry<V>>();
+
+  constructor(
+    private readonly maxEntries: number,
+    private readonly onRemove?: (key: string, value: V) => void
+  ) {}
+
+  get size() {
+    return this.entries.size;
+  }
+
+  /** The live value for `key`, now the most recently used; expired entries are dropped. */
+  get(key: string, now = Date.now()): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) return undefined;
+    if (entry.expiresAt <= now) {
+      this.delete(key);
+      return undefined;
+    }
+    // Maps iterate in insertion order, so re-inserting marks the entry as newest
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  /** Stores `value` until `expiresAt` (epoch ms) and returns how many entries were evicted. */
+  set(key: string, value: V, expiresAt: number): number {
+    if (this.maxEntries <= 0) return 0;
+    this.delete(key);
+    this.entries.set(key, { value, expiresAt });
+
+    let evicted = 0;
+    while (this.entries.size > this.maxEntries) {
+      const oldest = this.entries.keys().next().value;
+      if (oldest === undefined) break;
+      this.delete(oldest);
+      evicted++;
+    }
+    return evicted;
+  }
+
+  delete(key: string): boolean {
+    const entry = this.entries.get(key);
+    if (!entry) return false;
+    this.entries.delete(key);
+    this.onRemove?.(key, entry.value);
+    return true;
+  }
+
+  clear() {
+    for (const key of Array.from(this.entries.keys())) {
+      this.delete(key);
+    }
+  }
+}
@@ -8,6 +8,7 @@
  */
 
 import { ENV } from "./env";
+import { httpClients } from "./httpClient";
 
 // ============================================================================
 // Configuration
@@ -34,6 +35,12 @@ function getMapsConfig(): MapsConfig {
   };
 }
 
+// Endpoints whose GET responses are cached, and for how long
+const CACHE_TTL_MS: Record<string, number> = {
+  "/maps/api/geocode/json": 24 * 60 * 60 * 1000,
+  "/maps/api/directions/json": 10 * 60 * 1000,
+};
+
 // ============================================================================
 // Core Request Handler
 // ============================================================================
@@ -71,22 +78,45 @@ export async function makeRequest<T = unknown>(
     }
   });
 
-  const response = await fetch(url.toString(), {
-    method: options.method || "GET",
-    headers: {
-      "Content-Type": "application/json",
-    },
-    body: options.body ? JSON.stringify(options.body) : undefined,
-  });
+  const send = async () => {
+    const response = await httpClients.maps.fetch(url.toString(), {
+      method: options.method || "GET",
+      headers: {
+        "Content-Type": "application/json",
+      },
+      body: options.body ? JSON.stringify(options.body) : undefined,
+    });
+
+    if (!response.ok) {
+      const errorText = await response.text();
+      throw new Error(
+        `Google Maps API request failed (${response.status} ${response.statusText}): ${errorText}`
+      );
+    }
 
-  if (!response.ok) {
-    const errorText = await response.text();
-    throw new Error(
-      `Google Maps API request failed (${response.status} ${response.statusText}): ${errorText}`
-    );
+    return (await response.json()) as T;
+  };
+
+  const ttlMs = CACHE_TTL_MS[endpoint];
+  if (!ttlMs || (options.method ?? "GET") !== "GET") {
+    return send();
   }
 
-  return (await response.json()) as T;
+  // Cache by endpoint + sorted params; the API key is the same for every call
+  const cacheKey = `${endpoint}?${Object.entries(params)
+    .filter(([, value]) => value !== undefined && value !== null)
+    .map(([key, value]) => `${key}=${String(value)}`)
+    .sort()
+    .join("&")}`;
+  return httpClients.maps.cached(cacheKey, send, (result: T) =>
+    isCacheableStatus(result) ? ttlMs : 0
+  );
+}
+
+// Only definitive answers are cached, never quota or transient errors
+function isCacheableStatus(result: unknown): boolean {
+  const status = (result as { status?: unknown } | null)?.status;
+  return status === "OK" || status === "ZERO_RESULTS";
 }
 
 // ============================================================================
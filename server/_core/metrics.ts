@@ -0,0 +1,152 @@
+import { AsyncLocalStorage } from "node:async_hooks";
+import { performance } from "node:perf_hooks";
+import type { Logger } from "drizzle-orm";
+import { ENV } from "./env";
+
+// Upper bounds in milliseconds; the last bucket catches everything slower
+const BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, Infinity];
+const SLOW_LOG_SIZE = 100;
+
+export type MetricKind = "db" | "trpc" | "http";
+
+export type LatencySummary = {
+  kind: MetricKind;
+  name: string;
+  count: number;
+  errors: number;
+  avgMs: number;
+  p50Ms: number;
+  p95Ms: number;
+  p99Ms: number;
+  maxMs: number;
+  buckets: { le: number | "+Inf"; count: number }[];
+};
+
+export type SlowOperation = {
+  kind: MetricKind;
+  name: string;
+  durationMs: number;
+  queries: string[];
+  at: string;
+};
+
+class LatencyHistogram {
+  readonly counts = new Array<number>(BUCKETS_MS.length).fill(0);
+  count = 0;
+  errors = 0;
+  sumMs = 0;
+  maxMs = 0;
+
+  record(ms: number, failed: boolean) {
+    this.count++;
+    if (failed) this.errors++;
+    this.sumMs += ms;
+    if (ms > this.maxMs) this.maxMs = ms;
+    const index = BUCKETS_MS.findIndex(bound => ms <= bound);
+    this.counts[index]++;
+  }
+
+  // Upper bound of the bucket containing the requested rank
+  percentile(p: number) {
+    if (this.count === 0) return 0;
+    const rank = Math.ceil(this.count * p);
+    let seen = 0;
+    for (let i = 0; i < BUCKETS_MS.length; i++) {
+      seen += this.counts[i];
+      if (seen >= rank) {
+        return Number.isFinite(BUCKETS_MS[i]) ? BUCKETS_MS[i] : this.maxMs;
+      }
+    }
+    return this.maxMs;
+  }
+}
+
+const histograms = new Map<string, { kind: MetricKind; name: string; histogram: LatencyHistogram }>();
+const slowLog: SlowOperation[] = [];
+
+// SQL statements issued inside the current timed db call, for the slow log
+const queryScope = new AsyncLocalStorage<string[]>();
+
+const round = (ms: number) => Math.round(ms * 100) / 100;
+
+export function recordLatency(kind: MetricKind, name: string, ms: number, failed = false) {
+  const key = `${kind}:${name}`;
+  let entry = histograms.get(key);
+  if (!entry) {
+    entry = { kind, name, histogram: new LatencyHistogram() };
+    histograms.set(key, entry);
+  }
+  entry.histogram.record(ms, failed);
+}
+
+export function recordSlowOperation(kind: MetricKind, name: string, ms: number, queries: string[] = []) {
+  if (ENV.slowQueryMs <= 0 || ms < ENV.slowQueryMs) return;
+  const entry: SlowOperation = {
+    kind,
+    name,
+    durationMs: round(ms),
+    queries,
+    at: new Date().toISOString(),
+  };
+  slowLog.push(entry);
+  if (slowLog.length > SLOW_LOG_SIZE) slowLog.shift();
+  console.warn(`[Slow ${kind}] ${name} took ${entry.durationMs}ms`, queries.length > 0 ? queries : "");
+}
+
+/**
+ * Wraps a db.ts function so each call is recorded under `name` and logged when
+ * it exceeds SLOW_QUERY_MS, together with the SQL it issued.
+ */
+export function timedDb<F extends (...args: any[]) => Promise<any>>(name: string, fn: F): F {
+  return (async (...args: Parameters<F>) => {
+    const queries: string[] = [];
+    const startedAt = performance.now();
+    let failed = false;
+    try {
+      return await queryScope.run(queries, () => fn(...args));
+    } catch (error) {
+      failed = true;
+      throw error;
+    } finally {
+      const elapsed = performance.now() - startedAt;
+      recordLatency("db", name, elapsed, failed);
+      recordSlowOperation("db", name, elapsed, queries);
+    }
+  }) as F;
+}
+
+/** Drizzle logger that attaches each statement to the surrounding timedDb call. */
+export const queryCaptureLogger: Logger = {
+  logQuery(query) {
+    queryScope.getStore()?.push(query);
+  },
+};
+
+export function getLatencySummaries(): LatencySummary[] {
+  return Array.from(histograms.values())
+    .map(({ kind, name, histogram }) => ({
+      kind,
+      name,
+      count: histogram.count,
+      errors: histogram.errors,
+      avgMs: round(histogram.count ? histogram.sumMs / histogram.count : 0),
+      p50Ms: round(histogram.percentile(0.5)),
+      p95Ms: round(histogram.percentile(0.95)),
+      p99Ms: round(histogram.percentile(0.99)),
+      maxMs: round(histogram.maxMs),
+      buckets: BUCKETS_MS.map((bound, i) => ({
+        le: Number.isFinite(bound) ? bound : ("+Inf" as const),
+        count: histogram.counts[i],
+      })),
+    }))
+    .sort((a, b) => b.avgMs * b.count - a.avgMs * a.count);
+}
+
+export function getSlowOperations(): SlowOperation[] {
+  return [...slowLog].reverse();
+}
+
+export function resetMetrics() {
+  histograms.clear();
+  slowLog.length = 0;
+}
@@ -1,5 +1,6 @@
 import { TRPCError } from "@trpc/server";
 import { ENV } from "./env";
+import { httpClients } from "./httpClient";
 
 export type NotificationPayload = {
   title: string;
@@ -85,7 +86,7 @@ export async function notifyOwner(
   const endpoint = buildEndpointUrl(ENV.forgeApiUrl);
 
   try {
-    const response = await fetch(endpoint, {
+    const response = await httpClients.notification.fetch(endpoint, {
       method: "POST",
       headers: {
         accept: "application/json",
@@ -106,6 +107,8 @@ export async function notifyOwner(
       return false;
     }
 
+    // Only the status matters; release the connection
+    await response.body?.cancel().catch(() => undefined);
     return true;
   } catch (error) {
     console.warn("[Notification] Error calling notification service:", error);
@@ -3,9 +3,10 @@ import { ForbiddenError } from "@shared/_core/errors";
 import axios, { type AxiosInstance } from "axios";
 import { parse as parseCookieHeader } from "cookie";
 import type { Request } from "express";
-import { SignJWT, jwtVerify } from "jose";
+import { SignJWT, decodeJwt, jwtVerify } from "jose";
 import type { User } from "../../drizzle/schema";
 import * as db from "../db";
+import { LastSignedInBatcher, sessionUserCache, type AuthCacheStats } from "./authCache";
 import { ENV } from "./env";
 import type {
   ExchangeTokenRequest,
@@ -85,6 +86,10 @@ const createOAuthHttpClient = (): AxiosInstance =>
 class SDKServer {
   private readonly client: AxiosInstance;
   private readonly oauthService: OAuthService;
+  readonly lastSignedIn = new LastSignedInBatcher(
+    db.touchUsersLastSignedIn,
+    ENV.lastSignedInFlushMs
+  );
 
   constructor(client: AxiosInstance = createOAuthHttpClient()) {
     this.client = client;
@@ -256,24 +261,64 @@ class SDKServer {
     } as GetUserInfoWithJwtResponse;
   }
 
+  private getTokenExpiry(token: string): number | undefined {
+    try {
+      const { exp } = decodeJwt(token);
+      return typeof exp === "number" ? exp * 1000 : undefined;
+    } catch {
+      return undefined;
+    }
+  }
+
+  /**
+   * Drop the cached user for the request's session cookie (used on logout)
+   */
+  forgetSession(req: Request) {
+    const sessionCookie = this.parseCookies(req.headers.cookie).get(COOKIE_NAME);
+    if (sessionCookie) {
+      sessionUserCache.invalidateToken(sessionCookie);
+    }
+  }
+
+  getAuthCacheStats(): AuthCacheStats {
+    return {
+      hits: sessionUserCache.hits,
+      misses: sessionUserCache.misses,
+      evictions: sessionUserCache.evictions,
+      invalidations: sessionUserCache.invalidations,
+      size: sessionUserCache.size,
+      pendingLastSignedIn: this.lastSignedIn.size,
+      lastSignedInFlushes: this.lastSignedIn.flushes,
+      lastSignedInWrites: this.lastSignedIn.writes,
+    };
+  }
+
   async authenticateRequest(req: Request): Promise<User> {
     // Regular authentication flow
     const cookies = this.parseCookies(req.headers.cookie);
     const sessionCookie = cookies.get(COOKIE_NAME);
+    const signedInAt = new Date();
+
+    // A cached entry means this exact token was verified recently
+    const cachedUser = sessionCookie ? sessionUserCache.get(sessionCookie) : undefined;
+    if (cachedUser) {
+      this.lastSignedIn.record(cachedUser.openId, signedInAt);
+      return cachedUser;
+    }
+
     const session = await this.verifySession(sessionCookie);
 
-    if (!session) {
+    if (!session || !sessionCookie) {
       throw ForbiddenError("Invalid session cookie");
     }
 
     const sessionUserId = session.openId;
-    const signedInAt = new Date();
     let user = await db.getUserByOpenId(sessionUserId);
 
     // If user not in DB, sync from OAuth server automatically
     if (!user) {
       try {
-        const userInfo = await this.getUserInfoWithJwt(sessionCookie ?? "");
+        const userInfo = await this.getUserInfoWithJwt(sessionCookie);
         await db.upsertUser({
           openId: userInfo.openId,
           name: userInfo.name || null,
@@ -292,10 +337,9 @@ class SDKServer {
       throw ForbiddenError("User not found");
     }
 
-    await db.upsertUser({
-      openId: user.openId,
-      lastSignedIn: signedInAt,
-    });
+    // lastSignedIn is written in periodic batches, not once per request
+    this.lastSignedIn.record(user.openId, signedInAt);
+    sessionUserCache.set(sessionCookie, user, this.getTokenExpiry(sessionCookie));
 
     return user;
   }
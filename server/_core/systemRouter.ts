@@ -1,5 +1,8 @@
 import { z } from "zod";
+import { getHttpClientStats } from "./httpClient";
+import { getLatencySummaries, getSlowOperations, resetMetrics } from "./metrics";
 import { notifyOwner } from "./notification";
+import { sdk } from "./sdk";
 import { adminProcedure, publicProcedure, router } from "./trpc";
 
 export const systemRouter = router({
@@ -13,6 +16,20 @@ export const systemRouter = router({
       ok: true,
     })),
 
+  authCacheStats: adminProcedure.query(() => sdk.getAuthCacheStats()),
+
+  httpClientStats: adminProcedure.query(() => getHttpClientStats()),
+
+  metrics: adminProcedure.query(() => ({
+    latencies: getLatencySummaries(),
+    slowOperations: getSlowOperations(),
+  })),
+
+  resetMetrics: adminProcedure.mutation(() => {
+    resetMetrics();
+    return { success: true } as const;
+  }),
+
   notifyOwner: adminProcedure
     .input(
       z.object({
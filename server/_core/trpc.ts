@@ -1,14 +1,28 @@
 import { NOT_ADMIN_ERR_MSG, UNAUTHED_ERR_MSG } from '@shared/const';
 import { initTRPC, TRPCError } from "@trpc/server";
+import { performance } from "node:perf_hooks";
 import superjson from "superjson";
 import type { TrpcContext } from "./context";
+import { recordLatency, recordSlowOperation } from "./metrics";
 
 const t = initTRPC.context<TrpcContext>().create({
   transformer: superjson,
 });
 
+const timing = t.middleware(async opts => {
+  const { path, next } = opts;
+  const startedAt = performance.now();
+  const result = await next();
+  const elapsed = performance.now() - startedAt;
+
+  recordLatency("trpc", path, elapsed, !result.ok);
+  recordSlowOperation("trpc", path, elapsed);
+
+  return result;
+});
+
 export const router = t.router;
-export const publicProcedure = t.procedure;
+export const publicProcedure = t.procedure.use(timing);
 
 const requireUser = t.middleware(async opts => {
   const { ctx, next } = opts;
@@ -25,9 +39,9 @@ const requireUser = t.middleware(async opts => {
   });
 });
 
-export const protectedProcedure = t.procedure.use(requireUser);
+export const protectedProcedure = publicProcedure.use(requireUser);
 
-export const adminProcedure = t.procedure.use(
+export const adminProcedure = publicProcedure.use(
   t.middleware(async opts => {
     const { ctx, next } = opts;
 
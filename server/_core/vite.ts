@@ -1,4 +1,4 @@
-import express, { type Express } from "express";
+import express, { type Express, type Request, type Response } from "express";
 import fs from "fs";
 import { type Server } from "http";
 import { nanoid } from "nanoid";
@@ -47,6 +47,28 @@ export async function setupVite(app: Express, server: Server) {
   });
 }
 
+// Vite fingerprints everything it emits under /assets, so those files never change
+const HASHED_ASSETS_DIR = "assets";
+const IMMUTABLE = "public, max-age=31536000, immutable";
+
+const ENCODINGS = [
+  { name: "br", suffix: ".br" },
+  { name: "gzip", suffix: ".gz" },
+] as const;
+
+// .br/.gz siblings written at build time by `pnpm build` (scripts/precompressAssets)
+function listPrecompressed(dir: string, found = new Set<string>()): Set<string> {
+  for (const entry of fs.readdirSync(dir, { withFileTypes: true })) {
+    const fullPath = path.join(dir, entry.name);
+    if (entry.isDirectory()) {
+      listPrecompressed(fullPath, found);
+    } else if (ENCODINGS.some(({ suffix }) => entry.name.endsWith(suffix))) {
+      found.add(fullPath);
+    }
+  }
+  return found;
+}
+
 export function serveStatic(app: Express) {
   const distPath =
     process.env.NODE_ENV === "development"
@@ -58,10 +80,59 @@ export function serveStatic(app: Express) {
     );
   }
 
-  app.use(express.static(distPath));
+  const precompressed = fs.existsSync(distPath) ? listPrecompressed(distPath) : new Set<string>();
+  const hashedDir = path.join(distPath, HASHED_ASSETS_DIR) + path.sep;
+  const cacheControlFor = (filePath: string) =>
+    filePath.startsWith(hashedDir) ? IMMUTABLE : "no-cache";
+  const hasVariants = (filePath: string) =>
+    ENCODINGS.some(({ suffix }) => precompressed.has(filePath + suffix));
+
+  // Sends the smallest precompressed variant the client accepts, if there is one
+  const sendPrecompressed = (req: Request, res: Response, filePath: string) => {
+    if (!hasVariants(filePath)) return false;
+    res.vary("Accept-Encoding");
+    const accepted = req.acceptsEncodings(...ENCODINGS.map(({ name }) => name), "identity");
+    const encoding = ENCODINGS.find(
+      ({ name, suffix }) => name === accepted && precompressed.has(filePath + suffix)
+    );
+    if (!encoding) return false;
+
+    res.type(path.extname(filePath));
+    res.setHeader("Content-Encoding", encoding.name);
+    res.sendFile(filePath + encoding.suffix, {
+      cacheControl: false,
+      headers: { "Cache-Control": cacheControlFor(filePath) },
+    });
+    return true;
+  };
+
+  app.use((req, res, next) => {
+    if (req.method !== "GET" && req.method !== "HEAD") return next();
+    let filePath: string;
+    try {
+      filePath = path.join(distPath, decodeURIComponent(req.path));
+    } catch {
+      return next();
+    }
+    if (req.path.endsWith("/")) filePath = path.join(filePath, "index.html");
+    // Only files listed at startup are served here, so nothing outside distPath
+    if (!sendPrecompressed(req, res, filePath)) next();
+  });
+
+  app.use(
+    express.static(distPath, {
+      setHeaders(res, filePath) {
+        res.setHeader("Cache-Control", cacheControlFor(filePath));
+        if (hasVariants(filePath)) res.setHeader("Vary", "Accept-Encoding");
+      },
+    })
+  );
 
   // fall through to index.html if the file doesn't exist
-  app.use("*", (_req, res) => {
-    res.sendFile(path.resolve(distPath, "index.html"));
+  const indexPath = path.resolve(distPath, "index.html");
+  app.use("*", (req, res) => {
+    if (sendPrecompressed(req, res, indexPath)) return;
+    res.setHeader("Cache-Control", "no-cache");
+    res.sendFile(indexPath);
   });
 }
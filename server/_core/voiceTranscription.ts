@@ -26,11 +26,15 @@
  * ```
  */
 import { ENV } from "./env";
+import { httpClients } from "./httpClient";
+
+const MAX_AUDIO_BYTES = 16 * 1024 * 1024;
 
 export type TranscribeOptions = {
   audioUrl: string; // URL to the audio file (e.g., S3 URL)
   language?: string; // Optional: specify language code (e.g., "en", "es", "zh")
   prompt?: string; // Optional: custom prompt for the transcription
+  retry?: boolean; // Optional: resend on rate limits/5xx/timeouts; each attempt can be billed
 };
 
 // Native Whisper API segment format
@@ -90,31 +94,39 @@ export async function transcribeAudio(
       };
     }
 
-    // Step 2: Download audio from URL
-    let audioBuffer: Buffer;
+    // Step 2: Download audio from URL, stopping as soon as it passes the size limit
+    let audioChunks: Uint8Array[];
     let mimeType: string;
     try {
-      const response = await fetch(options.audioUrl);
+      const response = await httpClients.voiceTranscription.fetch(options.audioUrl);
       if (!response.ok) {
+        await response.body?.cancel().catch(() => undefined);
         return {
           error: "Failed to download audio file",
           code: "INVALID_FORMAT",
           details: `HTTP ${response.status}: ${response.statusText}`
         };
       }
-      
-      audioBuffer = Buffer.from(await response.arrayBuffer());
+
       mimeType = response.headers.get('content-type') || 'audio/mpeg';
-      
-      // Check file size (16MB limit)
-      const sizeMB = audioBuffer.length / (1024 * 1024);
-      if (sizeMB > 16) {
+
+      // Check file size (16MB limit) from the header first, then while streaming
+      const declaredBytes = Number(response.headers.get('content-length'));
+      const chunks = declaredBytes > MAX_AUDIO_BYTES
+        ? null
+        : await readUpTo(response.body, MAX_AUDIO_BYTES);
+      if (!chunks) {
+        await response.body?.cancel().catch(() => undefined);
+        const sizeDetail = declaredBytes > MAX_AUDIO_BYTES
+          ? `File size is ${(declaredBytes / (1024 * 1024)).toFixed(2)}MB`
+          : "File size is over 16MB";
         return {
           error: "Audio file exceeds maximum size limit",
           code: "FILE_TOO_LARGE",
-          details: `File size is ${sizeMB.toFixed(2)}MB, maximum allowed is 16MB`
+          details: `${sizeDetail}, maximum allowed is 16MB`
         };
       }
+      audioChunks = chunks;
     } catch (error) {
       return {
         error: "Failed to fetch audio file",
@@ -128,7 +140,7 @@ export async function transcribeAudio(
     
     // Create a Blob from the buffer and append to form
     const filename = `audio.${getFileExtension(mimeType)}`;
-    const audioBlob = new Blob([new Uint8Array(audioBuffer)], { type: mimeType });
+    const audioBlob = new Blob(audioChunks as BlobPart[], { type: mimeType });
     formData.append("file", audioBlob, filename);
     
     formData.append("model", "whisper-1");
@@ -152,13 +164,14 @@ export async function transcribeAudio(
       baseUrl
     ).toString();
 
-    const response = await fetch(fullUrl, {
+    const response = await httpClients.voiceTranscription.fetch(fullUrl, {
       method: "POST",
       headers: {
         authorization: `Bearer ${ENV.forgeApiKey}`,
         "Accept-Encoding": "identity",
       },
       body: formData,
+      idempotent: options.retry ?? false,
     });
 
     if (!response.ok) {
@@ -194,6 +207,30 @@ export async function transcribeAudio(
   }
 }
 
+/**
+ * Reads a response body into chunks, giving up (and returning null) as soon as
+ * more than `maxBytes` have arrived instead of downloading the rest.
+ */
+async function readUpTo(
+  body: ReadableStream<Uint8Array> | null,
+  maxBytes: number
+): Promise<Uint8Array[] | null> {
+  if (!body) return [];
+  const reader = body.getReader();
+  const chunks: Uint8Array[] = [];
+  let total = 0;
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) return chunks;
+    total += value.byteLength;
+    if (total > maxBytes) {
+      await reader.cancel().catch(() => undefined);
+      return null;
+    }
+    chunks.push(value);
+  }
+}
+
 /**
  * Helper function to get file extension from MIME type
  */
@@ -0,0 +1,279 @@
+import { once } from "node:events";
+import type { Express, Request, Response } from "express";
+import type { ZodType } from "zod";
+import { requireUser } from "./_core/context";
+import { parseCsvRecords, parseNdjsonRecords, formatCsvRow, type ParsedRecord } from "./csv";
+import * as db from "./db";
+import { clientInput, orderStatus, serviceOrderInput, vehicleInput } from "./schemas";
+
+const IMPORT_BATCH_SIZE = 1000;
+const EXPORT_CHUNK_SIZE = 1000;
+
+const ENTITIES: db.BulkEntity[] = ["clients", "vehicles", "serviceOrders"];
+
+const importSchemas: Record<db.BulkEntity, ZodType> = {
+  clients: clientInput,
+  vehicles: vehicleInput,
+  serviceOrders: serviceOrderInput.extend({ status: orderStatus.optional() }),
+};
+
+// CSV cells are always strings; these columns are coerced before validation
+const NUMERIC_FIELDS: Record<db.BulkEntity, string[]> = {
+  clients: [],
+  vehicles: ["clientId", "year"],
+  serviceOrders: ["clientId", "vehicleId"],
+};
+
+// Driver errors caused by the data of one row. Anything else (connection lost,
+// pool queue full, ...) would fail for every row too, so it aborts the import.
+const ROW_ERROR_CODES = new Set([
+  "ER_DUP_ENTRY",
+  "ER_NO_REFERENCED_ROW",
+  "ER_NO_REFERENCED_ROW_2",
+  "ER_DATA_TOO_LONG",
+  "ER_TRUNCATED_WRONG_VALUE",
+  "ER_TRUNCATED_WRONG_VALUE_FOR_FIELD",
+  "WARN_DATA_TRUNCATED",
+  "ER_WARN_DATA_OUT_OF_RANGE",
+  "ER_BAD_NULL_ERROR",
+]);
+
+type RowError = { row: number; message: string };
+
+type ImportEvent =
+  | { type: "progress"; processed: number; inserted: number; failed: number }
+  | ({ type: "rowError" } & RowError)
+  | { type: "done"; processed: number; inserted: number; failed: number; durationMs: number }
+  | { type: "fatal"; message: string };
+
+function isBulkEntity(value: string): value is db.BulkEntity {
+  return (ENTITIES as string[]).includes(value);
+}
+
+function errorMessage(error: unknown): string {
+  if (error instanceof Error) {
+    // Drizzle wraps driver errors; the driver message names the failing key
+    const cause = (error as { cause?: unknown }).cause;
+    return cause instanceof Error ? cause.message : error.message;
+  }
+  return String(error);
+}
+
+function isRowError(error: unknown): boolean {
+  // Drizzle wraps driver errors in DrizzleQueryError with the driver error as cause
+  const cause = error instanceof Error && error.cause instanceof Error ? error.cause : error;
+  const code = (cause as { code?: unknown } | null)?.code;
+  return typeof code === "string" && ROW_ERROR_CODES.has(code);
+}
+
+function normalizeRecord(entity: db.BulkEntity, value: Record<string, unknown>) {
+  const normalized: Record<string, unknown> = {};
+  for (const [key, raw] of Object.entries(value)) {
+    const trimmed = typeof raw === "string" ? raw.trim() : raw;
+    if (trimmed === "" || trimmed === null || trimmed === undefined) continue;
+    normalized[key] =
+      NUMERIC_FIELDS[entity].includes(key) && typeof trimmed === "string" ? Number(trimmed) : trimmed;
+  }
+  return normalized;
+}
+
+/**
+ * Vehicles and orders may reference clients by CPF and vehicles by license
+ * plate instead of numeric ids; resolve them with one query per batch.
+ */
+async function resolveReferences(entity: db.BulkEntity, rows: Record<string, unknown>[]) {
+  if (entity === "clients") return;
+
+  const cpfs = rows
+    .filter(row => row.clientId === undefined && typeof row.clientCpf === "string")
+    .map(row => row.clientCpf as string);
+  const plates =
+    entity === "serviceOrders"
+      ? rows
+          .filter(row => row.vehicleId === undefined && typeof row.licensePlate === "string")
+          .map(row => row.licensePlate as string)
+      : [];
+
+  const [clientIds, vehiclesByPlate] = await Promise.all([
+    db.getClientIdsByCpf(Array.from(new Set(cpfs))),
+    db.getVehiclesByPlate(Array.from(new Set(plates))),
+  ]);
+
+  rows.forEach(row => {
+    if (row.vehicleId === undefined && typeof row.licensePlate === "string" && entity === "serviceOrders") {
+      const vehicle = vehiclesByPlate.get(row.licensePlate);
+      if (vehicle) {
+        row.vehicleId = vehicle.id;
+        row.clientId ??= vehicle.clientId;
+      }
+    }
+    if (row.clientId === undefined && typeof row.clientCpf === "string") {
+      row.clientId = clientIds.get(row.clientCpf);
+    }
+  });
+}
+
+async function insertBatch(entity: db.BulkEntity, rows: any[]) {
+  switch (entity) {
+    case "clients":
+      return await db.insertClientsBatch(rows);
+    case "vehicles":
+      return await db.insertVehiclesBatch(rows);
+    case "serviceOrders":
+      return await db.insertServiceOrdersBatch(rows);
+  }
+}
+
+async function importBatch(entity: db.BulkEntity, records: ParsedRecord[]) {
+  const errors: RowError[] = [];
+  const parsed: { row: number; value: Record<string, unknown> }[] = [];
+
+  records.forEach(record => {
+    if (record.error || !record.value) {
+      errors.push({ row: record.row, message: record.error ?? "Empty row" });
+    } else {
+      parsed.push({ row: record.row, value: normalizeRecord(entity, record.value) });
+    }
+  });
+
+  await resolveReferences(entity, parsed.map(p => p.value));
+
+  const valid: { row: number; value: unknown }[] = [];
+  parsed.forEach(({ row, value }) => {
+    const result = importSchemas[entity].safeParse(value);
+    if (result.success) {
+      valid.push({ row, value: result.data });
+    } else {
+      errors.push({
+        row,
+        message: result.error.issues.map(issue => `${issue.path.join(".")}: ${issue.message}`).join("; "),
+      });
+    }
+  });
+
+  let inserted = 0;
+  try {
+    await insertBatch(entity, valid.map(v => v.value));
+    inserted = valid.length;
+  } catch (batchError) {
+    if (!isRowError(batchError)) throw batchError;
+    // Some row was rejected (usually a duplicate key); retry one by one to report it
+    for (const { row, value } of valid) {
+      try {
+        await insertBatch(entity, [value]);
+        inserted++;
+      } catch (error) {
+        if (!isRowError(error)) throw error;
+        errors.push({ row, message: errorMessage(error) });
+      }
+    }
+  }
+
+  errors.sort((a, b) => a.row - b.row);
+  return { inserted, errors };
+}
+
+// Respect backpressure so a slow client never makes us buffer the whole table
+async function write(res: Response, data: string) {
+  if (res.destroyed) {
+    throw new Error("Client disconnected");
+  }
+  if (!res.write(data)) {
+    await Promise.race([once(res, "drain"), once(res, "close")]);
+  }
+}
+
+/**
+ * POST /api/import/:entity streams a CSV (text/csv or ?format=csv) or NDJSON
+ * body, inserting it in batches and answering with NDJSON progress events.
+ *
+ * GET /api/export/:entity?format=csv|ndjson streams the table in id order,
+ * one chunk at a time.
+ */
+export function registerBulkRoutes(app: Express) {
+  app.post("/api/import/:entity", async (req: Request, res: Response) => {
+    const { entity } = req.params;
+    if (!isBulkEntity(entity)) {
+      res.status(404).json({ error: `Unknown entity: ${entity}` });
+      return;
+    }
+    if (!(await requireUser(req, res))) return;
+
+    const format = req.query.format === "csv" || req.is("text/csv") ? "csv" : "ndjson";
+    const records = format === "csv" ? parseCsvRecords(req) : parseNdjsonRecords(req);
+    const startedAt = Date.now();
+    const totals = { processed: 0, inserted: 0, failed: 0 };
+
+    res.status(200).type("application/x-ndjson");
+    const emit = (event: ImportEvent) => write(res, `${JSON.stringify(event)}\n`);
+
+    let batch: ParsedRecord[] = [];
+    const flush = async () => {
+      if (batch.length === 0) return;
+      const { inserted, errors } = await importBatch(entity, batch);
+      totals.processed += batch.length;
+      totals.inserted += inserted;
+      totals.failed += errors.length;
+      batch = [];
+      for (const error of errors) {
+        await emit({ type: "rowError", ...error });
+      }
+      await emit({ type: "progress", ...totals });
+    };
+
+    try {
+      for await (const record of records) {
+        batch.push(record);
+        if (batch.length >= IMPORT_BATCH_SIZE) {
+          await flush();
+        }
+      }
+      await flush();
+      await emit({ type: "done", ...totals, durationMs: Date.now() - startedAt });
+    } catch (error) {
+      console.error(`[Bulk] Import of ${entity} failed:`, error);
+      await emit({ type: "fatal", message: errorMessage(error) }).catch(() => undefined);
+    }
+    res.end();
+  });
+
+  app.get("/api/export/:entity", async (req: Request, res: Response) => {
+    const { entity } = req.params;
+    if (!isBulkEntity(entity)) {
+      res.status(404).json({ error: `Unknown entity: ${entity}` });
+      return;
+    }
+    if (!(await requireUser(req, res))) return;
+
+    const format = req.query.format === "csv" ? "csv" : "ndjson";
+    const columns = db.BULK_COLUMNS[entity];
+
+    res.status(200).type(format === "csv" ? "text/csv" : "application/x-ndjson");
+    res.setHeader("Content-Disposition", `attachment; filename="${entity}.${format === "csv" ? "csv" : "ndjson"}"`);
+
+    try {
+      if (format === "csv") {
+        await write(res, formatCsvRow(columns));
+      }
+
+      let afterId = 0;
+      while (!res.destroyed) {
+        const rows = await db.getExportChunk(entity, afterId, EXPORT_CHUNK_SIZE);
+        if (rows.length === 0) break;
+
+        const chunk =
+          format === "csv"
+            ? rows.map(row => formatCsvRow(columns.map(column => row[column]))).join("")
+            : rows.map(row => `${JSON.stringify(row)}\n`).join("");
+        await write(res, chunk);
+
+        afterId = rows[rows.length - 1].id as number;
+        if (rows.length < EXPORT_CHUNK_SIZE) break;
+      }
+      res.end();
+    } catch (error) {
+      console.error(`[Bulk] Export of ${entity} failed:`, error);
+      res.destroy(error as Error);
+    }
+  });
+}
@@ -0,0 +1,179 @@
+import { describe, expect, it } from "vitest";
+import { formatCsvRow, parseCsvRecords, parseCsvRows, parseNdjsonRecords, RecordTooLongError } from "./csv";
+
+async function* chunks(...parts: (Buffer | string)[]) {
+  for (const part of parts) yield part;
+}
+
+async function collect<T>(source: AsyncIterable<T>): Promise<T[]> {
+  const items: T[] = [];
+  for await (const item of source) items.push(item);
+  return items;
+}
+
+/** Splits a buffer into pieces of `size` bytes, cutting through multi-byte characters. */
+function bytewise(text: string, size: number): Buffer[] {
+  const bytes = Buffer.from(text);
+  const parts: Buffer[] = [];
+  for (let i = 0; i < bytes.length; i += size) parts.push(bytes.subarray(i, i + size));
+  return parts;
+}
+
+describe("parseCsvRows", () => {
+  it("splits plain fields and rows", async () => {
+    expect(await collect(parseCsvRows(chunks("a,b,c\n1,2,3\n")))).toEqual([
+      ["a", "b", "c"],
+      ["1", "2", "3"],
+    ]);
+  });
+
+  it("handles quoted fields with commas, escaped quotes and line breaks", async () => {
+    const rows = await collect(parseCsvRows(chunks('name,note\n"Silva, João","disse ""ok""\nna segunda linha"\n')));
+    expect(rows).toEqual([
+      ["name", "note"],
+      ["Silva, João", 'disse "ok"\nna segunda linha'],
+    ]);
+  });
+
+  it("accepts CRLF line endings and keeps CRLF inside quotes", async () => {
+    const rows = await collect(parseCsvRows(chunks('a,b\r\n"x\r\ny",z\r\n')));
+    expect(rows).toEqual([
+      ["a", "b"],
+      ["x\r\ny", "z"],
+    ]);
+  });
+
+  it("keeps empty and quoted-empty fields", async () => {
+    expect(await collect(parseCsvRows(chunks('a,,"",b\n')))).toEqual([["a", "", "", "b"]]);
+  });
+
+  it("strips a leading BOM, even when it arrives split across chunks", async () => {
+    const bom = Buffer.from("\uFEFFa,b\n1,2\n");
+    const rows = await collect(parseCsvRows(chunks(bom.subarray(0, 2), bom.subarray(2))));
+    expect(rows).toEqual([
+      ["a", "b"],
+      ["1", "2"],
+    ]);
+  });
+
+  it("only strips the BOM at the very start", async () => {
+    expect(await collect(parseCsvRows(chunks("a\n\uFEFFb\n")))).toEqual([["a"], ["\uFEFFb"]]);
+  });
+
+  it("yields the last row without a trailing newline", async () => {
+    expect(await collect(parseCsvRows(chunks("a,b\n1,2")))).toEqual([
+      ["a", "b"],
+      ["1", "2"],
+    ]);
+  });
+
+  it("gives the same rows whatever the chunk boundaries", async () => {
+    const text = 'placa,obs\n"ABC-1234","troca de óleo, ""urgente""\r\nrevisão"\r\nXYZ9A87,ção\n';
+    const expected = await collect(parseCsvRows(chunks(text)));
+    expect(expected).toEqual([
+      ["placa", "obs"],
+      ["ABC-1234", 'troca de óleo, "urgente"\r\nrevisão'],
+      ["XYZ9A87", "ção"],
+    ]);
+
+    for (const size of [1, 2, 3, 5, 7]) {
+      expect(await collect(parseCsvRows(chunks(...bytewise(text, size))))).toEqual(expected);
+    }
+  });
+
+  it("accepts rows up to the length limit, line ending included", async () => {
+    expect(await collect(parseCsvRows(chunks("aaaa,bbbb\n", "cc\n"), 10))).toEqual([["aaaa", "bbbb"], ["cc"]]);
+  });
+
+  it("stops at a row longer than the limit instead of buffering it", async () => {
+    async function* unterminated() {
+      yield 'name\n"never closed';
+      for (;;) yield "x".repeat(1000);
+    }
+
+    await expect(collect(parseCsvRows(unterminated(), 5000))).rejects.toThrow(RecordTooLongError);
+  });
+
+  it("reads back what formatCsvRow writes", async () => {
+    const values = ["plain", 'with "quotes"', "a,b", "line\nbreak", "", 42];
+    const [row] = await collect(parseCsvRows(chunks(formatCsvRow(values))));
+    expect(row).toEqual(["plain", 'with "quotes"', "a,b", "line\nbreak", "", "42"]);
+  });
+});
+
+describe("parseCsvRecords", () => {
+  it("keys rows by the trimmed header, numbers data rows from 1 and skips blank lines", async () => {
+    const records = await collect(parseCsvRecords(chunks(" name , cpf\nAna,123\n\nBia,456\n")));
+    expect(records).toEqual([
+      { row: 1, value: { name: "Ana", cpf: "123" } },
+      { row: 2, value: { name: "Bia", cpf: "456" } },
+    ]);
+  });
+
+  it("leaves missing trailing cells undefined", async () => {
+    const [record] = await collect(parseCsvRecords(chunks("a,b,c\n1\n")));
+    expect(record.value).toEqual({ a: "1", b: undefined, c: undefined });
+  });
+});
+
+describe("parseNdjsonRecords", () => {
+  it("parses one object per line and skips blank lines", async () => {
+    const records = await collect(parseNdjsonRecords(chunks('{"a":1}\n\n{"a":2}\r\n{"a":3}')));
+    expect(records).toEqual([
+      { row: 1, value: { a: 1 } },
+      { row: 2, value: { a: 2 } },
+      { row: 3, value: { a: 3 } },
+    ]);
+  });
+
+  it("reports invalid lines without stopping", async () => {
+    const records = await collect(parseNdjsonRecords(chunks('{"a":1}\nnot json\n[1,2]\n42\n{"a":2}\n')));
+    expect(records).toEqual([
+      { row: 1, value: { a: 1 } },
+      { row: 2, error: "Invalid JSON" },
+      { row: 3, error: "Each line must be a JSON object" },
+      { row: 4, error: "Each line must be a JSON object" },
+      { row: 5, value: { a: 2 } },
+    ]);
+  });
+
+  it("reports a line over the limit and carries on with the next one", async () => {
+    const long = `{"a":"${"x".repeat(100)}"}`;
+    const records = await collect(parseNdjsonRecords(chunks(`{"a":1}\n${long}\n{"a":2}\n`), 50));
+    expect(records).toEqual([
+      { row: 1, value: { a: 1 } },
+      { row: 2, error: "Line exceeds the limit of 50 characters" },
+      { row: 3, value: { a: 2 } },
+    ]);
+  });
+
+  it("skips a line far over the limit and resumes after its line ending", async () => {
+    let sent = 0;
+    async function* endless() {
+      yield '{"a":1}\n{"a":"';
+      for (let i = 0; i < 1000; i++) {
+        sent++;
+        yield "x".repeat(1000);
+      }
+      yield '"}\n{"a":2}';
+    }
+
+    const records = await collect(parseNdjsonRecords(endless(), 5000));
+    expect(sent).toBe(1000);
+    expect(records).toEqual([
+      { row: 1, value: { a: 1 } },
+      { row: 2, error: "Line exceeds the limit of 5000 characters" },
+      { row: 3, value: { a: 2 } },
+    ]);
+  });
+
+  it("gives the same records whatever the chunk boundaries", async () => {
+    const text = '{"nome":"João","obs":"linha\\ncom escape"}\n{"nome":"Conceição"}\n';
+    for (const size of [1, 2, 3, 7]) {
+      expect(await collect(parseNdjsonRecords(chunks(...bytewise(text, size))))).toEqual([
+        { row: 1, value: { nome: "João", obs: "linha\ncom escape" } },
+        { row: 2, value: { nome: "Conceição" } },
+      ]);
+    }
+  });
+});
@@ -0,0 +1,200 @@
+import { StringDecoder } from "node:string_decoder";
+
+export type ParsedRecord = {
+  /** 1-based data row number (the CSV header is not counted). */
+  row: number;
+  value?: Record<string, unknown>;
+  error?: string;
+};
+
+/** Longest CSV row or NDJSON line accepted, in characters. */
+export const MAX_RECORD_LENGTH = 1024 * 1024;
+
+export class RecordTooLongError extends Error {
+  constructor(readonly maxLength: number) {
+    super(`A CSV row exceeds the limit of ${maxLength} characters (unterminated quoted field?)`);
+    this.name = "RecordTooLongError";
+  }
+}
+
+/**
+ * Incremental RFC 4180 parser: yields each row as soon as its line ending is
+ * read, so memory stays bounded by `maxRowLength` rather than the file size.
+ * A longer row throws RecordTooLongError: inside an unterminated quote there
+ * is no line ending to resume from.
+ */
+export async function* parseCsvRows(
+  source: AsyncIterable<Buffer | string>,
+  maxRowLength = MAX_RECORD_LENGTH
+): AsyncGenerator<string[]> {
+  const decoder = new StringDecoder("utf8");
+  let field = "";
+  let row: string[] = [];
+  let rowLength = 0;
+  let inQuotes = false;
+  let quoteSeen = false;
+  let atStart = true;
+
+  function* feed(text: string): Generator<string[]> {
+    for (let i = 0; i < text.length; i++) {
+      const ch = text[i];
+      if (++rowLength > maxRowLength) {
+        throw new RecordTooLongError(maxRowLength);
+      }
+
+      if (atStart) {
+        atStart = false;
+        if (ch === "\uFEFF") continue;
+      }
+
+      if (inQuotes) {
+        if (quoteSeen) {
+          quoteSeen = false;
+          if (ch === '"') {
+            field += '"';
+            continue;
+          }
+          // Closing quote; handle this character as unquoted
+          inQuotes = false;
+        } else if (ch === '"') {
+          quoteSeen = true;
+          continue;
+        } else {
+          field += ch;
+          continue;
+        }
+      }
+
+      if (ch === '"' && field.length === 0) {
+        inQuotes = true;
+      } else if (ch === ",") {
+        row.push(field);
+        field = "";
+      } else if (ch === "\n") {
+        row.push(field);
+        field = "";
+        rowLength = 0;
+        yield row;
+        row = [];
+      } else if (ch !== "\r") {
+        field += ch;
+      }
+    }
+  }
+
+  for await (const chunk of source) {
+    yield* feed(typeof chunk === "string" ? chunk : decoder.write(chunk));
+  }
+  yield* feed(decoder.end());
+
+  if (field.length > 0 || row.length > 0) {
+    row.push(field);
+    yield row;
+  }
+}
+
+/** CSV with a header row -> one object per data row, keyed by header name. */
+export async function* parseCsvRecords(
+  source: AsyncIterable<Buffer | string>,
+  maxRowLength = MAX_RECORD_LENGTH
+): AsyncGenerator<ParsedRecord> {
+  let header: string[] | null = null;
+  let rowNumber = 0;
+
+  for await (const cells of parseCsvRows(source, maxRowLength)) {
+    if (!header) {
+      header = cells.map(cell => cell.trim());
+      continue;
+    }
+    // Skip blank lines
+    if (cells.length === 1 && cells[0] === "") continue;
+
+    rowNumber++;
+    const value: Record<string, unknown> = {};
+    header.forEach((name, index) => {
+      value[name] = cells[index];
+    });
+    yield { row: rowNumber, value };
+  }
+}
+
+/**
+ * Newline-delimited JSON -> one object per line. A line longer than
+ * `maxLineLength` is reported as a row error and skipped up to the next line
+ * ending without being held in memory.
+ */
+export async function* parseNdjsonRecords(
+  source: AsyncIterable<Buffer | string>,
+  maxLineLength = MAX_RECORD_LENGTH
+): AsyncGenerator<ParsedRecord> {
+  const decoder = new StringDecoder("utf8");
+  const tooLong = `Line exceeds the limit of ${maxLineLength} characters`;
+  let buffered = "";
+  let rowNumber = 0;
+  // Inside an oversized line that has already been reported
+  let skipping = false;
+
+  function* parseLine(text: string): Generator<ParsedRecord> {
+    const line = text.trim();
+    if (line.length === 0) return;
+
+    rowNumber++;
+    if (line.length > maxLineLength) {
+      yield { row: rowNumber, error: tooLong };
+      return;
+    }
+    try {
+      const value = JSON.parse(line);
+      if (typeof value !== "object" || value === null || Array.isArray(value)) {
+        yield { row: rowNumber, error: "Each line must be a JSON object" };
+      } else {
+        yield { row: rowNumber, value };
+      }
+    } catch {
+      yield { row: rowNumber, error: "Invalid JSON" };
+    }
+  }
+
+  function* flushLines(): Generator<ParsedRecord> {
+    let start = 0;
+    let newline = buffered.indexOf("\n", start);
+    while (newline !== -1) {
+      if (skipping) {
+        // The oversized line ends here
+        skipping = false;
+      } else {
+        yield* parseLine(buffered.slice(start, newline));
+      }
+      start = newline + 1;
+      newline = buffered.indexOf("\n", start);
+    }
+    buffered = buffered.slice(start);
+
+    if (buffered.length > maxLineLength) {
+      if (!skipping) {
+        skipping = true;
+        rowNumber++;
+        yield { row: rowNumber, error: tooLong };
+      }
+      buffered = "";
+    }
+  }
+
+  for await (const chunk of source) {
+    buffered += typeof chunk === "string" ? chunk : decoder.write(chunk);
+    yield* flushLines();
+  }
+  buffered += decoder.end();
+  yield* flushLines();
+  if (!skipping) yield* parseLine(buffered);
+}
+
+function formatCsvCell(value: unknown): string {
+  if (value === null || value === undefined) return "";
+  const text = value instanceof Date ? value.toISOString() : String(value);
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+}
+
+export function formatCsvRow(values: unknown[]): string {
+  return `${values.map(formatCsvCell).join(",")}\n`;
+}
@@ -1,15 +1,88 @@
-import { eq, desc, and } from "drizzle-orm";
+import { eq, asc, desc, and, or, gt, gte, lt, lte, like, inArray, exists, getTableColumns, sql, type SQL } from "drizzle-orm";
+import type { MySqlColumn } from "drizzle-orm/mysql-core";
 import { drizzle } from "drizzle-orm/mysql2";
-import { InsertUser, users, clients, vehicles, serviceOrders, serviceOrderItems, transactions } from "../drizzle/schema";
+import mysql from "mysql2";
+import {
+  InsertClient,
+  InsertServiceOrder,
+  InsertUser,
+  InsertVehicle,
+  ServiceOrder,
+  users,
+  clients,
+  vehicles,
+  serviceOrders,
+  serviceOrderItems,
+  transactions,
+  transactionDailyRollups,
+  serviceOrderStatusCounts,
+  entityCounts,
+} from "../drizzle/schema";
+import { sessionUserCache } from './_core/authCache';
 import { ENV } from './_core/env';
+import { queryCaptureLogger, timedDb } from './_core/metrics';
 
 let _db: ReturnType<typeof drizzle> | null = null;
+let _pool: ReturnType<typeof mysql.createPool> | null = null;
+
+type Database = ReturnType<typeof drizzle>;
+type DbTransaction = Parameters<Parameters<Database["transaction"]>[0]>[0];
+
+// ============ PAGINATION ============
+
+/** Position of the last row of a page, ordered by `(createdAt DESC, id DESC)`. */
+export type PageCursor = { createdAt: Date; id: number };
+
+export type Page<T> = { items: T[]; nextCursor: PageCursor | null };
+
+export const DEFAULT_PAGE_SIZE = 50;
+export const MAX_PAGE_SIZE = 200;
+
+type KeysetColumns = { createdAt: MySqlColumn; id: MySqlColumn };
+
+// Rows strictly after the cursor in (createdAt DESC, id DESC) order.
+function afterCursor(table: KeysetColumns, cursor: PageCursor | null | undefined): SQL | undefined {
+  if (!cursor) return undefined;
+  return or(
+    lt(table.createdAt, cursor.createdAt),
+    and(eq(table.createdAt, cursor.createdAt), lt(table.id, cursor.id))
+  );
+}
+
+// Callers fetch `limit + 1` rows; the extra row only signals that another page exists.
+function toPage<T extends { createdAt: Date; id: number }>(rows: T[], limit: number): Page<T> {
+  const items = rows.length > limit ? rows.slice(0, limit) : rows;
+  const last = items[items.length - 1];
+  return {
+    items,
+    nextCursor: rows.length > limit && last ? { createdAt: last.createdAt, id: last.id } : null,
+  };
+}
+
+function clampPageSize(limit: number | undefined) {
+  return Math.min(Math.max(limit ?? DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE);
+}
+
+// LIKE pattern matching values that start with `term`, with wildcards escaped.
+function prefixPattern(term: string) {
+  return `${term.replace(/[\\%_]/g, "\\$&")}%`;
+}
 
 // Lazily create the drizzle instance so local tooling can run without a DB.
 export async function getDb() {
   if (!_db && process.env.DATABASE_URL) {
     try {
-      _db = drizzle(process.env.DATABASE_URL);
+      _pool = mysql.createPool({
+        uri: process.env.DATABASE_URL,
+        connectionLimit: ENV.dbPoolSize,
+        maxIdle: ENV.dbPoolMaxIdle,
+        idleTimeout: ENV.dbIdleTimeoutMs,
+        queueLimit: ENV.dbQueueLimit,
+        waitForConnections: true,
+        enableKeepAlive: true,
+        keepAliveInitialDelay: 10_000,
+      });
+      _db = drizzle({ client: _pool, logger: queryCaptureLogger });
     } catch (error) {
       console.warn("[Database] Failed to connect:", error);
       _db = null;
@@ -18,7 +91,16 @@ export async function getDb() {
   return _db;
 }
 
-export async function upsertUser(user: InsertUser): Promise<void> {
+/** Waits for in-flight queries and closes every pooled connection (used on shutdown). */
+export async function closeDb() {
+  const pool = _pool;
+  _db = null;
+  _pool = null;
+  if (!pool) return;
+  await new Promise<void>((resolve, reject) => pool.end(error => (error ? reject(error) : resolve())));
+}
+
+export const upsertUser = timedDb("upsertUser", async function upsertUser(user: InsertUser): Promise<void> {
   if (!user.openId) {
     throw new Error("User openId is required for upsert");
   }
@@ -71,13 +153,15 @@ export async function upsertUser(user: InsertUser): Promise<void> {
     await db.insert(users).values(values).onDuplicateKeyUpdate({
       set: updateSet,
     });
+    // Profile or role may have changed; cached sessions must re-read the row
+    sessionUserCache.invalidateUser(user.openId);
   } catch (error) {
     console.error("[Database] Failed to upsert user:", error);
     throw error;
   }
-}
+});
 
-export async function getUserByOpenId(openId: string) {
+export const getUserByOpenId = timedDb("getUserByOpenId", async function getUserByOpenId(openId: string) {
   const db = await getDb();
   if (!db) {
     console.warn("[Database] Cannot get user: database not available");
@@ -87,154 +171,648 @@ export async function getUserByOpenId(openId: string) {
   const result = await db.select().from(users).where(eq(users.openId, openId)).limit(1);
 
   return result.length > 0 ? result[0] : undefined;
-}
+});
 
-// ============ CLIENTS ============
+const LAST_SIGNED_IN_BATCH_SIZE = 500;
 
-export async function getAllClients() {
+/**
+ * Writes many `lastSignedIn` values with one UPDATE ... CASE per chunk.
+ * Called by the auth layer's batcher instead of upserting on every request.
+ */
+export const touchUsersLastSignedIn = timedDb("touchUsersLastSignedIn", async function touchUsersLastSignedIn(entries: Map<string, Date>): Promise<void> {
   const db = await getDb();
-  if (!db) return [];
-  return await db.select().from(clients).orderBy(desc(clients.createdAt));
-}
+  if (!db) return;
+
+  const all = Array.from(entries.entries());
+  for (let i = 0; i < all.length; i += LAST_SIGNED_IN_BATCH_SIZE) {
+    const chunk = all.slice(i, i + LAST_SIGNED_IN_BATCH_SIZE);
+    const cases = sql.join(
+      // Encoded through the column so the Date is written in UTC like every other timestamp;
+      // a bare Date would be formatted by mysql2 in the host's time zone
+      chunk.map(([openId, at]) => sql`WHEN ${openId} THEN ${sql.param(at, users.lastSignedIn)}`),
+      sql` `
+    );
+    await db
+      .update(users)
+      .set({ lastSignedIn: sql`CASE ${users.openId} ${cases} ELSE ${users.lastSignedIn} END` })
+      .where(inArray(users.openId, chunk.map(([openId]) => openId)));
+  }
+});
+
+// ============ CLIENTS ============
 
-export async function getClientById(id: number) {
+export type ClientListParams = {
+  limit?: number;
+  cursor?: PageCursor | null;
+  /** Prefix of the client name, CPF or the license plate of one of their vehicles. */
+  search?: string;
+};
+
+export const listClients = timedDb("listClients", async function listClients(params: ClientListParams = {}): Promise<Page<typeof clients.$inferSelect>> {
+  const db = await getDb();
+  if (!db) return { items: [], nextCursor: null };
+
+  const limit = clampPageSize(params.limit);
+  const search = params.search?.trim();
+  const pattern = search ? prefixPattern(search) : undefined;
+
+  const rows = await db
+    .select()
+    .from(clients)
+    .where(
+      and(
+        afterCursor(clients, params.cursor),
+        pattern
+          ? or(
+              like(clients.name, pattern),
+              like(clients.cpf, pattern),
+              exists(
+                db
+                  .select({ id: vehicles.id })
+                  .from(vehicles)
+                  .where(and(eq(vehicles.clientId, clients.id), like(vehicles.licensePlate, pattern)))
+              )
+            )
+          : undefined
+      )
+    )
+    .orderBy(desc(clients.createdAt), desc(clients.id))
+    .limit(limit + 1);
+
+  return toPage(rows, limit);
+});
+
+export const getClientById = timedDb("getClientById", async function getClientById(id: number) {
   const db = await getDb();
   if (!db) return undefined;
   const result = await db.select().from(clients).where(eq(clients.id, id)).limit(1);
   return result.length > 0 ? result[0] : undefined;
-}
+});
 
-export async function createClient(data: typeof clients.$inferInsert) {
+export const createClient = timedDb("createClient", async function createClient(data: typeof clients.$inferInsert) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
-  const result = await db.insert(clients).values(data);
-  return result;
-}
-
-export async function updateClient(id: number, data: Partial<typeof clients.$inferInsert>) {
+  return await db.transaction(async tx => {
+    const result = await tx.insert(clients).values(data);
+    await bumpEntityCount(tx, "clients", 1);
+    return result;
+  });
+});
+
+export const updateClient = timedDb("updateClient", async function updateClient(id: number, data: Partial<typeof clients.$inferInsert>) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
   return await db.update(clients).set(data).where(eq(clients.id, id));
-}
+});
 
-export async function deleteClient(id: number) {
+export const deleteClient = timedDb("deleteClient", async function deleteClient(id: number) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
-  return await db.delete(clients).where(eq(clients.id, id));
-}
+  return await db.transaction(async tx => {
+    const result = await tx.delete(clients).where(eq(clients.id, id));
+    const deleted = result[0].affectedRows;
+    if (deleted > 0) await bumpEntityCount(tx, "clients", -deleted);
+    return result;
+  });
+});
 
 // ============ VEHICLES ============
 
-export async function getVehiclesByClientId(clientId: number) {
+export const getVehiclesByClientId = timedDb("getVehiclesByClientId", async function getVehiclesByClientId(clientId: number) {
   const db = await getDb();
   if (!db) return [];
   return await db.select().from(vehicles).where(eq(vehicles.clientId, clientId)).orderBy(desc(vehicles.createdAt));
-}
+});
 
-export async function getVehicleById(id: number) {
+export const getVehicleById = timedDb("getVehicleById", async function getVehicleById(id: number) {
   const db = await getDb();
   if (!db) return undefined;
   const result = await db.select().from(vehicles).where(eq(vehicles.id, id)).limit(1);
   return result.length > 0 ? result[0] : undefined;
-}
+});
 
-export async function createVehicle(data: typeof vehicles.$inferInsert) {
+export const createVehicle = timedDb("createVehicle", async function createVehicle(data: typeof vehicles.$inferInsert) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
   const result = await db.insert(vehicles).values(data);
   return result;
-}
+});
 
-export async function updateVehicle(id: number, data: Partial<typeof vehicles.$inferInsert>) {
+export const updateVehicle = timedDb("updateVehicle", async function updateVehicle(id: number, data: Partial<typeof vehicles.$inferInsert>) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
   return await db.update(vehicles).set(data).where(eq(vehicles.id, id));
-}
+});
 
-export async function deleteVehicle(id: number) {
+export const deleteVehicle = timedDb("deleteVehicle", async function deleteVehicle(id: number) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
   return await db.delete(vehicles).where(eq(vehicles.id, id));
-}
+});
 
 // ============ SERVICE ORDERS ============
 
-export async function getAllServiceOrders() {
+export type ServiceOrderListParams = {
+  limit?: number;
+  cursor?: PageCursor | null;
+  status?: ServiceOrder["status"][];
+  clientId?: number;
+  vehicleId?: number;
+  from?: Date;
+  to?: Date;
+  /** Prefix of the order number or of the vehicle license plate. */
+  search?: string;
+};
+
+export const listServiceOrders = timedDb("listServiceOrders", async function listServiceOrders(params: ServiceOrderListParams = {}): Promise<Page<ServiceOrder>> {
   const db = await getDb();
-  if (!db) return [];
-  return await db.select().from(serviceOrders).orderBy(desc(serviceOrders.createdAt));
-}
-
-export async function getServiceOrderById(id: number) {
+  if (!db) return { items: [], nextCursor: null };
+
+  const limit = clampPageSize(params.limit);
+  const search = params.search?.trim();
+  const pattern = search ? prefixPattern(search) : undefined;
+
+  const rows = await db
+    .select()
+    .from(serviceOrders)
+    .where(
+      and(
+        afterCursor(serviceOrders, params.cursor),
+        params.status?.length ? inArray(serviceOrders.status, params.status) : undefined,
+        params.clientId !== undefined ? eq(serviceOrders.clientId, params.clientId) : undefined,
+        params.vehicleId !== undefined ? eq(serviceOrders.vehicleId, params.vehicleId) : undefined,
+        params.from ? gte(serviceOrders.createdAt, params.from) : undefined,
+        params.to ? lte(serviceOrders.createdAt, params.to) : undefined,
+        pattern
+          ? or(
+              like(serviceOrders.orderNumber, pattern),
+              inArray(
+                serviceOrders.vehicleId,
+                db.select({ id: vehicles.id }).from(vehicles).where(like(vehicles.licensePlate, pattern))
+              )
+            )
+          : undefined
+      )
+    )
+    .orderBy(desc(serviceOrders.createdAt), desc(serviceOrders.id))
+    .limit(limit + 1);
+
+  return toPage(rows, limit);
+});
+
+export const getServiceOrderById = timedDb("getServiceOrderById", async function getServiceOrderById(id: number) {
   const db = await getDb();
   if (!db) return undefined;
   const result = await db.select().from(serviceOrders).where(eq(serviceOrders.id, id)).limit(1);
   return result.length > 0 ? result[0] : undefined;
-}
+});
 
-export async function getServiceOrdersByClientId(clientId: number) {
+export const getServiceOrdersByClientId = timedDb("getServiceOrdersByClientId", async function getServiceOrdersByClientId(clientId: number) {
   const db = await getDb();
   if (!db) return [];
   return await db.select().from(serviceOrders).where(eq(serviceOrders.clientId, clientId)).orderBy(desc(serviceOrders.createdAt));
-}
+});
 
-export async function createServiceOrder(data: typeof serviceOrders.$inferInsert) {
+export const createServiceOrder = timedDb("createServiceOrder", async function createServiceOrder(data: typeof serviceOrders.$inferInsert) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
-  const result = await db.insert(serviceOrders).values(data);
-  return result;
-}
-
-export async function updateServiceOrder(id: number, data: Partial<typeof serviceOrders.$inferInsert>) {
+  return await db.transaction(async tx => {
+    const result = await tx.insert(serviceOrders).values(data);
+    await bumpServiceOrderStatusCount(tx, data.status ?? "pending", 1);
+    return result;
+  });
+});
+
+export const updateServiceOrder = timedDb("updateServiceOrder", async function updateServiceOrder(id: number, data: Partial<typeof serviceOrders.$inferInsert>) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
   return await db.update(serviceOrders).set(data).where(eq(serviceOrders.id, id));
-}
+});
+
+/**
+ * Changes the status of an order and moves it between the per-status counters
+ * in the same transaction. The order row is locked so concurrent status changes
+ * cannot double-count.
+ */
+export const updateServiceOrderStatus = timedDb("updateServiceOrderStatus", async function updateServiceOrderStatus(
+  id: number,
+  data: Partial<typeof serviceOrders.$inferInsert> & { status: ServiceOrder["status"] }
+) {
+  const db = await getDb();
+  if (!db) throw new Error("Database not available");
+  return await db.transaction(async tx => {
+    const current = await tx
+      .select({ status: serviceOrders.status })
+      .from(serviceOrders)
+      .where(eq(serviceOrders.id, id))
+      .for("update");
+    const result = await tx.update(serviceOrders).set(data).where(eq(serviceOrders.id, id));
+    if (current.length > 0 && current[0].status !== data.status) {
+      await bumpServiceOrderStatusCount(tx, current[0].status, -1);
+      await bumpServiceOrderStatusCount(tx, data.status, 1);
+    }
+    return result;
+  });
+});
+
+/**
+ * Order with its client, vehicle, items and linked transactions. The order,
+ * client and vehicle come from one joined SELECT; items and transactions are
+ * fetched in parallel with it.
+ */
+export const getServiceOrderFull = timedDb("getServiceOrderFull", async function getServiceOrderFull(id: number) {
+  const db = await getDb();
+  if (!db) return undefined;
+
+  const [rows, items, orderTransactions] = await Promise.all([
+    db
+      .select({ order: serviceOrders, client: clients, vehicle: vehicles })
+      .from(serviceOrders)
+      .leftJoin(clients, eq(clients.id, serviceOrders.clientId))
+      .leftJoin(vehicles, eq(vehicles.id, serviceOrders.vehicleId))
+      .where(eq(serviceOrders.id, id))
+      .limit(1),
+    db.select().from(serviceOrderItems).where(eq(serviceOrderItems.serviceOrderId, id)),
+    db
+      .select()
+      .from(transactions)
+      .where(eq(transactions.serviceOrderId, id))
+      .orderBy(desc(transactions.createdAt), desc(transactions.id)),
+  ]);
+
+  if (rows.length === 0) return undefined;
+  return { ...rows[0], items, transactions: orderTransactions };
+});
 
 // ============ SERVICE ORDER ITEMS ============
 
-export async function getServiceOrderItems(serviceOrderId: number) {
+export const getServiceOrderItems = timedDb("getServiceOrderItems", async function getServiceOrderItems(serviceOrderId: number) {
   const db = await getDb();
   if (!db) return [];
   return await db.select().from(serviceOrderItems).where(eq(serviceOrderItems.serviceOrderId, serviceOrderId));
-}
-
-export async function createServiceOrderItem(data: typeof serviceOrderItems.$inferInsert) {
+});
+
+export type ServiceOrderItemInput = Pick<
+  typeof serviceOrderItems.$inferInsert,
+  "description" | "type" | "quantity" | "unitCost" | "unitPrice"
+>;
+
+export type ServiceOrderItemChanges = {
+  create?: ServiceOrderItemInput[];
+  update?: ({ id: number } & Partial<ServiceOrderItemInput>)[];
+  delete?: number[];
+};
+
+/**
+ * Applies a batch of item edits to one order and recomputes its totals, all in
+ * one transaction. The order row is locked first so concurrent edits to the same
+ * order serialize instead of overwriting each other's totals, and the totals are
+ * summed by MySQL in DECIMAL arithmetic. Returns undefined if the order does not exist.
+ */
+export const applyServiceOrderItemChanges = timedDb("applyServiceOrderItemChanges", async function applyServiceOrderItemChanges(serviceOrderId: number, changes: ServiceOrderItemChanges) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
-  const result = await db.insert(serviceOrderItems).values(data);
-  return result;
-}
 
-export async function updateServiceOrderItem(id: number, data: Partial<typeof serviceOrderItems.$inferInsert>) {
+  return await db.transaction(async tx => {
+    const locked = await tx
+      .select({ id: serviceOrders.id })
+      .from(serviceOrders)
+      .where(eq(serviceOrders.id, serviceOrderId))
+      .for("update");
+    if (locked.length === 0) return undefined;
+
+    if (changes.create?.length) {
+      await tx
+        .insert(serviceOrderItems)
+        .values(changes.create.map(item => ({ ...item, serviceOrderId })));
+    }
+
+    for (const { id, ...data } of changes.update ?? []) {
+      if (Object.keys(data).length === 0) continue;
+      await tx
+        .update(serviceOrderItems)
+        .set(data)
+        .where(and(eq(serviceOrderItems.id, id), eq(serviceOrderItems.serviceOrderId, serviceOrderId)));
+    }
+
+    if (changes.delete?.length) {
+      await tx
+        .delete(serviceOrderItems)
+        .where(and(inArray(serviceOrderItems.id, changes.delete), eq(serviceOrderItems.serviceOrderId, serviceOrderId)));
+    }
+
+    await tx
+      .update(serviceOrders)
+      .set({
+        totalCost: sql`(SELECT COALESCE(SUM(${serviceOrderItems.quantity} * ${serviceOrderItems.unitCost}), 0) FROM ${serviceOrderItems} WHERE ${serviceOrderItems.serviceOrderId} = ${serviceOrderId})`,
+        totalPrice: sql`(SELECT COALESCE(SUM(${serviceOrderItems.quantity} * ${serviceOrderItems.unitPrice}), 0) FROM ${serviceOrderItems} WHERE ${serviceOrderItems.serviceOrderId} = ${serviceOrderId})`,
+      })
+      .where(eq(serviceOrders.id, serviceOrderId));
+
+    const [totals] = await tx
+      .select({ totalCost: serviceOrders.totalCost, totalPrice: serviceOrders.totalPrice })
+      .from(serviceOrders)
+      .where(eq(serviceOrders.id, serviceOrderId));
+    return totals;
+  });
+});
+
+// ============ TRANSACTIONS ============
+
+export type TransactionListParams = {
+  limit?: number;
+  cursor?: PageCursor | null;
+  type?: "revenue" | "expense";
+  category?: string;
+  serviceOrderId?: number;
+  from?: Date;
+  to?: Date;
+};
+
+export const listTransactions = timedDb("listTransactions", async function listTransactions(params: TransactionListParams = {}): Promise<Page<typeof transactions.$inferSelect>> {
+  const db = await getDb();
+  if (!db) return { items: [], nextCursor: null };
+
+  const limit = clampPageSize(params.limit);
+
+  const rows = await db
+    .select()
+    .from(transactions)
+    .where(
+      and(
+        afterCursor(transactions, params.cursor),
+        params.type ? eq(transactions.type, params.type) : undefined,
+        params.category ? eq(transactions.category, params.category) : undefined,
+        params.serviceOrderId !== undefined ? eq(transactions.serviceOrderId, params.serviceOrderId) : undefined,
+        params.from ? gte(transactions.createdAt, params.from) : undefined,
+        params.to ? lte(transactions.createdAt, params.to) : undefined
+      )
+    )
+    .orderBy(desc(transactions.createdAt), desc(transactions.id))
+    .limit(limit + 1);
+
+  return toPage(rows, limit);
+});
+
+export const createTransaction = timedDb("createTransaction", async function createTransaction(data: typeof transactions.$inferInsert) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
-  return await db.update(serviceOrderItems).set(data).where(eq(serviceOrderItems.id, id));
+  return await db.transaction(async tx => {
+    const result = await tx.insert(transactions).values(data);
+    await applyTransactionRollup(tx, data);
+    return result;
+  });
+});
+
+export const getTransactionsByServiceOrderId = timedDb("getTransactionsByServiceOrderId", async function getTransactionsByServiceOrderId(serviceOrderId: number) {
+  const db = await getDb();
+  if (!db) return [];
+  return await db.select().from(transactions).where(eq(transactions.serviceOrderId, serviceOrderId));
+});
+
+// ============ DASHBOARD ROLLUPS ============
+
+async function applyTransactionRollup(tx: DbTransaction, data: typeof transactions.$inferInsert) {
+  const day = data.createdAt ? sql`DATE(${data.createdAt})` : sql`CURRENT_DATE()`;
+  await tx
+    .insert(transactionDailyRollups)
+    .values({
+      day,
+      type: data.type,
+      category: data.category,
+      total: data.amount,
+      count: 1,
+    })
+    .onDuplicateKeyUpdate({
+      set: {
+        total: sql`${transactionDailyRollups.total} + ${data.amount}`,
+        count: sql`${transactionDailyRollups.count} + 1`,
+      },
+    });
 }
 
-export async function deleteServiceOrderItem(id: number) {
-  const db = await getDb();
-  if (!db) throw new Error("Database not available");
-  return await db.delete(serviceOrderItems).where(eq(serviceOrderItems.id, id));
+async function bumpServiceOrderStatusCount(
+  tx: DbTransaction,
+  status: ServiceOrder["status"],
+  delta: number
+) {
+  await tx
+    .insert(serviceOrderStatusCounts)
+    .values({ status, count: Math.max(delta, 0) })
+    .onDuplicateKeyUpdate({
+      set: { count: sql`GREATEST(${serviceOrderStatusCounts.count} + ${delta}, 0)` },
+    });
 }
 
-// ============ TRANSACTIONS ============
+async function bumpEntityCount(tx: DbTransaction, entity: "clients", delta: number) {
+  await tx
+    .insert(entityCounts)
+    .values({ entity, count: Math.max(delta, 0) })
+    .onDuplicateKeyUpdate({
+      set: { count: sql`GREATEST(${entityCounts.count} + ${delta}, 0)` },
+    });
+}
 
-export async function getAllTransactions() {
+/**
+ * Reads dashboard totals from the rollup tables. Cost depends on the number of
+ * days/categories in the requested range, not on the number of transactions
+ * or clients. `from`/`to` are inclusive `YYYY-MM-DD` days.
+ */
+export const getDashboardSummary = timedDb("getDashboardSummary", async function getDashboardSummary(range: { from?: string; to?: string } = {}) {
   const db = await getDb();
-  if (!db) return [];
-  return await db.select().from(transactions).orderBy(desc(transactions.createdAt));
-}
+  if (!db) return undefined;
+
+  const dayFilter = and(
+    range.from ? gte(transactionDailyRollups.day, range.from) : undefined,
+    range.to ? lte(transactionDailyRollups.day, range.to) : undefined
+  );
+
+  const [[totals], categories, statusCounts, clientCount] = await Promise.all([
+    db
+      .select({
+        revenue: sql<string>`COALESCE(SUM(CASE WHEN ${transactionDailyRollups.type} = 'revenue' THEN ${transactionDailyRollups.total} END), 0)`,
+        expense: sql<string>`COALESCE(SUM(CASE WHEN ${transactionDailyRollups.type} = 'expense' THEN ${transactionDailyRollups.total} END), 0)`,
+        profit: sql<string>`COALESCE(SUM(CASE WHEN ${transactionDailyRollups.type} = 'revenue' THEN ${transactionDailyRollups.total} ELSE -${transactionDailyRollups.total} END), 0)`,
+      })
+      .from(transactionDailyRollups)
+      .where(dayFilter),
+    db
+      .select({
+        type: transactionDailyRollups.type,
+        category: transactionDailyRollups.category,
+        total: sql<string>`SUM(${transactionDailyRollups.total})`,
+        count: sql<number>`SUM(${transactionDailyRollups.count})`.mapWith(Number),
+      })
+      .from(transactionDailyRollups)
+      .where(dayFilter)
+      .groupBy(transactionDailyRollups.type, transactionDailyRollups.category),
+    db.select().from(serviceOrderStatusCounts),
+    db.select({ count: entityCounts.count }).from(entityCounts).where(eq(entityCounts.entity, "clients")),
+  ]);
+
+  const byStatus: Record<ServiceOrder["status"], number> = {
+    pending: 0,
+    in_progress: 0,
+    completed: 0,
+    paid: 0,
+    cancelled: 0,
+  };
+  statusCounts.forEach(row => {
+    byStatus[row.status] = row.count;
+  });
+
+  const countOf = (type: "revenue" | "expense") =>
+    categories.filter(c => c.type === type).reduce((sum, c) => sum + c.count, 0);
+
+  return {
+    clients: clientCount[0]?.count ?? 0,
+    serviceOrders: {
+      total: Object.values(byStatus).reduce((sum, n) => sum + n, 0),
+      byStatus,
+    },
+    revenue: String(totals?.revenue ?? "0"),
+    expense: String(totals?.expense ?? "0"),
+    profit: String(totals?.profit ?? "0"),
+    revenueCount: countOf("revenue"),
+    expenseCount: countOf("expense"),
+    categories,
+  };
+});
+
+/**
+ * Rebuilds the rollup and counter tables from the source tables. Safe to run at
+ * any time; the tables are replaced inside a single transaction.
+ */
+export const rebuildDashboardRollups = timedDb("rebuildDashboardRollups", async function rebuildDashboardRollups() {
+  const db = await getDb();
+  if (!db) throw new Error("Database not available");
+
+  await db.transaction(async tx => {
+    await tx.delete(transactionDailyRollups);
+    await tx.insert(transactionDailyRollups).select(
+      tx
+        .select({
+          day: sql<string>`DATE(${transactions.createdAt})`.as("day"),
+          type: transactions.type,
+          category: transactions.category,
+          total: sql<string>`SUM(${transactions.amount})`.as("total"),
+          count: sql<number>`COUNT(*)`.as("count"),
+        })
+        .from(transactions)
+        .groupBy(sql`DATE(${transactions.createdAt})`, transactions.type, transactions.category)
+    );
+
+    await tx.delete(serviceOrderStatusCounts);
+    await tx.insert(serviceOrderStatusCounts).select(
+      tx
+        .select({
+          status: serviceOrders.status,
+          count: sql<number>`COUNT(*)`.as("count"),
+        })
+        .from(serviceOrders)
+        .groupBy(serviceOrders.status)
+    );
+
+    await tx.delete(entityCounts);
+    await tx.insert(entityCounts).select(
+      tx
+        .select({
+          entity: sql<string>`'clients'`.as("entity"),
+          count: sql<number>`COUNT(*)`.as("count"),
+        })
+        .from(clients)
+    );
+  });
+});
+
+// ============ BULK IMPORT / EXPORT ============
+
+export type BulkEntity = "clients" | "vehicles" | "serviceOrders";
+
+export const BULK_COLUMNS: Record<BulkEntity, string[]> = {
+  clients: Object.keys(getTableColumns(clients)),
+  vehicles: Object.keys(getTableColumns(vehicles)),
+  serviceOrders: Object.keys(getTableColumns(serviceOrders)),
+};
+
+/** Multi-row INSERT; the whole batch succeeds or fails as one statement. */
+export const insertClientsBatch = timedDb("insertClientsBatch", async function insertClientsBatch(rows: InsertClient[]) {
+  const db = await getDb();
+  if (!db) throw new Error("Database not available");
+  if (rows.length === 0) return;
+  await db.transaction(async tx => {
+    await tx.insert(clients).values(rows);
+    await bumpEntityCount(tx, "clients", rows.length);
+  });
+});
+
+export const insertVehiclesBatch = timedDb("insertVehiclesBatch", async function insertVehiclesBatch(rows: InsertVehicle[]) {
+  const db = await getDb();
+  if (!db) throw new Error("Database not available");
+  if (rows.length === 0) return;
+  await db.insert(vehicles).values(rows);
+});
 
-export async function createTransaction(data: typeof transactions.$inferInsert) {
+/** Inserts orders and adds them to the per-status counters in one transaction. */
+export const insertServiceOrdersBatch = timedDb("insertServiceOrdersBatch", async function insertServiceOrdersBatch(rows: InsertServiceOrder[]) {
   const db = await getDb();
   if (!db) throw new Error("Database not available");
-  const result = await db.insert(transactions).values(data);
+  if (rows.length === 0) return;
+
+  const perStatus = new Map<ServiceOrder["status"], number>();
+  rows.forEach(row => {
+    const status = row.status ?? "pending";
+    perStatus.set(status, (perStatus.get(status) ?? 0) + 1);
+  });
+
+  await db.transaction(async tx => {
+    await tx.insert(serviceOrders).values(rows);
+    for (const [status, count] of Array.from(perStatus.entries())) {
+      await bumpServiceOrderStatusCount(tx, status, count);
+    }
+  });
+});
+
+export const getClientIdsByCpf = timedDb("getClientIdsByCpf", async function getClientIdsByCpf(cpfs: string[]) {
+  const db = await getDb();
+  const result = new Map<string, number>();
+  if (!db || cpfs.length === 0) return result;
+  const rows = await db
+    .select({ id: clients.id, cpf: clients.cpf })
+    .from(clients)
+    .where(inArray(clients.cpf, cpfs));
+  rows.forEach(row => {
+    if (row.cpf) result.set(row.cpf, row.id);
+  });
   return result;
-}
+});
 
-export async function getTransactionsByServiceOrderId(serviceOrderId: number) {
+export const getVehiclesByPlate = timedDb("getVehiclesByPlate", async function getVehiclesByPlate(plates: string[]) {
+  const db = await getDb();
+  const result = new Map<string, { id: number; clientId: number }>();
+  if (!db || plates.length === 0) return result;
+  const rows = await db
+    .select({ id: vehicles.id, clientId: vehicles.clientId, licensePlate: vehicles.licensePlate })
+    .from(vehicles)
+    .where(inArray(vehicles.licensePlate, plates));
+  rows.forEach(row => result.set(row.licensePlate, { id: row.id, clientId: row.clientId }));
+  return result;
+});
+
+/** Next `limit` rows with id greater than `afterId`, for chunked exports. */
+export const getExportChunk = timedDb("getExportChunk", async function getExportChunk(
+  entity: BulkEntity,
+  afterId: number,
+  limit: number
+): Promise<Record<string, unknown>[]> {
   const db = await getDb();
   if (!db) return [];
-  return await db.select().from(transactions).where(eq(transactions.serviceOrderId, serviceOrderId));
-}
+  switch (entity) {
+    case "clients":
+      return await db.select().from(clients).where(gt(clients.id, afterId)).orderBy(asc(clients.id)).limit(limit);
+    case "vehicles":
+      return await db.select().from(vehicles).where(gt(vehicles.id, afterId)).orderBy(asc(vehicles.id)).limit(limit);
+    case "serviceOrders":
+      return await db.select().from(serviceOrders).where(gt(serviceOrders.id, afterId)).orderBy(asc(serviceOrders.id)).limit(limit);
+  }
+});
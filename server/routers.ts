@@ -1,16 +1,69 @@
 import { COOKIE_NAME } from "@shared/const";
 import { getSessionCookieOptions } from "./_core/cookies";
+import { sdk } from "./_core/sdk";
 import { systemRouter } from "./_core/systemRouter";
 import { publicProcedure, router, protectedProcedure } from "./_core/trpc";
 import { z } from "zod";
 import * as db from "./db";
+import { clientInput, orderStatus, serviceOrderInput, vehicleInput } from "./schemas";
 import { TRPCError } from "@trpc/server";
 
+// Keyset pagination over (createdAt DESC, id DESC); `cursor` is the last row of the previous page.
+const pageInput = {
+  limit: z.number().min(1).max(db.MAX_PAGE_SIZE).optional(),
+  cursor: z.object({ createdAt: z.date(), id: z.number() }).nullish(),
+};
+
+// Money travels as decimal strings so it is never rounded through a JS float.
+// Eight integer digits is the most DECIMAL(10,2) holds.
+const money = z.string().regex(/^\d{1,8}(\.\d{1,2})?$/, "Valor inválido");
+const MAX_ITEM_QUANTITY = 10_000;
+
+const itemFields = {
+  description: z.string().min(1),
+  type: z.enum(["part", "service"]),
+  quantity: z.number().int().min(1).max(MAX_ITEM_QUANTITY).default(1),
+  unitCost: money,
+  unitPrice: money,
+};
+
+const itemUpdateFields = {
+  description: z.string().min(1).optional(),
+  type: z.enum(["part", "service"]).optional(),
+  quantity: z.number().int().min(1).max(MAX_ITEM_QUANTITY).optional(),
+  unitCost: money.optional(),
+  unitPrice: money.optional(),
+};
+
+function isOutOfRange(error: unknown): boolean {
+  // Drizzle wraps driver errors in DrizzleQueryError with the driver error as cause
+  const cause = error instanceof Error && error.cause instanceof Error ? error.cause : error;
+  return (cause as { code?: unknown } | null)?.code === "ER_WARN_DATA_OUT_OF_RANGE";
+}
+
+async function applyItemChanges(serviceOrderId: number, changes: db.ServiceOrderItemChanges) {
+  let totals: Awaited<ReturnType<typeof db.applyServiceOrderItemChanges>>;
+  try {
+    totals = await db.applyServiceOrderItemChanges(serviceOrderId, changes);
+  } catch (error) {
+    // Each value fits on its own, but the order's SUM(quantity * price) may not
+    if (isOutOfRange(error)) {
+      throw new TRPCError({ code: "BAD_REQUEST", message: "Total da ordem de serviço excede o valor máximo" });
+    }
+    throw error;
+  }
+  if (!totals) {
+    throw new TRPCError({ code: "NOT_FOUND", message: "Ordem de serviço não encontrada" });
+  }
+  return totals;
+}
+
 export const appRouter = router({
   system: systemRouter,
   auth: router({
     me: publicProcedure.query(opts => opts.ctx.user),
     logout: publicProcedure.mutation(({ ctx }) => {
+      sdk.forgetSession(ctx.req);
       const cookieOptions = getSessionCookieOptions(ctx.req);
       ctx.res.clearCookie(COOKIE_NAME, { ...cookieOptions, maxAge: -1 });
       return {
@@ -19,11 +72,32 @@ export const appRouter = router({
     }),
   }),
 
+  // ============ DASHBOARD ============
+  dashboard: router({
+    summary: protectedProcedure
+      .input(z.object({
+        from: z.string().regex(/^\d{4}-\d{2}-\d{2}$/).optional(),
+        to: z.string().regex(/^\d{4}-\d{2}-\d{2}$/).optional(),
+      }).optional())
+      .query(async ({ input }) => {
+        const summary = await db.getDashboardSummary(input ?? {});
+        if (!summary) {
+          throw new TRPCError({ code: "INTERNAL_SERVER_ERROR", message: "Banco de dados indisponível" });
+        }
+        return summary;
+      }),
+  }),
+
   // ============ CLIENTS ============
   clients: router({
-    list: protectedProcedure.query(async () => {
-      return await db.getAllClients();
-    }),
+    list: protectedProcedure
+      .input(z.object({
+        ...pageInput,
+        search: z.string().max(100).optional(),
+      }).optional())
+      .query(async ({ input }) => {
+        return await db.listClients(input ?? {});
+      }),
 
     get: protectedProcedure
       .input(z.object({ id: z.number() }))
@@ -36,16 +110,7 @@ export const appRouter = router({
       }),
 
     create: protectedProcedure
-      .input(z.object({
-        name: z.string().min(1),
-        email: z.string().email().optional(),
-        phone: z.string().optional(),
-        cpf: z.string().optional(),
-        address: z.string().optional(),
-        city: z.string().optional(),
-        state: z.string().optional(),
-        zipCode: z.string().optional(),
-      }))
+      .input(clientInput)
       .mutation(async ({ input }) => {
         return await db.createClient(input);
       }),
@@ -93,15 +158,7 @@ export const appRouter = router({
       }),
 
     create: protectedProcedure
-      .input(z.object({
-        clientId: z.number(),
-        brand: z.string().min(1),
-        model: z.string().min(1),
-        year: z.number().optional(),
-        licensePlate: z.string().min(1),
-        vin: z.string().optional(),
-        color: z.string().optional(),
-      }))
+      .input(vehicleInput)
       .mutation(async ({ input }) => {
         return await db.createVehicle(input);
       }),
@@ -130,9 +187,19 @@ export const appRouter = router({
 
   // ============ SERVICE ORDERS ============
   serviceOrders: router({
-    list: protectedProcedure.query(async () => {
-      return await db.getAllServiceOrders();
-    }),
+    list: protectedProcedure
+      .input(z.object({
+        ...pageInput,
+        status: z.array(orderStatus).optional(),
+        clientId: z.number().optional(),
+        vehicleId: z.number().optional(),
+        from: z.date().optional(),
+        to: z.date().optional(),
+        search: z.string().max(100).optional(),
+      }).optional())
+      .query(async ({ input }) => {
+        return await db.listServiceOrders(input ?? {});
+      }),
 
     get: protectedProcedure
       .input(z.object({ id: z.number() }))
@@ -144,6 +211,34 @@ export const appRouter = router({
         return order;
       }),
 
+    // Everything the detail page needs in one round trip
+    getFull: protectedProcedure
+      .input(z.object({ id: z.number() }))
+      .query(async ({ input }) => {
+        const full = await db.getServiceOrderFull(input.id);
+        if (!full) {
+          throw new TRPCError({ code: "NOT_FOUND", message: "Ordem de serviço não encontrada" });
+        }
+        return full;
+      }),
+
+    // Customer-facing view: internal costs never leave the server
+    getQuote: protectedProcedure
+      .input(z.object({ id: z.number() }))
+      .query(async ({ input }) => {
+        const full = await db.getServiceOrderFull(input.id);
+        if (!full) {
+          throw new TRPCError({ code: "NOT_FOUND", message: "Ordem de serviço não encontrada" });
+        }
+        const { totalCost, ...order } = full.order;
+        return {
+          order,
+          client: full.client,
+          vehicle: full.vehicle,
+          items: full.items.map(({ unitCost, ...item }) => item),
+        };
+      }),
+
     listByClient: protectedProcedure
       .input(z.object({ clientId: z.number() }))
       .query(async ({ input }) => {
@@ -151,12 +246,7 @@ export const appRouter = router({
       }),
 
     create: protectedProcedure
-      .input(z.object({
-        clientId: z.number(),
-        vehicleId: z.number(),
-        orderNumber: z.string().min(1),
-        description: z.string().optional(),
-      }))
+      .input(serviceOrderInput)
       .mutation(async ({ input }) => {
         return await db.createServiceOrder({
           ...input,
@@ -169,7 +259,7 @@ export const appRouter = router({
     updateStatus: protectedProcedure
       .input(z.object({
         id: z.number(),
-        status: z.enum(["pending", "in_progress", "completed", "paid", "cancelled"]),
+        status: orderStatus,
       }))
       .mutation(async ({ input }) => {
         const updateData: Record<string, any> = { status: input.status };
@@ -179,7 +269,10 @@ export const appRouter = router({
         if (input.status === "paid") {
           updateData.paidAt = new Date();
         }
-        return await db.updateServiceOrder(input.id, updateData);
+        return await db.updateServiceOrderStatus(input.id, {
+          ...updateData,
+          status: input.status,
+        });
       }),
   }),
 
@@ -194,94 +287,58 @@ export const appRouter = router({
     create: protectedProcedure
       .input(z.object({
         serviceOrderId: z.number(),
-        description: z.string().min(1),
-        type: z.enum(["part", "service"]),
-        quantity: z.number().default(1),
-        unitCost: z.string(),
-        unitPrice: z.string(),
+        ...itemFields,
       }))
       .mutation(async ({ input }) => {
-        const result = await db.createServiceOrderItem(input);
-        
-        // Update service order totals
-        const items = await db.getServiceOrderItems(input.serviceOrderId);
-        let totalCost = 0;
-        let totalPrice = 0;
-        
-        items.forEach(item => {
-          totalCost += parseFloat(item.unitCost) * item.quantity;
-          totalPrice += parseFloat(item.unitPrice) * item.quantity;
-        });
-        
-        await db.updateServiceOrder(input.serviceOrderId, {
-          totalCost: totalCost.toString(),
-          totalPrice: totalPrice.toString(),
-        });
-        
-        return result;
+        const { serviceOrderId, ...item } = input;
+        return await applyItemChanges(serviceOrderId, { create: [item] });
       }),
 
     update: protectedProcedure
       .input(z.object({
         id: z.number(),
         serviceOrderId: z.number(),
-        description: z.string().optional(),
-        type: z.enum(["part", "service"]).optional(),
-        quantity: z.number().optional(),
-        unitCost: z.string().optional(),
-        unitPrice: z.string().optional(),
+        ...itemUpdateFields,
       }))
       .mutation(async ({ input }) => {
-        const { id, serviceOrderId, ...data } = input;
-        const result = await db.updateServiceOrderItem(id, data);
-        
-        // Update service order totals
-        const items = await db.getServiceOrderItems(serviceOrderId);
-        let totalCost = 0;
-        let totalPrice = 0;
-        
-        items.forEach(item => {
-          totalCost += parseFloat(item.unitCost) * item.quantity;
-          totalPrice += parseFloat(item.unitPrice) * item.quantity;
-        });
-        
-        await db.updateServiceOrder(serviceOrderId, {
-          totalCost: totalCost.toString(),
-          totalPrice: totalPrice.toString(),
-        });
-        
-        return result;
+        const { serviceOrderId, ...item } = input;
+        return await applyItemChanges(serviceOrderId, { update: [item] });
       }),
 
     delete: protectedProcedure
       .input(z.object({ id: z.number(), serviceOrderId: z.number() }))
       .mutation(async ({ input }) => {
-        const result = await db.deleteServiceOrderItem(input.id);
-        
-        // Update service order totals
-        const items = await db.getServiceOrderItems(input.serviceOrderId);
-        let totalCost = 0;
-        let totalPrice = 0;
-        
-        items.forEach(item => {
-          totalCost += parseFloat(item.unitCost) * item.quantity;
-          totalPrice += parseFloat(item.unitPrice) * item.quantity;
-        });
-        
-        await db.updateServiceOrder(input.serviceOrderId, {
-          totalCost: totalCost.toString(),
-          totalPrice: totalPrice.toString(),
-        });
-        
-        return result;
+        return await applyItemChanges(input.serviceOrderId, { delete: [input.id] });
+      }),
+
+    // Several item edits on one order in a single transaction and round trip
+    batch: protectedProcedure
+      .input(z.object({
+        serviceOrderId: z.number(),
+        create: z.array(z.object(itemFields)).max(500).optional(),
+        update: z.array(z.object({ id: z.number(), ...itemUpdateFields })).max(500).optional(),
+        delete: z.array(z.number()).max(500).optional(),
+      }))
+      .mutation(async ({ input }) => {
+        const { serviceOrderId, ...changes } = input;
+        return await applyItemChanges(serviceOrderId, changes);
       }),
   }),
 
   // ============ TRANSACTIONS ============
   transactions: router({
-    list: protectedProcedure.query(async () => {
-      return await db.getAllTransactions();
-    }),
+    list: protectedProcedure
+      .input(z.object({
+        ...pageInput,
+        type: z.enum(["revenue", "expense"]).optional(),
+        category: z.string().optional(),
+        serviceOrderId: z.number().optional(),
+        from: z.date().optional(),
+        to: z.date().optional(),
+      }).optional())
+      .query(async ({ input }) => {
+        return await db.listTransactions(input ?? {});
+      }),
 
     create: protectedProcedure
       .input(z.object({
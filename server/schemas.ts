@@ -0,0 +1,33 @@
+import { z } from "zod";
+
+// Input schemas shared by the tRPC procedures and the bulk import routes
+
+export const orderStatus = z.enum(["pending", "in_progress", "completed", "paid", "cancelled"]);
+
+export const clientInput = z.object({
+  name: z.string().min(1),
+  email: z.string().email().optional(),
+  phone: z.string().optional(),
+  cpf: z.string().optional(),
+  address: z.string().optional(),
+  city: z.string().optional(),
+  state: z.string().optional(),
+  zipCode: z.string().optional(),
+});
+
+export const vehicleInput = z.object({
+  clientId: z.number(),
+  brand: z.string().min(1),
+  model: z.string().min(1),
+  year: z.number().optional(),
+  licensePlate: z.string().min(1),
+  vin: z.string().optional(),
+  color: z.string().optional(),
+});
+
+export const serviceOrderInput = z.object({
+  clientId: z.number(),
+  vehicleId: z.number(),
+  orderNumber: z.string().min(1),
+  description: z.string().optional(),
+});
@@ -0,0 +1,138 @@
+/**
+ * Exercises the shared outbound HTTP client against a local stub server:
+ *
+ *   pooled    many GETs through one client; reports req/s, p50/p99 and how
+ *             many TCP connections the stub actually accepted (keep-alive)
+ *   flaky     the stub answers 503 to a share of requests; retries hide them
+ *   down      the stub always fails; the circuit opens and calls fail fast
+ *   cached    the same key loaded concurrently and repeatedly hits the stub once
+ *
+ *   pnpm bench:http [--requests 2000] [--concurrency 50] [--failure-rate 0.3]
+ *
+ * No database or external service is needed.
+ */
+import { createServer } from "http";
+import type { AddressInfo } from "net";
+import { performance } from "node:perf_hooks";
+import { createHttpClient, type HttpClient } from "../_core/httpClient";
+import { parseFlags, percentile } from "./benchUtils";
+
+function parseArgs() {
+  const args = parseFlags();
+  return {
+    requests: parseInt(args.get("requests") ?? "2000"),
+    concurrency: parseInt(args.get("concurrency") ?? "50"),
+    failureRate: parseFloat(args.get("failure-rate") ?? "0.3"),
+  };
+}
+
+async function startStub(failureRate: number) {
+  const counters = { connections: 0, requests: 0 };
+  const server = createServer((req, res) => {
+    counters.requests++;
+    const path = new URL(req.url ?? "/", "http://stub").pathname;
+    const fail = path === "/down" || (path === "/flaky" && Math.random() < failureRate);
+    // Small fixed latency so pooling effects are visible
+    setTimeout(() => {
+      res.writeHead(fail ? 503 : 200, { "content-type": "application/json" });
+      res.end(JSON.stringify({ ok: !fail, path }));
+    }, 2);
+  });
+  server.on("connection", () => counters.connections++);
+  await new Promise<void>(resolve => server.listen(0, "127.0.0.1", resolve));
+  const { port } = server.address() as AddressInfo;
+  return { server, counters, baseUrl: `http://127.0.0.1:${port}` };
+}
+
+async function run(
+  client: HttpClient,
+  url: string,
+  requests: number,
+  concurrency: number
+) {
+  const samples: number[] = [];
+  let ok = 0;
+  let failed = 0;
+  let next = 0;
+  const startedAt = performance.now();
+
+  const worker = async () => {
+    while (next < requests) {
+      next++;
+      const requestStartedAt = performance.now();
+      try {
+        const response = await client.fetch(url);
+        await response.arrayBuffer();
+        if (response.ok) ok++;
+        else failed++;
+      } catch {
+        failed++;
+      }
+      samples.push(performance.now() - requestStartedAt);
+    }
+  };
+  await Promise.all(Array.from({ length: concurrency }, worker));
+
+  const elapsedMs = performance.now() - startedAt;
+  samples.sort((a, b) => a - b);
+  return {
+    ok,
+    failed,
+    reqPerSec: Math.round((requests / elapsedMs) * 1000),
+    p50Ms: +percentile(samples, 0.5).toFixed(2),
+    p99Ms: +percentile(samples, 0.99).toFixed(2),
+  };
+}
+
+async function main() {
+  const { requests, concurrency, failureRate } = parseArgs();
+  const { server, counters, baseUrl } = await startStub(failureRate);
+  const results: Record<string, unknown>[] = [];
+
+  const measure = async (scenario: string, client: HttpClient, path: string) => {
+    counters.connections = 0;
+    counters.requests = 0;
+    const result = await run(client, `${baseUrl}${path}`, requests, concurrency);
+    const { retries, rejected, circuit } = client.stats();
+    results.push({
+      scenario,
+      ...result,
+      stubRequests: counters.requests,
+      connections: counters.connections,
+      retries,
+      rejected,
+      circuit,
+    });
+  };
+
+  await measure("pooled", createHttpClient("bench-pooled", { concurrency }), "/ok");
+  await measure("flaky", createHttpClient("bench-flaky", { concurrency, retries: 3 }), "/flaky");
+  await measure(
+    "down",
+    createHttpClient("bench-down", { concurrency, retries: 1, breakerCooldownMs: 60000 }),
+    "/down"
+  );
+
+  counters.requests = 0;
+  const cachedClient = createHttpClient("bench-cached", { concurrency, cacheEntries: 10 });
+  const load = async () => {
+    const response = await cachedClient.fetch(`${baseUrl}/ok`);
+    return response.json();
+  };
+  await Promise.all(
+    Array.from({ length: requests }, () => cachedClient.cached("same-key", load, () => 60000))
+  );
+  const { cacheHits, cacheMisses } = cachedClient.stats();
+  results.push({ scenario: "cached", ok: requests, stubRequests: counters.requests, cacheHits, cacheMisses });
+
+  console.log(`${requests} requests per scenario, concurrency ${concurrency}, failure rate ${failureRate}`);
+  console.table(results);
+  server.close();
+}
+
+main()
+  .then(() => process.exit(0))
+  .catch(error => {
+    console.error("[Bench] Failed:", error);
+    process.exit(1);
+  });
@@ -0,0 +1,117 @@
+/**
+ * Benchmarks how long the service order detail page waits for its data:
+ *
+ *   waterfall/http   serviceOrders.get + serviceOrderItems.list, then clients.get
+ *                    + vehicles.get, one HTTP request per call
+ *   waterfall/batch  the same calls through httpBatchLink (what the app used)
+ *   getFull/batch    a single serviceOrders.getFull call
+ *
+ * An in-process server is started on an ephemeral port. `--rtt` adds a delay to
+ * every HTTP request to simulate the network round trip the waterfall pays for.
+ *
+ *   pnpm bench:order-detail --order 1 --openId <openId> [--iterations 200] [--rtt 40]
+ *
+ * Requires DATABASE_URL and JWT_SECRET; the user must already exist.
+ */
+import "dotenv/config";
+import { COOKIE_NAME } from "@shared/const";
+import { createTRPCClient, httpBatchLink, httpLink } from "@trpc/client";
+import { createExpressMiddleware } from "@trpc/server/adapters/express";
+import express from "express";
+import { createServer } from "http";
+import type { AddressInfo } from "net";
+import { performance } from "node:perf_hooks";
+import superjson from "superjson";
+import { createContext } from "../_core/context";
+import { sdk } from "../_core/sdk";
+import { appRouter, type AppRouter } from "../routers";
+import { parseFlags, percentile } from "./benchUtils";
+
+function parseArgs() {
+  const args = parseFlags();
+  const orderId = parseInt(args.get("order") ?? "");
+  const openId = args.get("openId") ?? "";
+  if (!orderId || !openId) {
+    throw new Error("Usage: --order <id> --openId <openId> [--iterations N] [--rtt ms]");
+  }
+  return {
+    orderId,
+    openId,
+    iterations: parseInt(args.get("iterations") ?? "200"),
+    rttMs: parseInt(args.get("rtt") ?? "0"),
+  };
+}
+
+async function measure(name: string, iterations: number, run: () => Promise<unknown>) {
+  // Warm up connections, caches and JIT before timing
+  for (let i = 0; i < Math.min(10, iterations); i++) await run();
+
+  const samples: number[] = [];
+  for (let i = 0; i < iterations; i++) {
+    const startedAt = performance.now();
+    await run();
+    samples.push(performance.now() - startedAt);
+  }
+  samples.sort((a, b) => a - b);
+  const mean = samples.reduce((sum, ms) => sum + ms, 0) / samples.length;
+  return {
+    scenario: name,
+    meanMs: +mean.toFixed(2),
+    p50Ms: +percentile(samples, 0.5).toFixed(2),
+    p99Ms: +percentile(samples, 0.99).toFixed(2),
+  };
+}
+
+async function main() {
+  const { orderId, openId, iterations, rttMs } = parseArgs();
+
+  const app = express();
+  if (rttMs > 0) {
+    app.use((_req, _res, next) => setTimeout(next, rttMs));
+  }
+  app.use("/api/trpc", createExpressMiddleware({ router: appRouter, createContext }));
+  const server = createServer(app);
+  await new Promise<void>(resolve => server.listen(0, "127.0.0.1", resolve));
+  const { port } = server.address() as AddressInfo;
+  const url = `http://127.0.0.1:${port}/api/trpc`;
+
+  const token = await sdk.createSessionToken(openId, { name: "bench" });
+  const headers = { cookie: `${COOKIE_NAME}=${token}` };
+
+  const unbatched = createTRPCClient<AppRouter>({
+    links: [httpLink({ url, transformer: superjson, headers })],
+  });
+  const batched = createTRPCClient<AppRouter>({
+    links: [httpBatchLink({ url, transformer: superjson, headers })],
+  });
+
+  const waterfall = (client: typeof batched) => async () => {
+    const [order] = await Promise.all([
+      client.serviceOrders.get.query({ id: orderId }),
+      client.serviceOrderItems.list.query({ serviceOrderId: orderId }),
+    ]);
+    await Promise.all([
+      client.clients.get.query({ id: order.clientId }),
+      client.vehicles.get.query({ id: order.vehicleId }),
+    ]);
+  };
+
+  const results = [
+    await measure("waterfall/http", iterations, waterfall(unbatched)),
+    await measure("waterfall/batch", iterations, waterfall(batched)),
+    await measure("getFull/batch", iterations, () => batched.serviceOrders.getFull.query({ id: orderId })),
+  ];
+
+  console.log(`Order ${orderId}, ${iterations} iterations, simulated RTT ${rttMs}ms`);
+  console.table(results);
+
+  await sdk.lastSignedIn.flush();
+  server.close();
+}
+
+main()
+  .then(() => process.exit(0))
+  .catch(error => {
+    console.error("[Bench] Failed:", error);
+    process.exit(1);
+  });
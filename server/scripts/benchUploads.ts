@@ -0,0 +1,189 @@
+/**
+ * Peak RSS while handling concurrent uploads, per upload strategy:
+ *
+ *   json      base64 file inside a JSON body (express.json) -> storagePut
+ *   buffered  raw body collected into a Buffer -> storagePut
+ *   stream    raw body piped through storagePutStream (what /api/upload does)
+ *
+ * Each strategy runs in a fresh child process so peaks do not mix; a stub
+ * storage proxy in the parent process reads and discards the uploaded bytes.
+ *
+ *   pnpm bench:uploads [--concurrency 10] [--size-mb 20]
+ *
+ * No database or external service is needed.
+ */
+import express from "express";
+import { fork } from "node:child_process";
+import { createServer, request } from "node:http";
+import type { AddressInfo } from "node:net";
+import { performance } from "node:perf_hooks";
+import type { Readable } from "node:stream";
+import { parseFlags } from "./benchUtils";
+
+type Mode = "json" | "buffered" | "stream";
+const MODES: Mode[] = ["json", "buffered", "stream"];
+
+// Multiple of 3 so consecutive base64 chunks concatenate into valid base64
+const CHUNK = Buffer.alloc(48 * 1024, 7);
+
+type Result = {
+  mode: Mode;
+  uploads: number;
+  sizeMb: number;
+  baselineRssMb: number;
+  peakRssMb: number;
+  durationMs: number;
+};
+
+function parseArgs() {
+  const args = parseFlags();
+  return {
+    child: args.get("child") as Mode | undefined,
+    concurrency: parseInt(args.get("concurrency") ?? "10"),
+    sizeMb: parseInt(args.get("size-mb") ?? "20"),
+  };
+}
+
+const toMb = (bytes: number) => Math.round(bytes / (1024 * 1024));
+
+async function readAll(stream: Readable) {
+  const chunks: Buffer[] = [];
+  for await (const chunk of stream) chunks.push(chunk as Buffer);
+  return Buffer.concat(chunks);
+}
+
+/** Sends one upload, generating the payload lazily so the client holds almost nothing. */
+function upload(port: number, mode: Mode, sizeBytes: number) {
+  return new Promise<void>((resolve, reject) => {
+    const req = request(
+      {
+        port,
+        host: "127.0.0.1",
+        method: "POST",
+        path: `/${mode}`,
+        headers: { "content-type": mode === "json" ? "application/json" : "image/jpeg" },
+      },
+      res => {
+        res.resume();
+        res.on("end", () => (res.statusCode === 200 ? resolve() : reject(new Error(`HTTP ${res.statusCode}`))));
+      }
+    );
+    req.on("error", reject);
+
+    const chunkText = CHUNK.toString("base64");
+    let sent = 0;
+    const writeMore = () => {
+      while (sent < sizeBytes) {
+        sent += CHUNK.length;
+        const ok = req.write(mode === "json" ? chunkText : CHUNK);
+        if (!ok) {
+          req.once("drain", writeMore);
+          return;
+        }
+      }
+      req.end(mode === "json" ? '"}' : undefined);
+    };
+    if (mode === "json") req.write('{"data":"');
+    writeMore();
+  });
+}
+
+async function runChild(mode: Mode, concurrency: number, sizeMb: number): Promise<Result> {
+  // Imported here so the stub URL from the parent is in the environment first
+  const { storagePut, storagePutStream } = await import("../storage");
+
+  const app = express();
+  app.post("/json", express.json({ limit: "50mb" }), async (req, res) => {
+    await storagePut("bench/upload.jpg", Buffer.from(req.body.data, "base64"), "image/jpeg");
+    res.json({ ok: true });
+  });
+  app.post("/buffered", async (req, res) => {
+    await storagePut("bench/upload.jpg", await readAll(req), "image/jpeg");
+    res.json({ ok: true });
+  });
+  app.post("/stream", async (req, res) => {
+    await storagePutStream("bench/upload.jpg", req, "image/jpeg");
+    res.json({ ok: true });
+  });
+
+  const server = createServer(app);
+  await new Promise<void>(resolve => server.listen(0, "127.0.0.1", resolve));
+  const { port } = server.address() as AddressInfo;
+
+  global.gc?.();
+  const baseline = process.memoryUsage().rss;
+  let peak = baseline;
+  const sampler = setInterval(() => {
+    peak = Math.max(peak, process.memoryUsage().rss);
+  }, 5);
+
+  const startedAt = performance.now();
+  await Promise.all(
+    Array.from({ length: concurrency }, () => upload(port, mode, sizeMb * 1024 * 1024))
+  );
+  const durationMs = Math.round(performance.now() - startedAt);
+  clearInterval(sampler);
+  server.close();
+
+  return {
+    mode,
+    uploads: concurrency,
+    sizeMb,
+    baselineRssMb: toMb(baseline),
+    peakRssMb: toMb(peak),
+    durationMs,
+  };
+}
+
+async function startStorageStub() {
+  const server = createServer((req, res) => {
+    req.on("data", () => undefined);
+    req.on("end", () => {
+      res.writeHead(200, { "content-type": "application/json" });
+      res.end(JSON.stringify({ url: "http://stub/bench/upload.jpg" }));
+    });
+  });
+  await new Promise<void>(resolve => server.listen(0, "127.0.0.1", resolve));
+  const { port } = server.address() as AddressInfo;
+  return { server, url: `http://127.0.0.1:${port}` };
+}
+
+async function main() {
+  const { child, concurrency, sizeMb } = parseArgs();
+
+  if (child) {
+    const result = await runChild(child, concurrency, sizeMb);
+    await new Promise<void>(resolve => process.send?.(result, () => resolve()));
+    return;
+  }
+
+  const stub = await startStorageStub();
+  const results: Result[] = [];
+  for (const mode of MODES) {
+    const worker = fork(
+      process.argv[1],
+      ["--child", mode, "--concurrency", String(concurrency), "--size-mb", String(sizeMb)],
+      {
+        env: { ...process.env, BUILT_IN_FORGE_API_URL: stub.url, BUILT_IN_FORGE_API_KEY: "bench" },
+        execArgv: process.execArgv,
+      }
+    );
+    results.push(
+      await new Promise<Result>((resolve, reject) => {
+        worker.once("message", message => resolve(message as Result));
+        worker.once("exit", code => reject(new Error(`${mode} worker exited with code ${code}`)));
+      })
+    );
+  }
+  stub.server.close();
+
+  console.log(`${concurrency} concurrent uploads of ${sizeMb}MB each`);
+  console.table(results);
+}
+
+main()
+  .then(() => process.exit(0))
+  .catch(error => {
+    console.error("[Bench] Failed:", error);
+    process.exit(1);
+  });
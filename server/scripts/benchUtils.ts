@@ -0,0 +1,25 @@
+// Helpers shared by the bench:* scripts
+
+/**
+ * `--name value` options from the command line. An option followed by another
+ * option (or by nothing) is a flag and maps to "".
+ */
+export function parseFlags(argv = process.argv.slice(2)): Map<string, string> {
+  const args = new Map<string, string>();
+  for (let i = 0; i < argv.length; i++) {
+    if (!argv[i].startsWith("--")) continue;
+    const next = argv[i + 1];
+    if (next === undefined || next.startsWith("--")) {
+      args.set(argv[i].slice(2), "");
+    } else {
+      args.set(argv[i].slice(2), next);
+      i++;
+    }
+  }
+  return args;
+}
+
+/** Nearest-rank percentile of ascending `sorted`; 0 when it is empty. */
+export function percentile(sorted: number[], p: number) {
+  return sorted[Math.min(sorted.length - 1, Math.ceil(sorted.length * p) - 1)] ?? 0;
+}
@@ -0,0 +1,77 @@
+/**
+ * Writes .br and .gz next to every compressible file of the client build so
+ * serveStatic can send them without compressing on each request. Runs as part
+ * of `pnpm build`; files that do not shrink are left alone.
+ *
+ *   tsx server/scripts/precompressAssets.ts [dist/public]
+ */
+import fs from "node:fs/promises";
+import path from "node:path";
+import { promisify } from "node:util";
+import zlib from "node:zlib";
+
+const COMPRESSIBLE = /\.(js|mjs|css|html|svg|json|txt|xml|ico|wasm|webmanifest)$/;
+const MIN_BYTES = 1024;
+
+const brotli = promisify(zlib.brotliCompress);
+const gzip = promisify(zlib.gzip);
+
+async function listFiles(dir: string): Promise<string[]> {
+  const entries = await fs.readdir(dir, { withFileTypes: true });
+  const nested = await Promise.all(
+    entries.map(entry => {
+      const fullPath = path.join(dir, entry.name);
+      return entry.isDirectory() ? listFiles(fullPath) : Promise.resolve([fullPath]);
+    })
+  );
+  return nested.flat();
+}
+
+async function compressFile(filePath: string) {
+  const source = await fs.readFile(filePath);
+  const [br, gz] = await Promise.all([
+    brotli(source, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: source.length,
+      },
+    }),
+    gzip(source, { level: zlib.constants.Z_BEST_COMPRESSION }),
+  ]);
+
+  let saved = 0;
+  for (const [suffix, data] of [[".br", br], [".gz", gz]] as const) {
+    if (data.length < source.length) {
+      await fs.writeFile(filePath + suffix, data);
+      saved = Math.max(saved, source.length - data.length);
+    }
+  }
+  return { original: source.length, saved };
+}
+
+async function main() {
+  const root = path.resolve(process.argv[2] ?? "dist/public");
+  const files = (await listFiles(root)).filter(
+    file => COMPRESSIBLE.test(file) && !file.endsWith(".map")
+  );
+
+  let original = 0;
+  let saved = 0;
+  let compressed = 0;
+  for (const file of files) {
+    const stat = await fs.stat(file);
+    if (stat.size < MIN_BYTES) continue;
+    const result = await compressFile(file);
+    original += result.original;
+    saved += result.saved;
+    compressed++;
+  }
+
+  const kb = (bytes: number) => `${Math.round(bytes / 1024)}KB`;
+  console.log(`[Precompress] ${compressed} files, ${kb(original)} -> ${kb(original - saved)} with brotli`);
+}
+
+main().catch(error => {
+  console.error("[Precompress] Failed:", error);
+  process.exit(1);
+});
@@ -0,0 +1,27 @@
+/**
+ * Rebuilds the dashboard rollup tables (transactionDailyRollups,
+ * serviceOrderStatusCounts and entityCounts) from transactions, serviceOrders
+ * and clients.
+ *
+ * Run after applying the rollup migration, or whenever the counters are suspected
+ * to be out of sync:
+ *   pnpm db:rebuild-rollups
+ */
+import "dotenv/config";
+import { rebuildDashboardRollups } from "../db";
+
+async function main() {
+  if (!process.env.DATABASE_URL) {
+    throw new Error("DATABASE_URL is required to rebuild rollups");
+  }
+  const startedAt = Date.now();
+  await rebuildDashboardRollups();
+  console.log(`[Rollups] Rebuilt in ${Date.now() - startedAt}ms`);
+}
+
+main()
+  .then(() => process.exit(0))
+  .catch(error => {
+    console.error("[Rollups] Rebuild failed:", error);
+    process.exit(1);
+  });
@@ -0,0 +1,163 @@
+import { createServer, type IncomingMessage, type Server, type ServerResponse } from "node:http";
+import type { AddressInfo } from "node:net";
+import { Readable } from "node:stream";
+import { setTimeout as sleep } from "node:timers/promises";
+import { afterEach, beforeEach, describe, expect, it, vi } from "vitest";
+import { ENV } from "./_core/env";
+import { httpClients, resetHttpClients } from "./_core/httpClient";
+import { signedUrlExpiresAt, storagePutStream, UploadTooLargeError } from "./storage";
+
+describe("signedUrlExpiresAt", () => {
+  it("reads SigV4 signing time plus lifetime from S3 URLs", () => {
+    const url =
+      "https://bucket.s3.amazonaws.com/a.jpg?X-Amz-Algorithm=AWS4-HMAC-SHA256&X-Amz-Date=20260301T120000Z&X-Amz-Expires=3600&X-Amz-Signature=abc";
+    expect(signedUrlExpiresAt(url)).toBe(Date.UTC(2026, 2, 1, 13, 0, 0));
+  });
+
+  it("reads the same fields from GCS URLs", () => {
+    const url = "https://storage.googleapis.com/b/a.jpg?X-Goog-Date=20261231T235930Z&X-Goog-Expires=60";
+    expect(signedUrlExpiresAt(url)).toBe(Date.UTC(2027, 0, 1, 0, 0, 30));
+  });
+
+  it("reads V2-style Expires in epoch seconds", () => {
+    expect(signedUrlExpiresAt("https://cdn.example.com/a.jpg?Expires=1790000000&Signature=x")).toBe(1_790_000_000_000);
+  });
+
+  it("returns null when there is no usable expiry", () => {
+    expect(signedUrlExpiresAt("https://cdn.example.com/a.jpg")).toBeNull();
+    expect(signedUrlExpiresAt("https://cdn.example.com/a.jpg?X-Amz-Date=20260301T120000Z")).toBeNull();
+    expect(signedUrlExpiresAt("https://cdn.example.com/a.jpg?X-Amz-Date=yesterday&X-Amz-Expires=60")).toBeNull();
+    expect(signedUrlExpiresAt("https://cdn.example.com/a.jpg?Expires=tomorrow")).toBeNull();
+    expect(signedUrlExpiresAt("not a url")).toBeNull();
+  });
+});
+
+describe("storagePutStream", () => {
+  let server: Server;
+  let received: number[];
+  let handler: (req: IncomingMessage, res: ServerResponse) => void;
+  const env = { url: ENV.forgeApiUrl, key: ENV.forgeApiKey };
+
+  /** Stub storage proxy that reads the whole body and reports its size. */
+  function storeUpload(req: IncomingMessage, res: ServerResponse) {
+    let size = 0;
+    req.on("data", chunk => (size += chunk.length));
+    req.on("end", () => {
+      received.push(size);
+      res.setHeader("content-type", "application/json");
+      res.end(JSON.stringify({ url: "https://cdn.example.com/file" }));
+    });
+  }
+
+  beforeEach(async () => {
+    received = [];
+    handler = storeUpload;
+    server = createServer((req, res) => handler(req, res));
+    await new Promise<void>(resolve => server.listen(0, "127.0.0.1", resolve));
+    ENV.forgeApiUrl = `http://127.0.0.1:${(server.address() as AddressInfo).port}`;
+    ENV.forgeApiKey = "test-key";
+    resetHttpClients();
+  });
+
+  afterEach(async () => {
+    vi.restoreAllMocks();
+    ENV.forgeApiUrl = env.url;
+    ENV.forgeApiKey = env.key;
+    server.closeAllConnections();
+    await new Promise(resolve => server.close(resolve));
+  });
+
+  /** Readable that yields `count` chunks of `size` bytes, `delayMs` apart. */
+  function source(count: number, size: number, delayMs = 0) {
+    return Readable.from(
+      (async function* () {
+        for (let i = 0; i < count; i++) {
+          if (delayMs) await sleep(delayMs);
+          yield Buffer.alloc(size, 97);
+        }
+      })()
+    );
+  }
+
+  it("streams the file and reports its size", async () => {
+    const result = await storagePutStream("uploads/a.jpg", source(4, 1000), "image/jpeg");
+
+    expect(result).toEqual({ key: "uploads/a.jpg", url: "https://cdn.example.com/file", size: 4000 });
+    expect(received).toHaveLength(1);
+    expect(received[0]).toBeGreaterThan(4000);
+  });
+
+  it("does not open the circuit for oversized uploads", async () => {
+    for (let i = 0; i <= ENV.httpBreakerThreshold; i++) {
+      await expect(storagePutStream("uploads/big.jpg", source(4, 1000), "image/jpeg", { maxBytes: 2500 })).rejects.toThrow(
+        UploadTooLargeError
+      );
+    }
+
+    expect(httpClients.storageUpload.stats()).toMatchObject({ circuit: "closed", consecutiveFailures: 0 });
+    expect(httpClients.storage.stats()).toMatchObject({ circuit: "closed", consecutiveFailures: 0 });
+    await expect(storagePutStream("uploads/a.jpg", source(1, 10), "image/jpeg")).resolves.toMatchObject({ size: 10 });
+  });
+
+  it("does not open the circuit when the uploader goes away", async () => {
+    for (let i = 0; i <= ENV.httpBreakerThreshold; i++) {
+      const dropped = new Readable({ read() {} });
+      dropped.push(Buffer.alloc(1000));
+      setTimeout(() => dropped.destroy(new Error("aborted")), 10);
+      await expect(storagePutStream("uploads/a.jpg", dropped, "image/jpeg")).rejects.toThrow("aborted");
+    }
+
+    for (let i = 0; i <= ENV.httpBreakerThreshold; i++) {
+      const controller = new AbortController();
+      setTimeout(() => controller.abort(), 10);
+      await expect(
+        storagePutStream("uploads/a.jpg", source(10, 1000, 5), "image/jpeg", { signal: controller.signal })
+      ).rejects.toThrow();
+    }
+
+    expect(httpClients.storageUpload.stats()).toMatchObject({ circuit: "closed", consecutiveFailures: 0 });
+  });
+
+  it("still counts upstream failures against the upload circuit", async () => {
+    handler = (req, res) => {
+      req.resume();
+      req.on("end", () => res.writeHead(503).end());
+    };
+
+    await expect(storagePutStream("uploads/a.jpg", source(1, 10), "image/jpeg")).rejects.toThrow("503");
+    expect(httpClients.storageUpload.stats().consecutiveFailures).toBe(1);
+    expect(httpClients.storage.stats().consecutiveFailures).toBe(0);
+  });
+
+  it("puts no timeout on slow uploads", async () => {
+    const timeout = vi.spyOn(AbortSignal, "timeout");
+
+    const result = await storagePutStream("uploads/slow.jpg", source(5, 100, 20), "image/jpeg");
+
+    expect(result.size).toBe(500);
+    expect(timeout).not.toHaveBeenCalled();
+  });
+
+  it("does not take storage slots while uploading", async () => {
+    let release!: () => void;
+    const gate = new Promise<void>(resolve => (release = resolve));
+    const held = Readable.from(
+      (async function* () {
+        yield Buffer.alloc(10);
+        await gate;
+      })()
+    );
+
+    const uploads = Array.from({ length: 20 }, (_, i) =>
+      storagePutStream(`uploads/${i}.jpg`, i === 0 ? held : source(1, 10, 50), "image/jpeg")
+    );
+    await sleep(20);
+
+    expect(httpClients.storage.stats().inFlight).toBe(0);
+    expect(httpClients.storageUpload.stats()).toMatchObject({ inFlight: 20, queued: 0 });
+
+    release();
+    await Promise.all(uploads);
+    expect(httpClients.storageUpload.stats().inFlight).toBe(0);
+  });
+});
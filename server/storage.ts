@@ -1,7 +1,15 @@
 // Preconfigured storage helpers for Manus WebDev templates
 // Uses the Biz-provided storage proxy (Authorization: Bearer <token>)
 
+import { randomBytes } from "node:crypto";
+import type { Readable } from "node:stream";
 import { ENV } from './_core/env';
+import { httpClients } from './_core/httpClient';
+
+// Signed URLs are reused until this long before they expire
+const SIGNED_URL_MARGIN_MS = 60_000;
+// Used when the URL carries no recognizable expiry
+const UNKNOWN_EXPIRY_TTL_MS = 60_000;
 
 type StorageConfig = { baseUrl: string; apiKey: string };
 
@@ -34,13 +42,50 @@ async function buildDownloadUrl(
     ensureTrailingSlash(baseUrl)
   );
   downloadApiUrl.searchParams.set("path", normalizeKey(relKey));
-  const response = await fetch(downloadApiUrl, {
+  const response = await httpClients.storage.fetch(downloadApiUrl, {
     method: "GET",
     headers: buildAuthHeaders(apiKey),
   });
+
+  if (!response.ok) {
+    const message = await response.text().catch(() => response.statusText);
+    throw new Error(
+      `Storage download URL request failed (${response.status} ${response.statusText}): ${message}`
+    );
+  }
   return (await response.json()).url;
 }
 
+/**
+ * Expiry of a presigned URL in epoch ms: AWS/GCS SigV4 (X-Amz-Date +
+ * X-Amz-Expires, X-Goog-Date + X-Goog-Expires) or V2-style `Expires`.
+ */
+export function signedUrlExpiresAt(url: string): number | null {
+  let params: URLSearchParams;
+  try {
+    params = new URL(url).searchParams;
+  } catch {
+    return null;
+  }
+
+  for (const prefix of ["X-Amz", "X-Goog"]) {
+    const signedAt = params.get(`${prefix}-Date`)?.match(/^(\d{4})(\d{2})(\d{2})T(\d{2})(\d{2})(\d{2})Z$/);
+    const expires = Number(params.get(`${prefix}-Expires`));
+    if (signedAt && expires > 0) {
+      const [, y, mo, d, h, mi, sec] = signedAt.map(Number);
+      return Date.UTC(y, mo - 1, d, h, mi, sec) + expires * 1000;
+    }
+  }
+
+  const expires = params.get("Expires");
+  return expires && /^\d+$/.test(expires) ? Number(expires) * 1000 : null;
+}
+
+function downloadUrlTtl(url: string): number {
+  const expiresAt = signedUrlExpiresAt(url);
+  return expiresAt === null ? UNKNOWN_EXPIRY_TTL_MS : expiresAt - Date.now() - SIGNED_URL_MARGIN_MS;
+}
+
 function ensureTrailingSlash(value: string): string {
   return value.endsWith("/") ? value : `${value}/`;
 }
@@ -67,6 +112,64 @@ function buildAuthHeaders(apiKey: string): HeadersInit {
   return { Authorization: `Bearer ${apiKey}` };
 }
 
+export class UploadTooLargeError extends Error {
+  constructor(readonly maxBytes: number) {
+    super(`Upload exceeds the limit of ${maxBytes} bytes`);
+    this.name = "UploadTooLargeError";
+  }
+}
+
+function escapeHeaderValue(value: string): string {
+  return value.replace(/["\r\n]/g, "_");
+}
+
+/**
+ * multipart/form-data body with a single "file" part, produced chunk by chunk
+ * as the proxy reads it so the file is never held in memory. Counting stops
+ * the upload as soon as `maxBytes` is passed. Any failure on our side (size
+ * cutoff, uploader gone) aborts `controller` with the error before the body
+ * fails, so the request counts as cancelled rather than as an upstream fault.
+ */
+async function* streamFormData(
+  source: AsyncIterable<Buffer | Uint8Array | string>,
+  boundary: string,
+  contentType: string,
+  fileName: string,
+  maxBytes: number,
+  counter: { bytes: number },
+  controller: AbortController
+): AsyncGenerator<Uint8Array> {
+  yield Buffer.from(
+    `--${boundary}\r\n` +
+      `Content-Disposition: form-data; name="file"; filename="${escapeHeaderValue(fileName || "file")}"\r\n` +
+      `Content-Type: ${escapeHeaderValue(contentType)}\r\n\r\n`
+  );
+  try {
+    for await (const chunk of source) {
+      const bytes = typeof chunk === "string" ? Buffer.from(chunk) : chunk;
+      counter.bytes += bytes.length;
+      if (counter.bytes > maxBytes) {
+        throw new UploadTooLargeError(maxBytes);
+      }
+      yield bytes;
+    }
+  } catch (error) {
+    controller.abort(error);
+    throw error;
+  }
+  yield Buffer.from(`\r\n--${boundary}--\r\n`);
+}
+
+async function readUploadResponse(response: Response): Promise<string> {
+  if (!response.ok) {
+    const message = await response.text().catch(() => response.statusText);
+    throw new Error(
+      `Storage upload failed (${response.status} ${response.statusText}): ${message}`
+    );
+  }
+  return (await response.json()).url;
+}
+
 export async function storagePut(
   relKey: string,
   data: Buffer | Uint8Array | string,
@@ -76,27 +179,86 @@ export async function storagePut(
   const key = normalizeKey(relKey);
   const uploadUrl = buildUploadUrl(baseUrl, key);
   const formData = toFormData(data, contentType, key.split("/").pop() ?? key);
-  const response = await fetch(uploadUrl, {
+  // Uploading to the same key twice just overwrites it, so retries are safe
+  const response = await httpClients.storage.fetch(uploadUrl, {
     method: "POST",
     headers: buildAuthHeaders(apiKey),
     body: formData,
+    idempotent: true,
   });
 
-  if (!response.ok) {
-    const message = await response.text().catch(() => response.statusText);
-    throw new Error(
-      `Storage upload failed (${response.status} ${response.statusText}): ${message}`
-    );
-  }
-  const url = (await response.json()).url;
+  const url = await readUploadResponse(response);
+  httpClients.storage.invalidate(`downloadUrl:${key}`);
   return { key, url };
 }
 
+/**
+ * Streams `stream` to storage without buffering it. Memory per upload stays at
+ * a few chunks regardless of size; once more than `maxBytes` have been read
+ * the upload is aborted and UploadTooLargeError is thrown, leaving `stream`
+ * paused rather than destroyed. Stream bodies cannot be replayed, so unlike
+ * storagePut this is never retried.
+ *
+ * Uploads go through `httpClients.storageUpload`, which has no timeout or slot
+ * limit, so `signal` should end the upload once the uploader goes away.
+ */
+export async function storagePutStream(
+  relKey: string,
+  stream: Readable,
+  contentType = "application/octet-stream",
+  { maxBytes = Infinity, signal }: { maxBytes?: number; signal?: AbortSignal } = {}
+): Promise<{ key: string; url: string; size: number }> {
+  const { baseUrl, apiKey } = getStorageConfig();
+  const key = normalizeKey(relKey);
+  const uploadUrl = buildUploadUrl(baseUrl, key);
+  const boundary = `----storage${randomBytes(12).toString("hex")}`;
+  const counter = { bytes: 0 };
+  const controller = new AbortController();
+
+  let response: Response;
+  try {
+    response = await httpClients.storageUpload.fetch(uploadUrl, {
+      method: "POST",
+      headers: {
+        ...buildAuthHeaders(apiKey),
+        "Content-Type": `multipart/form-data; boundary=${boundary}`,
+      },
+      // fetch accepts async iterables as a streaming body
+      // Stopping early must not destroy `stream`: for a request that would
+      // also destroy the socket the caller still needs to answer on
+      body: streamFormData(
+        stream.iterator({ destroyOnReturn: false }),
+        boundary,
+        contentType,
+        key.split("/").pop() ?? key,
+        maxBytes,
+        counter,
+        controller
+      ) as unknown as BodyInit,
+      duplex: "half",
+      signal: signal ? AbortSignal.any([controller.signal, signal]) : controller.signal,
+    });
+  } catch (error) {
+    stream.unpipe();
+    stream.pause();
+    // fetch reports the abort; rethrow what caused it (e.g. UploadTooLargeError)
+    throw controller.signal.aborted ? controller.signal.reason : error;
+  }
+
+  const url = await readUploadResponse(response);
+  httpClients.storage.invalidate(`downloadUrl:${key}`);
+  return { key, url, size: counter.bytes };
+}
+
 export async function storageGet(relKey: string): Promise<{ key: string; url: string; }> {
   const { baseUrl, apiKey } = getStorageConfig();
   const key = normalizeKey(relKey);
   return {
     key,
-    url: await buildDownloadUrl(baseUrl, key, apiKey),
+    url: await httpClients.storage.cached(
+      `downloadUrl:${key}`,
+      () => buildDownloadUrl(baseUrl, key, apiKey),
+      downloadUrlTtl
+    ),
   };
 }
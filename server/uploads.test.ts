@@ -0,0 +1,136 @@
+import express from "express";
+import { createServer, request, type Server } from "node:http";
+import type { AddressInfo } from "node:net";
+import { afterEach, beforeEach, describe, expect, it, vi } from "vitest";
+import { ENV } from "./_core/env";
+import { resetHttpClients } from "./_core/httpClient";
+import { registerUploadRoutes } from "./uploads";
+
+vi.mock("./_core/context", () => ({
+  requireUser: async () => ({ id: 1, openId: "user" }),
+}));
+
+type Reply = { status: number; body: string; headers: Record<string, unknown>; unsent: number };
+
+async function listen(server: Server): Promise<number> {
+  await new Promise<void>(resolve => server.listen(0, "127.0.0.1", resolve));
+  return (server.address() as AddressInfo).port;
+}
+
+async function close(server: Server) {
+  server.closeAllConnections();
+  await new Promise(resolve => server.close(resolve));
+}
+
+describe("POST /api/upload", () => {
+  let app: Server;
+  let storage: Server;
+  let port: number;
+  let stored: number[];
+  const env = { url: ENV.forgeApiUrl, key: ENV.forgeApiKey, max: ENV.uploadMaxBytes };
+
+  beforeEach(async () => {
+    stored = [];
+    storage = createServer((req, res) => {
+      let size = 0;
+      req.on("data", chunk => (size += chunk.length));
+      req.on("end", () => {
+        stored.push(size);
+        res.setHeader("content-type", "application/json");
+        res.end(JSON.stringify({ url: "https://cdn.example.com/file" }));
+      });
+    });
+    ENV.forgeApiUrl = `http://127.0.0.1:${await listen(storage)}`;
+    ENV.forgeApiKey = "test-key";
+    ENV.uploadMaxBytes = 10_000;
+    resetHttpClients();
+
+    const server = express();
+    registerUploadRoutes(server);
+    app = createServer(server);
+    port = await listen(app);
+  });
+
+  afterEach(async () => {
+    ENV.forgeApiUrl = env.url;
+    ENV.forgeApiKey = env.key;
+    ENV.uploadMaxBytes = env.max;
+    await close(app);
+    await close(storage);
+  });
+
+  /**
+   * Sends `chunks` one at a time without a Content-Length, like a browser
+   * streaming a file, and keeps writing until the server answers.
+   */
+  function upload(chunks: Buffer[], headers: Record<string, string | number> = {}): Promise<Reply> {
+    return new Promise((resolve, reject) => {
+      let answered = false;
+      const req = request(
+        {
+          port,
+          method: "POST",
+          path: "/api/upload?filename=foto.jpg",
+          headers: { "content-type": "image/jpeg", ...headers },
+        },
+        res => {
+          answered = true;
+          let body = "";
+          res.setEncoding("utf8");
+          res.on("data", chunk => (body += chunk));
+          res.on("error", reject);
+          // Resolve once the connection is gone, to see how much was left unsent
+          req.on("close", () =>
+            resolve({ status: res.statusCode ?? 0, body, headers: res.headers, unsent: chunks.length })
+          );
+        }
+      );
+      // Writes after the server hangs up fail; only a missing answer is an error
+      req.on("error", error => {
+        if (!answered) reject(error);
+      });
+      const next = () => {
+        if (answered || req.destroyed) return;
+        const chunk = chunks.shift();
+        if (!chunk) {
+          req.end();
+          return;
+        }
+        req.write(chunk, () => setTimeout(next, 5));
+      };
+      next();
+    });
+  }
+
+  it("streams the file to storage", async () => {
+    const reply = await upload([Buffer.alloc(4000), Buffer.alloc(4000)]);
+
+    expect(reply.status).toBe(200);
+    expect(JSON.parse(reply.body)).toMatchObject({ url: "https://cdn.example.com/file", size: 8000 });
+    expect(stored).toHaveLength(1);
+  });
+
+  it("answers 413 to a chunked upload that passes the limit", async () => {
+    const reply = await upload(Array.from({ length: 50 }, () => Buffer.alloc(1000)));
+
+    expect(reply.status).toBe(413);
+    expect(reply.headers.connection).toBe("close");
+    expect(JSON.parse(reply.body).error).toMatch("10000 bytes");
+    // The server hung up instead of reading the rest of the body
+    expect(reply.unsent).toBeGreaterThan(30);
+    expect(stored).toHaveLength(0);
+  });
+
+  it("answers 413 to a declared Content-Length over the limit without reading it", async () => {
+    const reply = await upload([Buffer.alloc(1000)], { "content-length": 20_000 });
+
+    expect(reply.status).toBe(413);
+    expect(reply.headers.connection).toBe("close");
+  });
+
+  it("refuses types other than images, audio and video", async () => {
+    const reply = await upload([Buffer.from("{}")], { "content-type": "application/json" });
+
+    expect(reply.status).toBe(415);
+  });
+});
@@ -0,0 +1,77 @@
+import { randomUUID } from "node:crypto";
+import type { Express, Request, Response } from "express";
+import { requireUser } from "./_core/context";
+import { ENV } from "./_core/env";
+import { storagePutStream, UploadTooLargeError } from "./storage";
+
+// Photos, voice notes and short videos of vehicle damage
+const ALLOWED_CONTENT_TYPE = /^(image|audio|video)\/[\w.+-]+$/;
+
+function safeFileName(value: unknown): string {
+  const name = typeof value === "string" ? value : "";
+  const cleaned = name.replace(/[^\w.-]+/g, "_").replace(/^[._]+/, "").slice(-100);
+  return cleaned || "file";
+}
+
+function rejectTooLarge(req: Request, res: Response) {
+  // Stop reading, answer, then drop the connection instead of letting Node
+  // read and discard the rest of the body
+  const socket = req.socket;
+  req.unpipe();
+  req.pause();
+  res.set("Connection", "close");
+  res.once("finish", () => socket.destroy());
+  res.status(413).json({ error: `File exceeds the limit of ${ENV.uploadMaxBytes} bytes` });
+}
+
+/**
+ * POST /api/upload?filename=foto.jpg takes the raw file as the request body
+ * (Content-Type set to the file's type) and streams it to storage, answering
+ * with `{ key, url, size }`. Nothing is buffered: a declared Content-Length
+ * over UPLOAD_MAX_BYTES is refused before reading, and a chunked body is cut
+ * off as soon as the streamed byte count passes the limit.
+ */
+export function registerUploadRoutes(app: Express) {
+  app.post("/api/upload", async (req: Request, res: Response) => {
+    const user = await requireUser(req, res);
+    if (!user) return;
+
+    const contentType = (req.headers["content-type"] ?? "").split(";")[0].trim().toLowerCase();
+    if (!ALLOWED_CONTENT_TYPE.test(contentType)) {
+      res.set("Connection", "close");
+      res.status(415).json({ error: `Unsupported content type: ${contentType || "none"}` });
+      return;
+    }
+
+    const declaredLength = Number(req.headers["content-length"]);
+    if (declaredLength > ENV.uploadMaxBytes) {
+      rejectTooLarge(req, res);
+      return;
+    }
+
+    const key = `uploads/${user.id}/${Date.now()}-${randomUUID().slice(0, 8)}-${safeFileName(req.query.filename)}`;
+    // Uploads have no timeout of their own; this ends one whose uploader went away
+    const disconnected = new AbortController();
+    res.once("close", () => {
+      if (!res.writableFinished) disconnected.abort();
+    });
+    try {
+      const result = await storagePutStream(key, req, contentType, {
+        maxBytes: ENV.uploadMaxBytes,
+        signal: disconnected.signal,
+      });
+      res.json(result);
+    } catch (error) {
+      if (error instanceof UploadTooLargeError) {
+        rejectTooLarge(req, res);
+        return;
+      }
+      if (disconnected.signal.aborted) return;
+      console.error("[Upload] Failed to store upload:", error);
+      if (!res.headersSent) {
+        res.set("Connection", "close");
+        res.status(502).json({ error: "Upload failed" });
+      }
+    }
+  });
+}